@@ -0,0 +1,113 @@
+"""
+Benchmark of the persisted application index used by open_app.
+
+Builds a synthetic Start Menu tree and compares, per open_app lookup:
+ - legacy: recursive glob + resolve() + parallel lists + names_lower.index() on every call
+ - index cold: first build of the AppIndex (no file on disk)
+ - index load: new process start, index loaded from disk
+ - index revalidate: mtime walk with nothing changed / after one new shortcut
+ - index lookup: rapidfuzz match on the precomputed names
+
+Run from the `my_agent [command line]` folder:
+    python -m benchmarks.bench_app_index --dirs 300 --files 10
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from rapidfuzz import process, fuzz
+from utils.app_index import AppIndex
+
+QUERIES = ["app 17 tool 3", "App 250 Tool 9", "tool 5", "not installed anywhere"]
+
+
+def build_tree(root: str, dirs: int, files: int):
+    for d in range(dirs):
+        folder = os.path.join(root, f"Vendor {d % 40}", f"App {d}")
+        os.makedirs(folder, exist_ok=True)
+        for f in range(files):
+            Path(folder, f"App {d} Tool {f}.lnk").touch()
+
+
+def legacy_lookup(root: str, query: str):
+    """Copy of the previous open_app lookup."""
+    data = []
+    for item in Path(root).glob("**/*"):
+        if item.is_file():
+            data.append({"path": str(item.resolve()), "name": item.stem.lower()})
+    names = [app["name"] for app in data]
+    paths = [app["path"] for app in data]
+    names_lower = [name.lower() for name in names]
+    match = process.extractOne(query.lower(), names_lower, scorer=fuzz.partial_ratio)
+    if match is None or match[1] < 70:
+        return None
+    return paths[names_lower.index(match[0])]
+
+
+def timed(func, repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1000
+
+
+def run(dirs: int, files: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "Programs")
+        build_tree(root, dirs, files)
+        index_path = os.path.join(tmp, "cache", "app_index.json")
+        print(f"Synthetic tree: {dirs} folders, {dirs * files} shortcuts\n")
+
+        legacy_ms = timed(lambda: [legacy_lookup(root, q) for q in QUERIES], repeat) / len(QUERIES)
+
+        def cold():
+            if os.path.exists(index_path):
+                os.remove(index_path)
+            AppIndex([root], index_path).refresh()
+
+        cold_ms = timed(cold, repeat)
+        load_ms = timed(lambda: AppIndex([root], index_path).load(), repeat)
+
+        index = AppIndex([root], index_path)
+        index.ensure_ready()
+        revalidate_ms = timed(index.refresh, repeat)
+
+        new_shortcut = Path(root, "Vendor 0", "App 0", "Brand New.lnk")
+
+        def changed():
+            new_shortcut.touch()
+            index.refresh()
+            new_shortcut.unlink()
+            index.refresh()
+
+        changed_ms = timed(changed, repeat) / 2
+        lookup_ms = timed(lambda: [index.best_match(q) for q in QUERIES], repeat) / len(QUERIES)
+
+        for query in QUERIES[:-1]:
+            assert index.best_match(query)[1] == legacy_lookup(root, query), query
+
+        print(f"{'step':<28} {'median ms':>10}")
+        print(f"{'legacy lookup (per call)':<28} {legacy_ms:>10.2f}")
+        print(f"{'index cold build':<28} {cold_ms:>10.2f}")
+        print(f"{'index load from disk':<28} {load_ms:>10.2f}")
+        print(f"{'index revalidate (clean)':<28} {revalidate_ms:>10.2f}")
+        print(f"{'index revalidate (1 change)':<28} {changed_ms:>10.2f}")
+        print(f"{'index lookup (per call)':<28} {lookup_ms:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dirs", type=int, default=300)
+    parser.add_argument("--files", type=int, default=10, help="shortcuts per folder")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.dirs, args.files, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
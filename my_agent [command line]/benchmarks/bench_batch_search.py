@@ -0,0 +1,104 @@
+"""
+Benchmark of batch_internet_search against one internet_search call per model round-trip.
+
+A fake async search client answers after --search-ms with results drawn from a shared pool of
+URLs (so the queries overlap, like sub-questions of one topic do). --llm-ms stands for one
+LLM -> tool -> LLM round-trip. Reports the wall time of
+ - sequential: one round-trip + one search per query (the model calls internet_search N times)
+ - batch: one round-trip + one batch_search fan-out (concurrency capped at --concurrency)
+plus results returned vs unique URLs after the merge, and checks that the cap was respected.
+
+Run from the `my_agent [command line]` folder:
+    python -m benchmarks.bench_batch_search --queries 6 --search-ms 800 --llm-ms 1500
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from utils.disk_cache import DiskCache
+from utils.research_tools import batch_search
+
+
+class FakeSearchClient:
+    """Async stand-in for AsyncTavilyClient.search."""
+
+    def __init__(self, latency: float, url_pool: int = 12, seed: int = 0):
+        self.latency = latency
+        self.url_pool = url_pool
+        self.seed = seed
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def search(self, query, max_results=4, include_raw_content=False, topic="general"):
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(self.latency)
+        self.active -= 1
+        rng = random.Random(f"{self.seed}:{query}")
+        picks = rng.sample(range(self.url_pool), max_results)
+        return {
+            "query": query,
+            "results": [
+                {"url": f"https://www.example.com/page/{i}/" if rng.random() < 0.5 else f"https://example.com/page/{i}",
+                 "title": f"Page {i}", "content": f"About {query}: page {i}. " * rng.randint(1, 5),
+                 "score": round(rng.random(), 3)}
+                for i in picks
+            ],
+            "response_time": self.latency,
+        }
+
+
+async def sequential(queries, client, llm_latency, cache) -> tuple:
+    results = 0
+    for query in queries:
+        await asyncio.sleep(llm_latency)
+        response = await batch_search([query], client=client, cache=cache, bypass_cache=True)
+        results += len(response["results"])
+    await asyncio.sleep(llm_latency)
+    return results, results
+
+
+async def batched(queries, client, llm_latency, cache, concurrency) -> tuple:
+    await asyncio.sleep(llm_latency)
+    response = await batch_search(queries, client=client, cache=cache, bypass_cache=True, concurrency=concurrency)
+    await asyncio.sleep(llm_latency)
+    return sum(len(entry["queries"]) for entry in response["results"]), len(response["results"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=6)
+    parser.add_argument("--search-ms", type=float, default=800)
+    parser.add_argument("--llm-ms", type=float, default=1500)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    queries = [f"sub-question {i} about the topic" for i in range(args.queries)]
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DiskCache(os.path.join(tmp, "search_cache.sqlite"))
+        for label, run in (
+            ("sequential internet_search", lambda client: sequential(queries, client, args.llm_ms / 1000, cache)),
+            ("batch_internet_search", lambda client: batched(queries, client, args.llm_ms / 1000, cache, args.concurrency)),
+        ):
+            client = FakeSearchClient(args.search_ms / 1000)
+            start = time.perf_counter()
+            returned, unique = asyncio.run(run(client))
+            rows.append((label, time.perf_counter() - start, returned, unique, client.max_active))
+        cache.conn.close()
+
+    assert rows[1][4] <= args.concurrency, "concurrency cap exceeded"
+    print(f"{args.queries} queries, {args.search_ms:g} ms per search, {args.llm_ms:g} ms per model round-trip\n")
+    print(f"{'mode':<28} {'seconds':>8} {'results':>8} {'unique URLs':>12} {'max parallel':>13}")
+    for label, seconds, returned, unique, max_active in rows:
+        unique_text = "-" if label.startswith("sequential") else str(unique)
+        print(f"{label:<28} {seconds:>8.2f} {returned:>8} {unique_text:>12} {max_active:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark of the SQLite checkpointer against MemorySaver.
+
+Runs a small MessagesState graph for N turns (one human message + one AI reply with a payload,
+like a tool-heavy session) and reports:
+ - checkpoint write latency per step (mean / p95 of `put`)
+ - resume time (fresh saver + get_tuple of the latest checkpoint) against thread length
+ - database size on disk
+
+Run from the `my_agent [command line]` folder:
+    python -m benchmarks.bench_checkpointer --turns 1000 --payload 4000
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from langgraph.graph import StateGraph, MessagesState, START, END
+from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.messages import HumanMessage, AIMessage
+from core.checkpointer import SQLiteCheckpointer
+
+CONFIG = {"configurable": {"thread_id": "bench"}}
+
+
+def build_app(checkpointer, payload: int):
+    def reply(state: MessagesState):
+        return {"messages": [AIMessage(content="x" * payload)]}
+
+    graph = StateGraph(MessagesState)
+    graph.add_node("reply", reply)
+    graph.add_edge(START, "reply")
+    graph.add_edge("reply", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def timed_puts(checkpointer) -> list:
+    """Wraps `put` so every call's duration is recorded."""
+    durations = []
+    put = checkpointer.put
+
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return put(*args, **kwargs)
+        finally:
+            durations.append(time.perf_counter() - start)
+
+    checkpointer.put = wrapper
+    return durations
+
+
+def p95(values: list) -> float:
+    return statistics.quantiles(values, n=20)[-1] if len(values) >= 20 else max(values)
+
+
+def run(turns: int, payload: int, checkpoints: list):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.sqlite")
+        sqlite_saver = SQLiteCheckpointer(db_path)
+        memory_saver = MemorySaver()
+        savers = {"sqlite": sqlite_saver, "memory": memory_saver}
+        durations = {name: timed_puts(saver) for name, saver in savers.items()}
+        apps = {name: build_app(saver, payload) for name, saver in savers.items()}
+
+        print(f"{'turns':>6} {'saver':>7} {'put mean ms':>12} {'put p95 ms':>11} {'resume ms':>10} {'db MB':>7}")
+        done = 0
+        for target in checkpoints:
+            for i in range(done, target):
+                for app in apps.values():
+                    app.invoke({"messages": [HumanMessage(content=f"question {i}")]}, CONFIG)
+            done = target
+
+            for name, values in durations.items():
+                recent = values[-50:]
+                resume_ms = float("nan")
+                size_mb = float("nan")
+                if name == "sqlite":
+                    start = time.perf_counter()
+                    fresh = SQLiteCheckpointer(db_path)
+                    fresh.get_tuple(CONFIG)
+                    resume_ms = (time.perf_counter() - start) * 1000
+                    fresh.close()
+                    size_mb = sum(
+                        os.path.getsize(db_path + suffix)
+                        for suffix in ("", "-wal")
+                        if os.path.exists(db_path + suffix)
+                    ) / 1e6
+                print(
+                    f"{target:>6} {name:>7} {statistics.mean(recent) * 1000:>12.2f} {p95(recent) * 1000:>11.2f} "
+                    f"{resume_ms:>10.2f} {size_mb:>7.2f}"
+                )
+
+        sqlite_saver.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--payload", type=int, default=4000, help="characters per AI reply")
+    args = parser.parse_args()
+    checkpoints = sorted({n for n in (10, 50, 100, 250, 500, 1000, 2000, args.turns) if n <= args.turns})
+    run(args.turns, args.payload, checkpoints)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Offline benchmark of the agent graph (core/graph.py) with a scripted model and fake tools.
+
+Every turn is: user message -> LLM step calling --tool-calls fake tools -> tool step -> LLM step
+answering --answer-chars characters, on the SQLite checkpointer, like a real tool turn. The LLM
+node streams and merges the chunks and the tool node goes through execute_tool_calls, as in
+nodes/agent_nodes.py (without the system prompt, compaction, routing and tool selection, which
+need the app's config). Reports:
+ - graph overhead per step: turn wall time minus the time spent inside the nodes, per node run
+   (checkpoint writes, channel updates, event streaming), for ainvoke and astream_events
+ - node overhead: LLM node time minus the model latency, tool node time minus the tool latency
+ - tool dispatch cost: execute_tool_calls with instant tools, per call, blocking and async tools
+ - checkpoint size growth: database size (WAL checkpointed) against turns
+ - peak memory: tracemalloc peak of a separate run (tracemalloc slows everything down)
+
+Results are written to a JSON file (--json, default: RESULTS_DIR in the system temp folder,
+outside the repository) with flat metric names, and --compare prints the change of every metric
+against an earlier result file, e.g. one written on the previous commit.
+
+Run from the `my_agent [command line]` folder:
+    python -m benchmarks.bench_graph --turns 50 --json baseline.json
+    python -m benchmarks.bench_graph --turns 50 --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage, message_chunk_to_message
+from benchmarks.fakes import FAKE_TOOL_SPEC, ScriptedChatModel, make_fake_tool
+from core.checkpointer import SQLiteCheckpointer
+from core.graph import LLM_NODE, TOOLS_NODE, build_graph
+from core.telemetry import telemetry
+from core.tool_executor import execute_tool_calls
+
+CONFIG = {"configurable": {"thread_id": "bench"}}
+RESULTS_DIR = os.path.join(tempfile.gettempdir(), "neura-benchmarks")     # outside the repository
+
+
+def make_script(tool_names: list, answer_chars: int):
+    """Tool calls after a user message, the answer after the tool results."""
+
+    def script(messages):
+        if isinstance(messages[-1], HumanMessage):
+            turn = sum(isinstance(msg, HumanMessage) for msg in messages)
+            return AIMessage("", tool_calls=[
+                {"name": name, "args": {"query": f"turn {turn}"}, "id": f"call-{turn}-{i}"}
+                for i, name in enumerate(tool_names)
+            ])
+        return AIMessage("y" * answer_chars)
+
+    return script
+
+
+def make_app(args, checkpointer):
+    tools_by_name = {
+        f"fake_tool_{i}": make_fake_tool(f"fake_tool_{i}", args.tool_latency, args.tool_payload)
+        for i in range(args.tool_calls)
+    }
+    specs = {name: FAKE_TOOL_SPEC for name in tools_by_name}
+    model = ScriptedChatModel(script=make_script(list(tools_by_name), args.answer_chars), latency=args.llm_latency)
+
+    async def call_llm(state):
+        response = None
+        async for chunk in model.astream(state["messages"]):
+            response = chunk if response is None else response + chunk
+        return {"messages": [message_chunk_to_message(response)]}
+
+    async def execute_tools(state):
+        results = await execute_tool_calls(state["messages"][-1].tool_calls, tools_by_name, specs=specs)
+        return {"messages": [
+            ToolMessage(tool_call_id=call["id"], name=call["name"], content=error or str(result))
+            for call, result, error in results
+        ]}
+
+    return build_graph(call_llm, execute_tools, checkpointer)
+
+
+def db_bytes(checkpointer: SQLiteCheckpointer) -> int:
+    """Size of the database once the WAL is folded back into it."""
+    with checkpointer.lock:
+        checkpointer.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        page_count = checkpointer.conn.execute("PRAGMA page_count").fetchone()[0]
+        page_size = checkpointer.conn.execute("PRAGMA page_size").fetchone()[0]
+    return page_count * page_size
+
+
+def p95(values: list) -> float:
+    return statistics.quantiles(values, n=20)[-1] if len(values) >= 20 else max(values)
+
+
+async def run_turns(app, turns: int, streaming: bool, on_turn=None) -> list:
+    """Wall time and time inside the nodes of every turn."""
+    rows = []
+    for i in range(turns):
+        telemetry.samples.clear()
+        input_data = {"messages": [HumanMessage(f"question {i}")]}
+        start = time.perf_counter()
+        if streaming:
+            async for _ in app.astream_events(input_data, CONFIG, version="v2"):
+                pass
+        else:
+            await app.ainvoke(input_data, CONFIG)
+        wall = time.perf_counter() - start
+        llm = list(telemetry.samples[("node", LLM_NODE)])
+        tools = list(telemetry.samples[("node", TOOLS_NODE)])
+        rows.append({"wall": wall, "llm": llm, "tools": tools})
+        if on_turn:
+            on_turn(i + 1)
+    return rows
+
+
+async def graph_overhead(args, streaming: bool, results: dict, growth: list | None = None):
+    mode = "events" if streaming else "invoke"
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpointer = SQLiteCheckpointer(os.path.join(tmp, "bench.sqlite"))
+        app = make_app(args, checkpointer)
+        marks = {max(1, args.turns * k // 5) for k in range(1, 6)}
+
+        def on_turn(turn):
+            if growth is not None and turn in marks:
+                growth.append((turn, db_bytes(checkpointer)))
+
+        rows = await run_turns(app, args.turns, streaming, on_turn)
+        checkpointer.close()
+
+    steps = [len(row["llm"]) + len(row["tools"]) for row in rows]
+    outside = [(row["wall"] - sum(row["llm"]) - sum(row["tools"])) / n for row, n in zip(rows, steps)]
+    llm_overhead = [t - args.llm_latency for row in rows for t in row["llm"]]
+    tool_overhead = [t - args.tool_latency for row in rows for t in row["tools"]]
+    results[f"{mode}.turn_ms.mean"] = statistics.mean(row["wall"] for row in rows) * 1000
+    results[f"{mode}.graph_overhead_per_step_ms.mean"] = statistics.mean(outside) * 1000
+    results[f"{mode}.graph_overhead_per_step_ms.p95"] = p95(outside) * 1000
+    results[f"{mode}.llm_node_overhead_ms.mean"] = statistics.mean(llm_overhead) * 1000
+    results[f"{mode}.tools_node_overhead_ms.mean"] = statistics.mean(tool_overhead) * 1000
+
+
+async def dispatch_cost(results: dict, repeats: int = 200):
+    """execute_tool_calls with instant tools: cost per call for batches of 1, 4 and 8 calls."""
+    for kind in ("blocking", "async"):
+        for batch in (1, 4, 8):
+            tools = {f"t{i}": make_fake_tool(f"t{i}", 0.0, 100, is_async=kind == "async") for i in range(batch)}
+            specs = {name: FAKE_TOOL_SPEC for name in tools}
+            calls = [{"name": name, "args": {"query": "q"}, "id": name} for name in tools]
+            await execute_tool_calls(calls, tools, specs=specs)     # warm the thread pool
+            start = time.perf_counter()
+            for _ in range(repeats):
+                await execute_tool_calls(calls, tools, specs=specs)
+            per_call = (time.perf_counter() - start) / (repeats * batch)
+            results[f"dispatch.{kind}.batch_{batch}.per_call_us"] = per_call * 1e6
+
+
+async def peak_memory(args, results: dict):
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpointer = SQLiteCheckpointer(os.path.join(tmp, "bench.sqlite"))
+        app = make_app(args, checkpointer)
+        tracemalloc.start()
+        try:
+            await run_turns(app, args.turns, streaming=True)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            checkpointer.close()
+    results["memory.tracemalloc_peak_mb"] = peak / 1e6
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              timeout=10, check=True).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(old: dict, new: dict):
+    print(f"\n{'metric':<48} {'old':>12} {'new':>12} {'change':>8}")
+    for metric, value in new.items():
+        before = old.get(metric)
+        if before is None:
+            print(f"{metric:<48} {'-':>12} {value:>12.3f}")
+            continue
+        change = f"{(value - before) / before:+.0%}" if before else "-"
+        print(f"{metric:<48} {before:>12.3f} {value:>12.3f} {change:>8}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--tool-calls", type=int, default=3, help="tool calls of each turn")
+    parser.add_argument("--llm-latency", type=float, default=0.01, help="seconds before the model's first chunk")
+    parser.add_argument("--tool-latency", type=float, default=0.005, help="seconds per tool call")
+    parser.add_argument("--tool-payload", type=int, default=2000, help="characters returned by each tool")
+    parser.add_argument("--answer-chars", type=int, default=1000, help="characters of the final answer")
+    parser.add_argument("--json", default=os.path.join(RESULTS_DIR, "bench_graph.json"), help="result file")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    args = parser.parse_args()
+
+    results, growth = {}, []
+    await graph_overhead(args, streaming=False, results=results)
+    await graph_overhead(args, streaming=True, results=results, growth=growth)
+    for turn, size in growth:
+        results[f"checkpoint.bytes.turn_{turn}"] = size
+    results["checkpoint.bytes_per_turn"] = growth[-1][1] / growth[-1][0]
+    await dispatch_cost(results)
+    await peak_memory(args, results)
+
+    report = {
+        "benchmark": "bench_graph",
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {k: v for k, v in vars(args).items() if k not in ("json", "compare")},
+        "results": {metric: round(value, 4) for metric, value in results.items()},
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+    with open(args.json, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+
+    print(f"{args.turns} turns, {args.tool_calls} tool calls per turn, commit {report['commit']}\n")
+    for metric, value in report["results"].items():
+        print(f"{metric:<48} {value:>12.3f}")
+    print(f"\nwritten to {args.json}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            old = json.load(f)
+        if old.get("params") != report["params"]:
+            print(f"\nwarning: parameters differ from {args.compare}: {old.get('params')}")
+        compare(old["results"], report["results"])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
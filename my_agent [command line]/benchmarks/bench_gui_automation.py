@@ -0,0 +1,66 @@
+"""
+Benchmark of write_command_in_terminal on a scripted fake desktop.
+
+The fake brings the Start menu to the front --start-menu-ms after the Windows key and the terminal
+--terminal-ms after Enter. Compares, for a command of --chars characters:
+ - legacy: fixed sleeps (0.7 s, 0.2 s, 2 s) then typing one key every 100 ms
+ - event-driven: polling for the Start menu / terminal window, then one clipboard paste
+and reports the wall time and the window the command actually landed in.
+
+Run from the `my_agent [command line]` folder:
+    python -m benchmarks.bench_gui_automation --chars 60 --terminal-ms 800 2500
+"""
+
+import argparse
+import time
+from utils import gui_automation
+from utils.gui_automation import FakeGuiBackend, GuiAutomation
+from utils.terminal_control_tool import write_command_in_terminal
+
+TERMINAL_TITLE = "Windows PowerShell"
+
+
+def make_backend(start_menu_ms: float, terminal_ms: float) -> FakeGuiBackend:
+    return FakeGuiBackend(
+        title="Neura Command",
+        reactions={"win": ("Search", start_menu_ms / 1000), "enter": (TERMINAL_TITLE, terminal_ms / 1000)},
+    )
+
+
+def legacy(backend: FakeGuiBackend, command: str):
+    """Copy of the previous write_command_in_terminal timeline."""
+    backend.press("win")
+    time.sleep(0.7)
+    backend.write("Powershell")
+    time.sleep(0.2)
+    backend.press("enter")
+    time.sleep(2)
+    backend.write(command, 0.1)
+
+
+def event_driven(backend: FakeGuiBackend, command: str):
+    gui_automation._gui = GuiAutomation(backend)
+    write_command_in_terminal.func("Powershell", command)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chars", type=int, default=60)
+    parser.add_argument("--start-menu-ms", type=float, default=300)
+    parser.add_argument("--terminal-ms", type=float, nargs="+", default=[800, 2500])
+    args = parser.parse_args()
+
+    command = ("Get-ChildItem -Recurse -Filter *.log | Select-Object -First 20 " * 10)[:args.chars]
+    print(f"{'terminal start ms':>17} {'mode':<13} {'seconds':>8}  landed in")
+    for terminal_ms in args.terminal_ms:
+        for name, run in (("legacy", legacy), ("event-driven", event_driven)):
+            backend = make_backend(args.start_menu_ms, terminal_ms)
+            start = time.perf_counter()
+            run(backend, command)
+            seconds = time.perf_counter() - start
+            landed = [title for title, text in backend.text.items() if command in text]
+            print(f"{terminal_ms:>17.0f} {name:<13} {seconds:>8.2f}  {landed[0] if landed else 'nowhere (split)'}")
+
+
+if __name__ == "__main__":
+    main()
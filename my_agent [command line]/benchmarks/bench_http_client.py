@@ -0,0 +1,120 @@
+"""
+Benchmark of the pooled, retrying HttpClient against one-off requests.post calls.
+
+A local keep-alive HTTP server stands in for the OCR backend. It adds --latency-ms per request,
+--handshake-ms per new connection (TCP + TLS setup of a remote host), answers a share of the
+requests with 503 (--error-rate) and stalls a share of them for 30 s (--stall-rate). Reports,
+for the same sequence of posts:
+ - legacy: requests.post without session, timeout or retry (run without stalls, it would hang)
+ - HttpClient: shared session, (connect, read) timeouts, jittered exponential retry
+
+Run from the `my_agent [command line]` folder:
+    python -m benchmarks.bench_http_client --calls 50 --error-rate 0.1 --stall-rate 0.05
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from utils.http_client import HttpClient
+
+PAYLOAD = b"x" * 200_000        # about the size of a prepared OCR screenshot
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive
+    disable_nagle_algorithm = True
+    latency = 0.02
+    handshake = 0.05
+    error_rate = 0.0
+    stall_rate = 0.0
+    rng = random.Random(0)
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with self.lock:
+            StandInHandler.connections += 1
+        time.sleep(self.handshake)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        with self.lock:
+            roll = self.rng.random()
+        time.sleep(self.latency)
+        if roll < self.stall_rate:
+            time.sleep(30)
+            return
+        if roll < self.stall_rate + self.error_rate:
+            body, status = b'{"error": "busy"}', 503
+        else:
+            body, status = json.dumps({"ParsedResults": [{"ParsedText": "ok"}]}).encode(), 200
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(label: str, post, calls: int, url: str) -> tuple:
+    StandInHandler.connections = 0
+    StandInHandler.rng = random.Random(0)
+    ok = 0
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(calls):
+        call_start = time.perf_counter()
+        try:
+            ok += post(url).status_code == 200
+        except requests.RequestException:
+            pass
+        latencies.append(time.perf_counter() - call_start)
+    latencies.sort()
+    return (label, ok, StandInHandler.connections, time.perf_counter() - start,
+            latencies[len(latencies) // 2], latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--handshake-ms", type=float, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--stall-rate", type=float, default=0.05)
+    args = parser.parse_args()
+
+    StandInHandler.latency = args.latency_ms / 1000
+    StandInHandler.handshake = args.handshake_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/parse/image"
+    files = {"filename": ("screen.jpg", PAYLOAD, "image/jpeg")}
+
+    rows = []
+    StandInHandler.error_rate, StandInHandler.stall_rate = args.error_rate, 0.0
+    rows.append(run("legacy (no stalls)", lambda u: requests.post(u, files=files), args.calls, url))
+    client = HttpClient(timeout=(2, 1), backoff_base=0.1)
+    rows.append(run("HttpClient (no stalls)", lambda u: client.post(u, files=files), args.calls, url))
+    StandInHandler.stall_rate = args.stall_rate
+    client = HttpClient(timeout=(2, 1), backoff_base=0.1)
+    rows.append(run("HttpClient (with stalls)", lambda u: client.post(u, files=files), args.calls, url))
+    server.shutdown()
+
+    print(f"{args.calls} posts of {len(PAYLOAD) // 1000} KB, {args.latency_ms:g} ms latency, "
+          f"{args.handshake_ms:g} ms handshake, {args.error_rate:.0%} 503, {args.stall_rate:.0%} stalls\n")
+    print(f"{'client':<26} {'ok':>4} {'connections':>11} {'seconds':>8} {'p50 ms':>7} {'p95 ms':>7}")
+    for label, ok, connections, seconds, p50, p95 in rows:
+        print(f"{label:<26} {ok:>4} {connections:>11} {seconds:>8.2f} {p50 * 1000:>7.0f} {p95 * 1000:>7.0f}")
+    print(f"\nHttpClient stats: {client.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Replay of scripted agent turns through the ModelRouter, against one fixed model.
+
+Each scripted turn is a user message, the tool calls the agent makes (some failing) and the
+final answer. Every LLM step is routed and charged the tier's typical latency (--latencies, in
+seconds, cheapest tier first). Reports the calls per tier, the model time of the whole script and
+the routing reasons, for
+ - fixed: every call on the largest tier (what choosing gemini-2.5-pro at startup does)
+ - auto: ModelRouter tiers
+
+Run from the `my_agent [command line]` folder:
+    python -m benchmarks.bench_model_router --latencies 0.5 1.2 4.0
+"""
+
+import argparse
+from collections import Counter
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from core.model_router import MODEL_TIERS, ModelRouter
+
+# (user message, [tool results of the successive tool steps])
+SCRIPT = [
+    ("set volume to 40", ["Volume set to 40%"]),
+    ("open chrome", ["Opened Chrome"]),
+    ("minimize all windows and set brightness to 70", ["Minimized 5 windows", "Brightness set to 70%"]),
+    ("what's the weather in Delhi today", ["{'results': [...]}"]),
+    ("create a folder named reports on the desktop", ["Folder created"]),
+    ("zip the reports folder", ["Error: folder not found", "Exception occurred: path invalid", "Created reports.zip"]),
+    ("Explain the difference between processes and threads, and compare how Python handles both. "
+     "Which one should I use for a web scraper? Why?", []),
+    ("Research the latest LLM releases this month, compare their benchmark results and write a short "
+     "report with a table of pros and cons for each model.", ["{'results': [...]}", "{'results': [...]}", "{'results': [...]}"]),
+    ("read the file notes.txt", ["[File: notes.txt, 120 lines]..."]),
+    ("Debug this script, it crashes on start:\n```python\nimport os\nprint(os.getenv('X').lower())\n```\nwhy?", []),
+    ("close notepad", ["Closed Notepad"]),
+    ("run `git status` in my project", ["Error: not a git repository", "Error: path not found", "Timed out", "ok"]),
+]
+
+
+def replay(router: ModelRouter, latencies: list) -> tuple:
+    calls, seconds, reasons = Counter(), 0.0, Counter()
+
+    def step(messages):
+        nonlocal seconds
+        route = router.route(messages)
+        calls[route.model] += 1
+        seconds += latencies[router.tiers.index(route.model)]
+        reasons.update(route.reasons)
+
+    for text, tool_results in SCRIPT:
+        messages = [HumanMessage(text)]
+        for i, result in enumerate(tool_results):
+            step(messages)
+            messages.append(AIMessage("", tool_calls=[{"name": "tool", "args": {}, "id": str(i)}]))
+            messages.append(ToolMessage(result, tool_call_id=str(i)))
+        step(messages)
+        messages.append(AIMessage("answer"))
+    return calls, seconds, reasons
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latencies", type=float, nargs=3, default=[0.5, 1.2, 4.0],
+                        help="seconds per call of each tier, cheapest first")
+    args = parser.parse_args()
+
+    rows = [
+        ("fixed", *replay(ModelRouter(fixed_model=MODEL_TIERS[-1]), args.latencies)),
+        ("auto", *replay(ModelRouter(), args.latencies)),
+    ]
+    print(f"{len(SCRIPT)} turns, tier latencies {dict(zip(MODEL_TIERS, args.latencies))}\n")
+    print(f"{'routing':<8} " + " ".join(f"{model:>22}" for model in MODEL_TIERS) + f" {'model seconds':>14}")
+    for label, calls, seconds, _ in rows:
+        print(f"{label:<8} " + " ".join(f"{calls[model]:>22}" for model in MODEL_TIERS) + f" {seconds:>14.1f}")
+    print(f"\nauto routing reasons: {dict(rows[1][3].most_common())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+History size of a tool-heavy session: legacy truncation vs the output governor.
+
+Replays a scripted session (searches with raw content, scraped pages, big file reads, OCR) and
+adds up the characters of tool output sent to the model: every LLM call resends the whole
+history, so an output costs its size once per later call (compaction ignored). Compares
+ - legacy: str(result) truncated to the previous budgets (40-60k characters)
+ - governor: ToolSpec budgets, the rest stored as artifacts behind a preview
+and reports the governor's cost per oversized output (hash, write, preview).
+
+Run from the `my_agent [command line]` folder:
+    python -m benchmarks.bench_output_governor
+"""
+
+import random
+import tempfile
+import time
+from core.output_governor import OutputGovernor
+from utils.artifact_store import ArtifactStore
+
+# Budgets before the governor (max_output_chars, truncated).
+LEGACY_BUDGETS = {
+    "internet_search": 40_000, "batch_internet_search": 60_000, "web_scraper": 60_000,
+    "read_file": 60_000, "read_screen_text": 20_000,
+}
+
+# Turns: tool outputs (tool name, characters) of each turn; a turn makes one LLM call per tool step + 1.
+SESSION = [
+    [("internet_search", 35_000)],
+    [("batch_internet_search", 90_000)],
+    [("web_scraper", 120_000), ("web_scraper", 45_000)],
+    [],
+    [("read_file", 16_000)],
+    [("read_file", 4_000)],
+    [("read_screen_text", 9_000)],
+    [("internet_search", 28_000)],
+    [],
+    [("web_scraper", 70_000)],
+]
+
+WORDS = "the agent model tool result search page file line error value data user query content".split()
+
+
+def make_text(chars: int, rng: random.Random) -> str:
+    lines, size = [], 0
+    while size < chars:
+        line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 16)))
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)[:chars]
+
+
+def history_chars(outputs_per_turn: list) -> int:
+    """Tool output characters sent over the session: each output is resent by every later LLM call."""
+    sent, history = 0, 0
+    for outputs in outputs_per_turn:
+        for size in outputs:           # one LLM call before each tool step
+            sent += history
+            history += size
+        sent += history                # the turn's final answer
+    return sent
+
+
+def main():
+    rng = random.Random(7)
+    texts = [[(name, make_text(size, rng)) for name, size in turn] for turn in SESSION]
+
+    legacy = [[min(len(text), LEGACY_BUDGETS[name]) for name, text in turn] for turn in texts]
+    with tempfile.TemporaryDirectory() as tmp:
+        governor = OutputGovernor(ArtifactStore(tmp))
+        durations, governed = [], []
+        for turn in texts:
+            sizes = []
+            for name, text in turn:
+                start = time.perf_counter()
+                content = governor.govern(name, text)
+                if len(content) < len(text):
+                    durations.append(time.perf_counter() - start)
+                sizes.append(len(content))
+            governed.append(sizes)
+
+    raw_total = sum(len(text) for turn in texts for _, text in turn)
+    print(f"{len(SESSION)} turns, {sum(map(len, SESSION))} tool outputs, {raw_total:,} characters of raw output\n")
+    print(f"{'':<10} {'kept in history':>16} {'chars sent over session':>24} {'~tokens':>10}")
+    for label, sizes in (("legacy", legacy), ("governor", governed)):
+        kept = sum(map(sum, sizes))
+        sent = history_chars(sizes)
+        print(f"{label:<10} {kept:>16,} {sent:>24,} {sent // 4:>10,}")
+    reduction = 1 - history_chars(governed) / history_chars(legacy)
+    print(f"\n{reduction:.0%} fewer tool-output characters resent; "
+          f"{len(durations)} outputs stored as artifacts, {sum(durations) / len(durations) * 1000:.2f} ms each")
+
+
+if __name__ == "__main__":
+    main()
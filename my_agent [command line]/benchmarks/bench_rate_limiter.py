@@ -0,0 +1,136 @@
+"""
+Simulation of the Gemini rate limits against FailoverLLM, on a virtual clock (runs instantly).
+
+Fake chat models enforce a per-minute request limit (sliding window, like the free tier), an
+optional daily quota, and answer a scheduled share of calls with 503. The agent sends one LLM
+call every --interval virtual seconds. Reports, for
+ - legacy: one model, max_retries=0 (a 429 drops the turn)
+ - FailoverLLM: token buckets + retry with backoff + failover through the model list
+the calls answered, 429s received from the server, added wait per call and which model answered.
+
+Run from the `my_agent [command line]` folder:
+    python -m benchmarks.bench_rate_limiter --calls 120 --interval 2 --server-rpm 15 --daily 60
+"""
+
+import argparse
+import asyncio
+import random
+from collections import Counter, deque
+from core.rate_limiter import FailoverLLM, AllModelsRateLimited
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.now += max(0.0, seconds)
+        await asyncio.sleep(0)
+
+
+class FakeAPIError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class FakeQuotaModel:
+    """Chat model stand-in: limits per minute and per day, 503 on a schedule, two streamed chunks."""
+
+    def __init__(self, name: str, clock: VirtualClock, rpm: int, daily: int | None, error_rate: float, seed: int):
+        self.name = name
+        self.clock = clock
+        self.rpm = rpm
+        self.daily = daily
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.window = deque()
+        self.served = 0
+        self.rejected = 0
+
+    async def astream(self, messages, **kwargs):
+        now = self.clock()
+        while self.window and now - self.window[0] >= 60:
+            self.window.popleft()
+        if self.daily is not None and self.served >= self.daily:
+            self.rejected += 1
+            raise FakeAPIError(429, "Quota exceeded for metric: GenerateRequestsPerDayPerProjectPerModel-FreeTier")
+        if len(self.window) >= self.rpm:
+            self.rejected += 1
+            retry_in = 60 - (now - self.window[0])
+            raise FakeAPIError(429, f"Resource has been exhausted. Please retry in {retry_in:.1f}s.")
+        self.window.append(now)
+        if self.rng.random() < self.error_rate:
+            raise FakeAPIError(503, "The model is overloaded. Please try again later.")
+        self.served += 1
+        await self.clock.sleep(0.8)
+        yield f"{self.name}: "
+        yield "answer"
+
+
+async def simulate(pool_factory, calls: int, interval: float, clock: VirtualClock) -> dict:
+    answered, waits, by_model = 0, [], Counter()
+    for i in range(calls):
+        target = i * interval
+        if clock() < target:
+            await clock.sleep(target - clock())
+        start = clock()
+        try:
+            name = await pool_factory(["hi"])
+            answered += 1
+            by_model[name] += 1
+            waits.append(max(0.0, clock() - start - 0.8))
+        except (FakeAPIError, AllModelsRateLimited):
+            pass
+    return {"answered": answered, "waits": waits, "by_model": by_model}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=120)
+    parser.add_argument("--interval", type=float, default=2.0, help="virtual seconds between two LLM calls")
+    parser.add_argument("--server-rpm", type=int, default=15)
+    parser.add_argument("--daily", type=int, default=60, help="daily quota of the chosen model")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="share of calls answered with 503")
+    args = parser.parse_args()
+
+    models = ["gemini-2.5-flash", "gemini-2.5-pro", "gemini-2.0-flash-lite", "gemini-2.0-flash"]
+    rows = []
+    for label in ("legacy", "FailoverLLM"):
+        clock = VirtualClock()
+        fakes = {
+            name: FakeQuotaModel(name, clock, args.server_rpm, args.daily if i == 0 else None, args.error_rate, seed=i)
+            for i, name in enumerate(models)
+        }
+        if label == "legacy":
+            async def call(messages, fake=fakes[models[0]]):
+                async for _ in fake.astream(messages):
+                    pass
+                return fake.name
+        else:
+            pool = FailoverLLM(models, fakes.get, rpm={name: args.server_rpm for name in models},
+                               clock=clock, sleep=clock.sleep)
+
+            async def call(messages, pool=pool):
+                name, _ = await pool.ainvoke(messages)
+                return name
+
+        result = asyncio.run(simulate(call, args.calls, args.interval, clock))
+        rejected = sum(fake.rejected for fake in fakes.values())
+        rows.append((label, result, rejected, clock()))
+
+    print(f"{args.calls} calls, one every {args.interval:g} s, server limit {args.server_rpm} rpm per model, "
+          f"daily quota {args.daily} on {models[0]}, {args.error_rate:.0%} 503\n")
+    print(f"{'client':<12} {'answered':>9} {'429s':>6} {'mean wait s':>12} {'max wait s':>11} {'virtual min':>12}  answered by")
+    for label, result, rejected, elapsed in rows:
+        waits = result["waits"] or [0.0]
+        by_model = ", ".join(f"{name} {count}" for name, count in result["by_model"].most_common())
+        print(f"{label:<12} {result['answered']:>9} {rejected:>6} {sum(waits) / len(waits):>12.2f} "
+              f"{max(waits):>11.2f} {elapsed / 60:>12.1f}  {by_model}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark of the read_screen_text pipeline with generated screens and a local OCR stand-in.
+
+A local HTTP server answers like OCR.space and simulates the upload over a link of --uplink-mbps.
+Reports upload size and wall time per read for
+ - legacy: full-resolution PNG saved to disk, reopened and posted
+ - pipeline: in-memory grayscale JPEG, downscaled to 1920 px wide
+ - pipeline (unchanged screen): perceptual-hash cache hit, nothing posted
+and checks that a screen with one changed line is not served from the cache.
+
+Run from the `my_agent [command line]` folder:
+    python -m benchmarks.bench_screen_ocr --width 2560 --height 1440 --uplink-mbps 10
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from PIL import Image, ImageDraw, ImageFont
+from utils.screen_capture import ScreenReader, StaticImageSource
+
+WORDS = "error warning file line module import failed success request response value config".split()
+
+
+def make_screen(width: int, height: int, seed: int, changed_line: int | None = None,
+                photo_share: float = 0.3) -> Image.Image:
+    """A desktop-like screen: title bar, sidebar, lines of colored text and a photo-like panel on the right."""
+    rng = random.Random(seed)
+    image = Image.new("RGB", (width, height), (245, 245, 248))
+    if photo_share:
+        photo_width = int(width * photo_share)
+        noise = Image.frombytes("RGB", (photo_width // 8, height // 8), rng.randbytes(photo_width // 8 * (height // 8) * 3))
+        image.paste(noise.resize((photo_width, height), Image.Resampling.BICUBIC), (width - photo_width, 0))
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=max(height // 60, 12))
+    draw.rectangle((0, 0, width, height // 25), fill=(40, 44, 52))
+    draw.rectangle((0, height // 25, width // 6, height), fill=(230, 232, 236))
+    line_height = max(height // 45, 16)
+    for i, y in enumerate(range(height // 20, height - line_height, line_height)):
+        words = rng.choices(WORDS, k=rng.randint(4, 14))
+        if i == changed_line:
+            words = ["CHANGED"] + words
+        color = rng.choice([(20, 20, 20), (160, 30, 30), (30, 90, 160)])
+        draw.text((width // 6 + 20, y), " ".join(words) + f" {rng.randint(0, 9999)}", fill=color, font=font)
+    return image
+
+
+class FakeOCRHandler(BaseHTTPRequestHandler):
+    uplink_bps = 10e6
+    uploads = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.uploads.append(len(body))
+        time.sleep(len(body) * 8 / self.uplink_bps)
+        payload = json.dumps({"IsErroredOnProcessing": False, "ParsedResults": [{"ParsedText": f"{len(body)} bytes"}]})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+def legacy_read(image: Image.Image, url: str, tmp: str) -> None:
+    """Copy of the previous read_screen_text path."""
+    file_name = os.path.join(tmp, "screenshot.png")
+    image.save(file_name)
+    with open(file_name, "rb") as f:
+        requests.post(url, files={"filename": f}, data={"apikey": "x", "language": "eng"}).json()
+    os.remove(file_name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--width", type=int, default=2560)
+    parser.add_argument("--height", type=int, default=1440)
+    parser.add_argument("--uplink-mbps", type=float, default=10.0)
+    parser.add_argument("--photo-share", type=float, default=0.3, help="width share of the photo-like panel")
+    args = parser.parse_args()
+
+    FakeOCRHandler.uplink_bps = args.uplink_mbps * 1e6
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOCRHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/parse/image"
+
+    screen = make_screen(args.width, args.height, seed=1, photo_share=args.photo_share)
+    changed = make_screen(args.width, args.height, seed=1, changed_line=12, photo_share=args.photo_share)
+    reader = ScreenReader(StaticImageSource([screen, screen, changed]), api_key="x", ocr_url=url)
+    rows = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        legacy_read(screen, url, tmp)
+        rows.append(("legacy PNG", FakeOCRHandler.uploads[-1], time.perf_counter() - start))
+
+    for label in ("pipeline JPEG", "pipeline (unchanged screen)", "pipeline (one line changed)"):
+        uploads = len(FakeOCRHandler.uploads)
+        start = time.perf_counter()
+        reader.read("eng")
+        elapsed = time.perf_counter() - start
+        rows.append((label, FakeOCRHandler.uploads[-1] if len(FakeOCRHandler.uploads) > uploads else 0, elapsed))
+
+    server.shutdown()
+    assert rows[2][1] == 0, "unchanged screen was uploaded again"
+    assert rows[3][1] > 0, "changed screen was served from the cache"
+
+    print(f"Screen {args.width}x{args.height}, uplink {args.uplink_mbps:g} Mbit/s\n")
+    print(f"{'read':<30} {'upload KB':>10} {'ms':>8}")
+    for label, size, seconds in rows:
+        print(f"{label:<30} {size / 1024:>10.1f} {seconds * 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark of the tool schemas sent per LLM call: all tools vs ToolSelector (full and compact).
+
+For a set of typical requests, reports the input tokens of the bound tool schemas (JSON as sent
+in the request) with
+ - all: every tool bound (previous behaviour)
+ - selected: the tools ToolSelector picks for the request
+ - compact: the same selection with compact descriptions
+and checks that the tools the request needs are in the selection (recall).
+
+Tokens are counted with tiktoken's cl100k_base when its BPE file is available, else as chars / 4.
+
+Run from the `my_agent [command line]` folder:
+    python -m benchmarks.bench_tool_selection
+"""
+
+import json
+from langchain_core.messages import HumanMessage
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from core.tool_selector import ToolSelector
+from utils import tool_registry
+
+# (request, tools it needs)
+REQUESTS = [
+    ("hi, how are you?", []),
+    ("explain how a hash map works", []),
+    ("set volume to 40", ["set_volume"]),
+    ("lower the sound a bit", ["set_volume"]),
+    ("make the screen brighter", ["set_brightness"]),
+    ("open chrome", ["open_app"]),
+    ("close notepad and minimize vscode", ["close_app", "minimize_app"]),
+    ("switch to the terminal window", ["switch_btwn_apps"]),
+    ("what's the weather in Delhi today", ["internet_search"]),
+    ("research the latest LLM releases and compare them", ["batch_internet_search"]),
+    ("summarize https://example.com/article", ["web_scraper"]),
+    ("create a folder named reports on the desktop", ["create_folder"]),
+    ("delete the file old.log", ["delete_file"]),
+    ("move report.pdf into the documents folder", ["move_file_folder"]),
+    ("zip the reports folder", ["create_zipfile"]),
+    ("unzip archive.zip into downloads", ["extract_zipfile"]),
+    ("read the file notes.txt", ["read_file"]),
+    ("what does the error on my screen say", ["read_screen_text"]),
+    ("run git status in my project", ["run_command"]),
+    ("open youtube in the browser", ["open_url_or_query"]),
+    ("change my name to Sam", ["change_user_preferences"]),
+]
+
+
+def token_counter():
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return "cl100k_base", lambda text: len(encoding.encode(text, disallowed_special=()))
+    except Exception:
+        return "chars / 4", lambda text: len(text) // 4 + 1
+
+
+def main():
+    tokenizer, count = token_counter()
+    tools = tool_registry.get_tools()
+    full = ToolSelector(tools, compact=False)
+    compact = ToolSelector(tools, compact=True)
+
+    def schema_tokens(selected) -> int:
+        return sum(count(json.dumps(convert_to_openai_tool(t))) for t in selected)
+
+    all_tokens = schema_tokens(tools)
+    rows, misses = [], []
+    for text, needed in REQUESTS:
+        messages = [HumanMessage(text)]
+        selected = full.select(messages)
+        names = {t.name for t in selected}
+        missing = [name for name in needed if name not in names]
+        if missing:
+            misses.append((text, missing))
+        rows.append((text, len(selected), schema_tokens(selected), schema_tokens(compact.select(messages)), not missing))
+
+    print(f"{len(tools)} tools, tokens counted with {tokenizer}\n")
+    print(f"{'request':<52} {'tools':>5} {'all':>6} {'selected':>9} {'compact':>8} {'recall':>7}")
+    for text, n, selected, compacted, ok in rows:
+        print(f"{text[:52]:<52} {n:>5} {all_tokens:>6} {selected:>9} {compacted:>8} {'ok' if ok else 'MISS':>7}")
+    mean_selected = sum(row[2] for row in rows) / len(rows)
+    mean_compact = sum(row[3] for row in rows) / len(rows)
+    print(f"\nmean tokens per call: all {all_tokens}, selected {mean_selected:.0f} "
+          f"({mean_selected / all_tokens:.0%}), compact {mean_compact:.0f} ({mean_compact / all_tokens:.0%})")
+    print(f"recall: {len(rows) - len(misses)}/{len(rows)} requests got every tool they need")
+    for text, missing in misses:
+        print(f"  missed {missing} for {text!r}")
+
+
+if __name__ == "__main__":
+    main()
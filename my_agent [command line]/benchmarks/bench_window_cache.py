@@ -0,0 +1,75 @@
+"""
+Benchmark of the window snapshot cache used by the window tools.
+
+Replays turns of window tool calls (switch / minimize / maximize / close) on a FakeWindowBackend
+with a simulated enumeration cost, and compares:
+ - legacy: getAllTitles + getWindowsWithTitle per call (two enumerations)
+ - snapshot: WindowCache shared by the calls of the turn
+
+Run from the `my_agent [command line]` folder:
+    python -m benchmarks.bench_window_cache --windows 60 --calls 6 --enum-ms 8
+"""
+
+import argparse
+import statistics
+import time
+from rapidfuzz import process, fuzz
+from utils.window_backend import FakeWindowBackend, WindowCache
+
+ACTIONS = ["restore", "minimize", "maximize", "restore", "minimize", "close"]
+
+
+def make_titles(count: int) -> list:
+    apps = ["Google Chrome", "Visual Studio Code", "Spotify", "File Explorer", "Notepad", "Discord"]
+    return [f"Document {i} - {apps[i % len(apps)]}" for i in range(count)]
+
+
+def legacy_call(backend, query: str, action: str):
+    """Copy of the previous find_closest_window_title + getWindowsWithTitle path."""
+    titles = [window.title for window in backend.list_windows()]
+    result = process.extractOne(query, titles, scorer=fuzz.partial_ratio)
+    if not result:
+        return None
+    window = [window for window in backend.list_windows() if window.title == result[0]][0]
+    getattr(window, action)()
+    return result[0]
+
+
+def cached_call(cache, query: str, action: str):
+    match = cache.apply(query, lambda window: getattr(window, action)(), changes_windows=action == "close")
+    return match[0] if match else None
+
+
+def run_turns(turns: int, windows: int, calls: int, enum_delay: float, cached: bool):
+    durations, enumerations = [], 0
+    for turn in range(turns):
+        backend = FakeWindowBackend(make_titles(windows), enum_delay=enum_delay)
+        cache = WindowCache(backend)
+        queries = [(f"Document {(turn + i) % windows}", ACTIONS[i % len(ACTIONS)]) for i in range(calls)]
+        start = time.perf_counter()
+        for query, action in queries:
+            if cached:
+                cached_call(cache, query, action)
+            else:
+                legacy_call(backend, query, action)
+        durations.append(time.perf_counter() - start)
+        enumerations += backend.enumerations
+    return statistics.median(durations) * 1000, enumerations / turns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--windows", type=int, default=60)
+    parser.add_argument("--calls", type=int, default=6, help="window tool calls per turn")
+    parser.add_argument("--enum-ms", type=float, default=8.0, help="simulated cost of one enumeration")
+    parser.add_argument("--turns", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'turn median ms':>15} {'enumerations/turn':>18}")
+    for mode, cached in (("legacy", False), ("snapshot", True)):
+        turn_ms, enumerations = run_turns(args.turns, args.windows, args.calls, args.enum_ms / 1000, cached)
+        print(f"{mode:<10} {turn_ms:>15.2f} {enumerations:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark of the parallel ZIP writer against shutil.make_archive.
+
+Builds a synthetic project tree (compressible source/log files plus already-compressed media)
+and reports wall time and archive size of
+ - make_archive (serial deflate, level 6)
+ - write_zip with 1 thread and with all cores, at the given levels
+
+Run from the `my_agent [command line]` folder:
+    python -m benchmarks.bench_zip --files 400 --size-kb 512
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+import zipfile
+from utils.parallel_zip import write_zip
+
+WORDS = ("def class return import self value result error config request response "
+         "async await loop thread cache index token model tool file folder").split()
+
+
+def build_tree(root: str, files: int, size_kb: int, media_ratio: float, seed: int = 0) -> int:
+    rng = random.Random(seed)
+    total = 0
+    for i in range(files):
+        folder = os.path.join(root, f"module_{i % 20}", f"part_{i % 7}")
+        os.makedirs(folder, exist_ok=True)
+        size = rng.randint(size_kb * 512, size_kb * 1536)
+        if rng.random() < media_ratio:
+            path = os.path.join(folder, f"asset_{i}.jpg")
+            data = rng.randbytes(size)
+        else:
+            path = os.path.join(folder, f"file_{i}.py")
+            text = []
+            length = 0
+            while length < size:
+                line = " ".join(rng.choices(WORDS, k=rng.randint(4, 12))) + f" {rng.randint(0, 10**6)}\n"
+                text.append(line)
+                length += len(line)
+            data = "".join(text).encode()
+        with open(path, "wb") as f:
+            f.write(data)
+        total += len(data)
+    return total
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=400)
+    parser.add_argument("--size-kb", type=int, default=512, help="average file size")
+    parser.add_argument("--media", type=float, default=0.2, help="share of already-compressed files")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 6])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "project")
+        total = build_tree(source, args.files, args.size_kb, args.media)
+        print(f"Synthetic tree: {args.files} files, {total / 1e6:.1f} MB, {os.cpu_count()} cores\n")
+
+        out = os.path.join(tmp, "out")
+        os.makedirs(out)
+        rows = []
+
+        base = os.path.join(out, "make_archive")
+        seconds = timed(lambda: shutil.make_archive(base, "zip", root_dir=tmp, base_dir="project"))
+        rows.append(("make_archive", 6, 1, seconds, os.path.getsize(base + ".zip")))
+
+        for level in args.levels:
+            for workers in sorted({1, os.cpu_count()}):
+                zip_path = os.path.join(out, f"write_zip_{level}_{workers}.zip")
+                seconds = timed(lambda: write_zip(zip_path, source, level=level, workers=workers))
+                assert zipfile.ZipFile(zip_path).testzip() is None
+                rows.append(("write_zip", level, workers, seconds, os.path.getsize(zip_path)))
+
+        reference = rows[0][3]
+        print(f"{'writer':<13} {'level':>5} {'threads':>7} {'seconds':>8} {'MB/s':>7} {'size MB':>8} {'speedup':>8}")
+        for name, level, workers, seconds, size in rows:
+            print(f"{name:<13} {level:>5} {workers:>7} {seconds:>8.2f} {total / 1e6 / seconds:>7.1f} "
+                  f"{size / 1e6:>8.1f} {reference / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
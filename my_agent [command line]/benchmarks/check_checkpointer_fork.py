@@ -0,0 +1,118 @@
+"""
+Regression check of the SQLite checkpointer (core/checkpointer.py) on forks and old databases.
+
+Fails (exit code 1) when
+ - a run forked from an older checkpoint changes the state of the original branch,
+ - either branch reads differently after reopening the database, or
+ - a thread written with integer channel versions (databases before string versions) cannot be
+   resumed and continued.
+
+Run from the `my_agent [command line]` folder:
+    python -m benchmarks.check_checkpointer_fork
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from unittest import mock
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.graph import END, START, MessagesState, StateGraph
+from core.checkpointer import SQLiteCheckpointer
+
+CONFIG = {"configurable": {"thread_id": "check"}}
+
+
+class IntegerVersionCheckpointer(SQLiteCheckpointer):
+    """Writes integer channel versions, like the checkpointer did before string versions (use with legacy_reads)."""
+
+    def get_next_version(self, current, channel=None):
+        return BaseCheckpointSaver.get_next_version(self, current, channel)
+
+
+def legacy_reads():
+    """Loaded checkpoints keep their integer versions, as before string versions."""
+    return mock.patch("core.checkpointer._upgrade_version", lambda version: version)
+
+
+def build_app(checkpointer):
+    def echo(state: MessagesState):
+        return {"messages": [AIMessage(content=f"echo:{state['messages'][-1].content}")]}
+
+    graph = StateGraph(MessagesState)
+    graph.add_node("echo", echo)
+    graph.add_edge(START, "echo")
+    graph.add_edge("echo", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def contents(state) -> list:
+    return [msg.content for msg in state.values["messages"]]
+
+
+async def say(app, text: str, config=CONFIG):
+    await app.ainvoke({"messages": [HumanMessage(content=text)]}, config)
+
+
+async def check_fork(path: str) -> list:
+    failures = []
+    checkpointer = SQLiteCheckpointer(path)
+    app = build_app(checkpointer)
+    for text in ("a", "b", "c"):
+        await say(app, text)
+    original = (await app.aget_state(CONFIG)).config
+    expected = ["a", "echo:a", "b", "echo:b", "c", "echo:c"]
+
+    # The checkpoint at the end of turn 1.
+    history = [state async for state in app.aget_state_history(CONFIG)]
+    turn_1 = next(state.config for state in history if contents(state) == ["a", "echo:a"] and not state.next)
+    await say(app, "FORK", turn_1)
+    forked = (await app.aget_state(CONFIG)).config
+
+    for label, application in (("after the fork", app), ("after reopening", None)):
+        if application is None:
+            checkpointer.close()
+            checkpointer = SQLiteCheckpointer(path)
+            application = build_app(checkpointer)
+        got = contents(await application.aget_state(original))
+        if got != expected:
+            failures.append(f"original branch {label}: {got}")
+        got = contents(await application.aget_state(forked))
+        if got != ["a", "echo:a", "FORK", "echo:FORK"]:
+            failures.append(f"forked branch {label}: {got}")
+    checkpointer.close()
+    return failures
+
+
+async def check_legacy(path: str) -> list:
+    with legacy_reads():
+        checkpointer = IntegerVersionCheckpointer(path)
+        app = build_app(checkpointer)
+        for text in ("a", "b"):
+            await say(app, text)
+        checkpointer.close()
+
+    checkpointer = SQLiteCheckpointer(path)
+    app = build_app(checkpointer)
+    await say(app, "c")
+    got = contents(await app.aget_state(CONFIG))
+    checkpointer.close()
+    if got != ["a", "echo:a", "b", "echo:b", "c", "echo:c"]:
+        return [f"thread with integer versions continued as: {got}"]
+    return []
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        failures = await check_fork(os.path.join(tmp, "fork.sqlite"))
+        failures += await check_legacy(os.path.join(tmp, "legacy.sqlite"))
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK: forked branches keep their own history, integer-version threads resume")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
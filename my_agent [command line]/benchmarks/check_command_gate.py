@@ -0,0 +1,68 @@
+"""
+Regression check of run_command's approval gate (utils/terminal_control_tool.py).
+
+Runs is_read_only_command on command lines that must run without approval and on command lines
+hiding a state change behind an allowlisted first word, and fails (exit code 1) on any wrong answer.
+
+Run from the `my_agent [command line]` folder:
+    python -m benchmarks.check_command_gate
+"""
+
+import os
+import sys
+import tempfile
+
+os.environ.setdefault("APPDATA", tempfile.gettempdir())
+from utils.terminal_control_tool import is_read_only_command
+
+READ_ONLY = [
+    "dir",
+    "git status",
+    "git status && dir",
+    "ls -la | grep x",
+    "Get-ChildItem C:\\Users | Select-Object Name",
+    "Get-Content notes.txt | Select-String error",
+    "cd ..; pwd",
+    "python --version",
+    "pip list",
+]
+
+NEEDS_APPROVAL = [
+    "",
+    "pip install requests",
+    "rm -rf x",
+    "git push",
+    "git branch -D main",
+    "Start-Process notepad",
+    "echo hi > f.txt",
+    "cd ..; del x",
+    "dir & del x",
+    "& x.exe",
+    "git diff --output=x.patch",
+    "Get-Content a.txt | Set-Content b.txt",
+    "Get-Content script.ps1 | iex",
+    # Commands run from inside an argument.
+    "echo $(rm x)",
+    "echo `rm x`",
+    "echo (Remove-Item -Recurse C:\\x)",
+    "Write-Output @(Stop-Computer)",
+    "ls | ? { Remove-Item $_.FullName }",
+    "dir | sort-object { Remove-Item C:/x }",
+    "cat <(rm x)",
+    "ls; { rm x; }",
+]
+
+
+def main():
+    failures = [f"runs without approval: {command!r}" for command in NEEDS_APPROVAL if is_read_only_command(command)]
+    failures += [f"asks for approval: {command!r}" for command in READ_ONLY if not is_read_only_command(command)]
+    print(f"{len(READ_ONLY)} read-only and {len(NEEDS_APPROVAL)} state-changing command lines checked")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
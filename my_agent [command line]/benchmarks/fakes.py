@@ -0,0 +1,31 @@
+"""
+Offline stand-ins for the Gemini model and the tools, used by the graph benchmarks.
+Provides:
+- ScriptedChatModel: Chat model answering with a script (messages -> AIMessage), from core/cassette.py.
+- make_fake_tool: Tool sleeping `latency` seconds and returning `payload` characters.
+- FAKE_TOOL_SPEC: ToolSpec of the fake tools (parallel safe, like the read-only tools).
+"""
+
+import asyncio
+import time
+from langchain_core.tools import StructuredTool
+from core.cassette import ScriptedChatModel
+from utils.tool_registry import ToolSpec
+
+FAKE_TOOL_SPEC = ToolSpec("benchmarks", max_concurrency=8)
+
+
+def make_fake_tool(name: str, latency: float = 0.0, payload: int = 1000, is_async: bool = False) -> StructuredTool:
+    """Blocking tools go through the executor's thread pool, async ones are awaited on the loop."""
+
+    def run(query: str) -> str:
+        time.sleep(latency)
+        return "x" * payload
+
+    async def arun(query: str) -> str:
+        await asyncio.sleep(latency)
+        return "x" * payload
+
+    if is_async:
+        return StructuredTool.from_function(coroutine=arun, name=name, description=f"Fake tool {name}.")
+    return StructuredTool.from_function(func=run, name=name, description=f"Fake tool {name}.")
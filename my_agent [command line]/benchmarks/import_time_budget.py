@@ -0,0 +1,100 @@
+"""
+Import-time budget check of the console startup (startup regression guard).
+
+Runs `python -X importtime` on the import chain of main.py (config, core.runner, the graph, the nodes and
+the tool registry, with config's prompts answered by STARTUP_ENV) and fails (exit code 1) when
+ - one of the heavy tool dependencies is imported before the first tool call, or
+ - the total import time goes over the budget.
+
+Run from the `my_agent [command line]` folder:
+    python -m benchmarks.import_time_budget --budget-ms 3000
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must only be imported when the tool using them is called.
+HEAVY_MODULES = [
+    "pyautogui", "PIL", "pycaw", "comtypes", "screen_brightness_control",
+    "tavily", "rapidfuzz", "pygetwindow", "send2trash", "pyperclip",
+]
+
+STARTUP_CODE = "import core.runner"
+OWN_PACKAGES = {"config", "core", "nodes", "utils"}
+
+# Settings config.py reads instead of prompting (as benchmarks/replay_cassette.py sets them).
+STARTUP_ENV = {
+    "GOOGLE_API_KEY": "startup", "TAVILY_API_KEY": "startup", "OCR_API_KEY": "startup",
+    "NAME": "User", "NEURA_MODEL": "gemini-2.5-flash", "NEURA_TELEMETRY": "0",
+}
+
+
+def measure() -> list:
+    """Returns (module, self_us, cumulative_us, depth) for every import done by STARTUP_CODE."""
+    env = dict(os.environ, **STARTUP_ENV)
+    for key in ("NEURA_RECORD", "NEURA_REPLAY"):
+        env.pop(key, None)
+    with tempfile.TemporaryDirectory(prefix="neura-startup-") as appdata:
+        env["APPDATA"] = appdata
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_CODE],
+            cwd=AGENT_DIR, env=env, stdin=subprocess.DEVNULL, capture_output=True, text=True,
+        )
+    if proc.returncode != 0:
+        raise SystemExit(f"Startup code failed:\n{proc.stderr}")
+
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=3000)
+    parser.add_argument("--top", type=int, default=10, help="show the N slowest imports of the startup modules")
+    args = parser.parse_args()
+
+    imports = measure()
+    top_level = [imp for imp in imports if imp[3] == 0]
+    total_ms = sum(imp[2] for imp in top_level) / 1000
+    # Third-party imports done directly by the agent's own modules (children are listed before their parent).
+    startup, parents = [], {}
+    for imp in reversed(imports):
+        name, depth = imp[0], imp[3]
+        parents[depth] = name
+        parent = parents.get(depth - 1, "")
+        if depth and parent.split(".")[0] in OWN_PACKAGES and name.split(".")[0] not in OWN_PACKAGES:
+            startup.append(imp)
+
+    print(f"{'cumulative ms':>14}  module")
+    for name, _, cumulative_us, _ in sorted(startup, key=lambda imp: -imp[2])[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f}  {name}")
+    print(f"\nTotal import time: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failures = []
+    loaded = {imp[0].split(".")[0] for imp in imports}
+    for module in HEAVY_MODULES:
+        if module in loaded:
+            failures.append(f"{module} is imported at startup")
+    if total_ms > args.budget_ms:
+        failures.append(f"import time {total_ms:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
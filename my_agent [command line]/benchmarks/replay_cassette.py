@@ -0,0 +1,142 @@
+"""
+Offline replay of a recorded session (core/cassette.py) through the agent's real graph and nodes.
+
+Record a session with the app:
+    NEURA_RECORD=1 python main.py          (or NEURA_RECORD=<file>)
+then replay it without Gemini, Tavily or OCR.space keys:
+    python -m benchmarks.replay_cassette <file>.cassette.zst
+
+The recorded answers and tool results are served instantly, so the turn times measure the
+agent's own work on real traffic (graph, checkpoints, compaction, routing, tool selection and
+result handling). Reports the turn wall times, the node times, the recorded model and tool time
+for reference, and whether the replay followed the recording: `diverged` counts model requests
+that differ from the recorded ones (e.g. after a prompt change), `unused` the recorded answers
+and tool results never asked for. --strict exits with 1 if either is not 0 (for CI).
+Results are written as JSON with flat metric names (--json, default: RESULTS_DIR in the system
+temp folder); --compare prints the change against an earlier result file.
+
+Run from the `my_agent [command line]` folder.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from core.cassette import Cassette
+
+RESULTS_DIR = os.path.join(tempfile.gettempdir(), "neura-benchmarks")
+
+
+def prepare_environment(path: str):
+    """Settings config.py reads, so it starts without prompts in replay mode."""
+    meta = Cassette(path, "replay").meta
+    os.environ.pop("NEURA_RECORD", None)
+    os.environ.update(NEURA_REPLAY=path, NEURA_MODEL=meta["model"], NAME=meta.get("name") or "User",
+                      NEURA_TELEMETRY="0")
+    for key in ("GOOGLE_API_KEY", "TAVILY_API_KEY", "OCR_API_KEY"):
+        os.environ.setdefault(key, "replay")
+    os.environ.setdefault("APPDATA", tempfile.mkdtemp(prefix="neura-replay-"))
+
+
+async def replay(cassette, verbose: bool) -> tuple:
+    from langchain_core.messages import HumanMessage
+    from core.checkpointer import SQLiteCheckpointer
+    from core.graph import build_graph
+    from core.tool_executor import set_approver
+    from nodes.agent_nodes import call_llm_node, execute_tool_calls_node
+
+    async def approve(tool_name, args):
+        return True     # replayed tools only return their recorded results
+
+    set_approver(approve)
+    walls, error = [], None
+    output = sys.stdout if verbose else open(os.devnull, "w")
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpointer = SQLiteCheckpointer(os.path.join(tmp, "replay.sqlite"))
+        app = build_graph(call_llm_node, execute_tool_calls_node, checkpointer)
+        config = {"configurable": {"thread_id": cassette.thread_id}}
+        for user_input in cassette.turns():
+            start = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(output):
+                    async for _ in app.astream_events({"messages": [HumanMessage(content=user_input)]}, config, version="v2"):
+                        pass
+            except Exception as e:
+                error = f"turn {len(walls) + 1}: {e}"
+                break
+            walls.append(time.perf_counter() - start)
+        checkpointer.close()
+    return walls, error
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cassette")
+    parser.add_argument("--json", default=os.path.join(RESULTS_DIR, "replay.json"), help="result file")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    parser.add_argument("--strict", action="store_true", help="exit with 1 if the replay diverged")
+    parser.add_argument("--verbose", action="store_true", help="show the tool logs of the nodes")
+    args = parser.parse_args()
+
+    prepare_environment(os.path.abspath(args.cassette))
+    import config
+    from benchmarks.bench_graph import compare, git_commit
+    from core.telemetry import telemetry
+
+    cassette = config.cassette
+    walls, error = asyncio.run(replay(cassette, args.verbose))
+    recorded = [entry for entry in cassette.entries if entry["type"] in ("llm", "tool")]
+    unused = cassette.unused()
+
+    results = {
+        "turns": len(walls),
+        "turn_ms.mean": statistics.mean(walls) * 1000 if walls else 0.0,
+        "turn_ms.max": max(walls, default=0.0) * 1000,
+        "total_s": sum(walls),
+        "recorded.llm_calls": sum(entry["type"] == "llm" for entry in recorded),
+        "recorded.tool_calls": sum(entry["type"] == "tool" for entry in recorded),
+        "recorded.llm_s": sum(entry["seconds"] for entry in recorded if entry["type"] == "llm"),
+        "recorded.tool_s": sum(entry["seconds"] for entry in recorded if entry["type"] == "tool"),
+        "diverged": len(cassette.diverged),
+        "unused.llm": unused["llm"],
+        "unused.tool": unused["tool"],
+    }
+    for node, row in telemetry.summary("node").items():
+        results[f"node.{node}.p50_ms"] = row["p50"] * 1000
+        results[f"node.{node}.p95_ms"] = row["p95"] * 1000
+
+    report = {
+        "benchmark": "replay_cassette",
+        "cassette": os.path.basename(args.cassette),
+        "commit": git_commit(),
+        "error": error,
+        "results": {metric: round(value, 4) for metric, value in results.items()},
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+    with open(args.json, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+
+    print(f"\n{len(walls)}/{len(cassette.turns())} turns replayed from {args.cassette}, commit {report['commit']}\n")
+    for metric, value in report["results"].items():
+        print(f"{metric:<40} {value:>12.3f}")
+    for kind, detail in cassette.diverged[:10]:
+        print(f"  diverged: {kind} {detail}")
+    if error:
+        print(f"\nreplay stopped: {error}")
+    print(f"\nwritten to {args.json}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(json.load(f)["results"], report["results"])
+
+    if args.strict and (error or cassette.diverged or unused["llm"] or unused["tool"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
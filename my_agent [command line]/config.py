@@ -1,16 +1,9 @@
 import os
-from utils import change_user_preferences_tool as cup
-from utils import research_tools
-from utils import open_close_min_max_res_apps_tool as ocmmr
-from utils import control_brightness_volume_tool as cbv
-from utils import create_rename_delete_folder_tool as crdf
-from utils import create_rename_delete_file_tool as crdfile
-from utils import move_file_folder as mff
-from utils import create_or_extract_zip_tool as cez
-from utils import read_file_tool as rft
-from utils import open_url_query_in_browser_tool as ouqb
-from utils import read_screen_text_tool as rst
-from utils import terminal_control_tool as tst
+from utils import tool_registry
+from core.rate_limiter import FailoverLLM, failover_order
+from core.model_router import AUTO_MODEL, MODEL_TIERS, ModelRouter, ModelStats
+from core.cassette import open_cassette
+from core.tool_selector import ToolSelector
 from dotenv import load_dotenv
 from langchain_google_genai import ChatGoogleGenerativeAI
 from InquirerPy import inquirer
@@ -25,6 +18,57 @@ ENV_PATH = os.path.join(config_dir, ".env")
 if os.path.exists(ENV_PATH):
     load_dotenv(ENV_PATH)
 
+welcome_msg = """\033[38;5;208m
+
+█░█░█ █▀▀ █░░ █▀▀ █▀█ █▀▄▀█ █▀▀   ▀█▀ █▀█   █▄░█ █▀▀ █░█ █▀█ ▄▀█   █▀▀ █▀█ █▀▄▀█ █▀▄▀█ ▄▀█ █▄░█ █▀▄
+▀▄▀▄▀ ██▄ █▄▄ █▄▄ █▄█ █░▀░█ ██▄   ░█░ █▄█   █░▀█ ██▄ █▄█ █▀▄ █▀█   █▄▄ █▄█ █░▀░█ █░▀░█ █▀█ █░▀█ █▄▀
+\033[0m
+"""
+os.system("cls" if os.name == "nt" else "clear")
+print("\033c", end="")
+print(welcome_msg)
+
+tavily_key = os.getenv("TAVILY_API_KEY")
+name = os.getenv("NAME")
+
+
+if not tavily_key:
+    print()
+    while True:
+        choice = input(
+            "Tavily is used for searching the web and scraping any URL.\n"
+            "Without this API key, these features will not work.\n"
+            "Do you want to provide it? (Y/N): "
+        ).strip().upper()
+
+        if choice in ("Y", "N"):
+            break
+        else:
+            print("\nPlease enter only Y or N.\n")
+
+    if choice == "Y":
+        print()
+        while True:
+            tavily_key = input("Enter your Tavily API: ").strip()
+            if tavily_key:
+                print()
+                break
+        with open(ENV_PATH, 'a') as f:
+            f.write(f"TAVILY_API_KEY={tavily_key}\n")
+        print(f"\nTAVILY_API_KEY not found! Added TAVILY_API_KEY={tavily_key}\n")
+    else:
+        tavily_key = "PlaceHolder"
+        print("\nProceeding without Tavily API key.\n")
+
+else:
+    print(f"TAVILY_API_KEY found! name = {name}, tavily_api_key = {tavily_key}\n")
+
+# Tool modules are imported lazily, so the OCR key entry is created here instead of at import time.
+if os.getenv("OCR_API_KEY") is None:
+    with open(ENV_PATH, 'a') as f:
+        f.write("OCR_API_KEY=\n")
+    print("OCR_API_KEY not found! Created .env ")
+
 gemini_key = os.getenv("GOOGLE_API_KEY")
 name = os.getenv("NAME")
 
@@ -49,27 +93,60 @@ if not name:
 else:
     print(f"Gemini_API_Key found! name = {name}, gemini_key = {gemini_key}\n")
 
-llm_choice = inquirer.select(
-    message="Choose an LLM (Use Arrow keys) to select:",
-    choices=[
+LLM_MODELS = [
     "gemini-2.0-flash-lite",
     "gemini-2.0-flash",
     "gemini-2.5-flash-lite",
     "gemini-2.5-flash",
     "gemini-2.5-pro"
-], 
+]
+
+# NEURA_MODEL skips the prompt (replays and scripted runs).
+llm_choice = os.getenv("NEURA_MODEL") or inquirer.select(
+    message="Choose an LLM (Use Arrow keys) to select:",
+    choices=[AUTO_MODEL] + LLM_MODELS, 
     qmark = "",
-    long_instruction="Choose fast 😁"
+    long_instruction="Choose fast 😁 (auto: lite model for simple requests, larger ones when needed)"
 ).execute()
-# LLM
-llm = ChatGoogleGenerativeAI(
-    model=llm_choice,
-    temperature=0,
-    max_tokens=None,
-    timeout=None,
-    max_retries=0,
-    google_api_key=gemini_key,
+
+# NEURA_RECORD records this session to a cassette, NEURA_REPLAY replays one offline (core/cassette.py).
+cassette = open_cassette(config_dir, meta={"model": llm_choice, "name": name})
+replaying = cassette is not None and cassette.replaying
+
+def make_llm(model: str) -> ChatGoogleGenerativeAI:
+    if replaying:
+        return cassette.chat_model(model)
+    # Retries are handled by FailoverLLM (rate limit, backoff, failover to the next model).
+    return ChatGoogleGenerativeAI(
+        model=model,
+        temperature=0,
+        max_tokens=None,
+        timeout=None,
+        max_retries=0,
+        google_api_key=gemini_key,
+    )
+
+# "auto": every LLM call is routed to a tier by the ModelRouter (nodes/agent_nodes.py).
+auto_routing = llm_choice == AUTO_MODEL
+default_model = MODEL_TIERS[0] if auto_routing else llm_choice
+router = ModelRouter(
+    fixed_model=None if auto_routing else llm_choice,
+    stats=ModelStats(os.path.join(config_dir, "model_stats.json")),
+)
+
+# LLM (also used for conversation summaries)
+llm = make_llm(default_model)
+# Lazy tools: full schemas for the LLM, the implementing modules are imported on first call.
+tools = tool_registry.get_tools()
+tools_by_name = tool_registry.get_tools_by_name()
+if replaying:
+    tools_by_name = cassette.replay_tools(tools_by_name)
+# The schemas bound to each call are picked per call (core/tool_selector.py).
+tool_selector = ToolSelector(tools)
+# Every call starts with the routed model; the other ones are fallbacks when it is rate limited.
+llm_pool = FailoverLLM(
+    failover_order(LLM_MODELS, default_model),
+    lambda model: llm if model == default_model else make_llm(model),
+    # A replay is not rate limited.
+    rpm={model: 1_000_000 for model in LLM_MODELS + MODEL_TIERS} if replaying else None,
 )
-tools = [research_tools.internet_search, research_tools.web_scraper, ocmmr.open_app, ocmmr.close_app, ocmmr.minimize_app, ocmmr.maximize_app, ocmmr.restore_app, ocmmr.switch_btwn_apps, cbv.set_volume, cbv.set_brightness, crdf.create_folder, crdf.rename_folder, crdf.delete_folder, crdfile.create_add_content_file, crdfile.rename_file, crdfile.delete_file, mff.move_file_folder, cez.create_zipfile, cez.extract_zipfile, rft.read_file, ouqb.open_url_or_query, rst.read_screen_text, tst.write_command_in_terminal, cup.change_user_preferences]
-tools_by_name = {tool.name: tool for tool in tools}
-llmwithtools = llm.bind_tools(tools)
\ No newline at end of file
@@ -0,0 +1,289 @@
+"""
+Record / replay of agent sessions: every LLM answer and tool result, in a zstd-compressed cassette.
+Provides:
+- Cassette: One session (user turns, LLM answers, tool results) loaded from / saved to a file.
+- CassetteRecorder: Callback handler recording the chat model and tool runs of the graph.
+- ScriptedChatModel: Chat model streaming the answers of a script (replay and benchmarks).
+- open_cassette: The cassette of this process from NEURA_RECORD / NEURA_REPLAY, or None.
+- fingerprint: Hash of the messages sent to a model (detects a replay diverging from the recording).
+
+Recording (NEURA_RECORD=<file>, or 1 for %APPDATA%/Neura Command/cassettes/<time>.cassette.zst)
+adds CassetteRecorder to the callbacks of every turn, so the real nodes, models and tools run
+unchanged; the cassette is rewritten after each turn, on a fresh checkpointer thread so the
+recording holds the whole conversation.
+
+Replaying (NEURA_REPLAY=<file>, see benchmarks/replay_cassette.py) swaps the chat models for
+ScriptedChatModel serving the recorded answers in order and every tool for a stand-in returning
+the recorded result of the same call, so the graph, compaction, routing and tool selection run
+offline on the recorded traffic. Answers are served in recorded order; a request whose
+fingerprint differs from the recorded one is counted in `diverged`.
+
+File: zstd frame of JSON lines, first line {"type": "meta", ...}, then "turn", "llm" and "tool"
+entries in the order they happened.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from typing import Any, Callable
+import zstandard
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, message_chunk_to_message, messages_from_dict, message_to_dict
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.tools import StructuredTool
+
+FORMAT_VERSION = 1
+ZSTD_LEVEL = 9
+INTERNAL_TAG = "neura:internal"
+
+
+def _usage(messages: list, text: str) -> dict:
+    input_tokens = sum(len(str(msg.content)) for msg in messages) // 4
+    output_tokens = len(text) // 4
+    return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Attributes:
+        script (callable): Messages -> the AIMessage to answer (text and/or tool_calls, optional usage_metadata).
+        latency (float): Seconds before the first chunk (time to first token).
+        chunk_chars (int): Characters of text per streamed chunk.
+    """
+    script: Callable[[list], AIMessage]
+    latency: float = 0.0
+    chunk_chars: int = 200
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        # The script decides the tool calls; the schemas are not needed.
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency)
+        answer = self.script(messages)
+        message = AIMessage(answer.content, tool_calls=answer.tool_calls,
+                            usage_metadata=answer.usage_metadata or _usage(messages, answer.text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        await asyncio.sleep(self.latency)
+        answer = self.script(messages)
+        text = answer.text
+        pieces = [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)] or [""]
+        message_id = f"run-{uuid.uuid4()}"
+        for i, piece in enumerate(pieces):
+            last = i == len(pieces) - 1
+            chunk = AIMessageChunk(
+                content=piece,
+                id=message_id,
+                tool_call_chunks=[
+                    {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": n}
+                    for n, call in enumerate(answer.tool_calls)
+                ] if last else [],
+                usage_metadata=(answer.usage_metadata or _usage(messages, text)) if last else None,
+            )
+            if run_manager and piece:
+                await run_manager.on_llm_new_token(piece, chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+
+def fingerprint(messages: list) -> str:
+    parts = [[msg.type, str(msg.content), getattr(msg, "tool_calls", None) or []] for msg in messages]
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def _args_key(name: str, args) -> str:
+    return name + json.dumps(args, sort_keys=True, default=str)
+
+
+def _jsonable(value):
+    """Tool results are kept as JSON when they are plain data, as their str() otherwise."""
+    try:
+        return json.loads(json.dumps(value))
+    except (TypeError, ValueError):
+        return str(value)
+
+
+class CassetteRecorder(BaseCallbackHandler):
+    """Records the chat model answers and tool results of the runs it is attached to."""
+
+    run_inline = True       # keep the recorded order of the model calls
+
+    def __init__(self, cassette):
+        self.cassette = cassette
+        self.lock = threading.Lock()
+        self.pending = {}       # run id -> (start time, fields known at start)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, tags=None, metadata=None, **kwargs):
+        with self.lock:
+            self.pending[run_id] = (time.perf_counter(), {
+                "model": (metadata or {}).get("ls_model_name"),
+                "request": fingerprint(messages[0]),
+                "internal": INTERNAL_TAG in (tags or []),
+            })
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self.lock:
+            start, fields = self.pending.pop(run_id, (None, None))
+        if fields is None:
+            return
+        message = response.generations[0][0].message
+        if isinstance(message, AIMessageChunk):
+            message = message_chunk_to_message(message)
+        self.cassette.add("llm", seconds=round(time.perf_counter() - start, 3), message=message_to_dict(message), **fields)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        # Rate limited / failed attempts are retried by the pool; only answers are replayed.
+        with self.lock:
+            self.pending.pop(run_id, None)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, inputs=None, **kwargs):
+        with self.lock:
+            self.pending[run_id] = (time.perf_counter(), {"name": serialized.get("name"), "args": inputs})
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        with self.lock:
+            start, fields = self.pending.pop(run_id, (None, None))
+        if fields is not None:
+            self.cassette.add("tool", seconds=round(time.perf_counter() - start, 3), result=_jsonable(output), **fields)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        with self.lock:
+            start, fields = self.pending.pop(run_id, (None, None))
+        if fields is not None:
+            self.cassette.add("tool", seconds=round(time.perf_counter() - start, 3), error=str(error), **fields)
+
+
+class Cassette:
+    """
+    Args:
+        path (str): Cassette file.
+        mode (str): "record" (starts empty, save() writes it) or "replay" (loads the file).
+        meta (dict|None): Session facts stored in the first line when recording (model, user name...).
+    """
+
+    def __init__(self, path: str, mode: str = "replay", meta: dict | None = None):
+        self.path = path
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.entries = []
+        self.diverged = []          # (kind, detail) of replayed requests not matching the recording
+        self.thread_id = f"cassette-{uuid.uuid4().hex[:8]}"
+        if mode == "record":
+            self.meta = {"type": "meta", "version": FORMAT_VERSION, "created": time.time(), **(meta or {})}
+            self.recorder = CassetteRecorder(self)
+            return
+
+        with open(path, "rb") as f:
+            lines = zstandard.ZstdDecompressor().stream_reader(f).read().decode("utf-8").splitlines()
+        entries = [json.loads(line) for line in lines if line]
+        self.meta, self.entries = entries[0], entries[1:]
+        self._answers = deque(entry for entry in self.entries if entry["type"] == "llm")
+        self._served = 0
+        self._tool_results = defaultdict(deque)
+        for entry in self.entries:
+            if entry["type"] == "tool":
+                self._tool_results[_args_key(entry["name"], entry["args"])].append(entry)
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def turns(self) -> list:
+        """User inputs of the recorded turns, in order."""
+        return [entry["input"] for entry in self.entries if entry["type"] == "turn"]
+
+    # ---- recording ----
+
+    def add(self, kind: str, **fields):
+        with self.lock:
+            self.entries.append({"type": kind, **fields})
+
+    def record_turn(self, user_input: str):
+        self.add("turn", input=user_input)
+
+    def save(self):
+        """Rewrites the whole cassette (atomically, so a crash keeps the previous turn's file)."""
+        with self.lock:
+            lines = [json.dumps(entry, default=str) for entry in [self.meta, *self.entries]]
+        data = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(("\n".join(lines) + "\n").encode("utf-8"))
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self.path)
+
+    # ---- replay ----
+
+    def next_answer(self, messages: list) -> AIMessage:
+        with self.lock:
+            if not self._answers:
+                raise RuntimeError("Cassette has no more recorded LLM answers: the replay diverged from the recording.")
+            entry = self._answers.popleft()
+            self._served += 1
+            if entry["request"] != fingerprint(messages):
+                self.diverged.append(("llm", f"call {self._served}"))
+        return messages_from_dict([entry["message"]])[0]
+
+    def tool_result(self, name: str, args: dict):
+        with self.lock:
+            queue = self._tool_results.get(_args_key(name, args))
+            if not queue:
+                # Same tool with other arguments: serve its next recorded call and report it.
+                queue = next((q for key, q in self._tool_results.items() if q and q[0]["name"] == name), None)
+                self.diverged.append(("tool", f"{name}({args})"))
+            if not queue:
+                raise RuntimeError(f"Cassette has no recorded result for {name}")
+            entry = queue.popleft()
+        if "error" in entry:
+            raise RuntimeError(entry["error"])
+        return entry["result"]
+
+    def chat_model(self, model: str | None = None) -> ScriptedChatModel:
+        """Replay stand-in for any model: every model of the pool shares the recorded answer order."""
+        return ScriptedChatModel(script=self.next_answer)
+
+    def replay_tools(self, tools_by_name: dict) -> dict:
+        """Stand-ins with the same names and argument schemas, returning the recorded results."""
+
+        def make(tool):
+            return StructuredTool(
+                name=tool.name,
+                description=tool.description,
+                args_schema=tool.args_schema,
+                func=lambda **kwargs: self.tool_result(tool.name, kwargs),
+            )
+
+        return {name: make(tool) for name, tool in tools_by_name.items()}
+
+    def unused(self) -> dict:
+        """Recorded answers / tool results the replay never asked for."""
+        with self.lock:
+            return {"llm": len(self._answers), "tool": sum(len(q) for q in self._tool_results.values())}
+
+
+def open_cassette(config_dir: str, meta: dict | None = None) -> Cassette | None:
+    """NEURA_REPLAY=<file> replays it, NEURA_RECORD=<file> (or 1) records this session."""
+    replay = os.getenv("NEURA_REPLAY")
+    if replay:
+        return Cassette(replay, "replay")
+    record = os.getenv("NEURA_RECORD")
+    if not record or record == "0":
+        return None
+    if record == "1":
+        record = os.path.join(config_dir, "cassettes", time.strftime("%Y%m%d-%H%M%S") + ".cassette.zst")
+    return Cassette(record, "record", meta)
@@ -0,0 +1,369 @@
+"""
+Disk-backed LangGraph checkpointer on SQLite (WAL mode).
+Provides:
+- SQLiteCheckpointer: Drop-in replacement for MemorySaver that survives restarts.
+
+Storage layout:
+- Values are serialized with LangGraph's msgpack serializer (ormsgpack) and compressed with zstandard.
+- Channel values are stored per (channel, version), like MemorySaver, so unchanged channels are never rewritten.
+- List channels (the `messages` channel) that only grew since the previous version are stored as a delta
+  (the appended items + a pointer to the base version). A full snapshot is written every SNAPSHOT_EVERY
+  deltas so rebuilding a value never walks a long chain.
+- Loading is lazy: resuming a thread reads the latest checkpoint row and the blobs of its current
+  channel versions only, never the thread's older checkpoints.
+- Channel versions are unique strings (counter + random suffix, like InMemorySaver), so a run forked
+  from an older checkpoint writes new blob keys instead of replacing the other branch's blobs.
+  Integer versions of databases written before are read as strings with LEGACY_SUFFIX.
+"""
+
+import asyncio
+import random
+import sqlite3
+import threading
+import zstandard
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+SNAPSHOT_EVERY = 32
+ZSTD_LEVEL = 3
+LEGACY_SUFFIX = "." + "0" * 16      # random suffixes always contain a second "." (formatted floats)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    kind TEXT NOT NULL,          -- 'full', 'delta' or 'empty'
+    base_version TEXT,           -- for 'delta': version the items are appended to
+    depth INTEGER NOT NULL DEFAULT 0,
+    type TEXT,
+    data BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    data BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+
+def _upgrade_version(version):
+    """An integer version (databases written before string versions) as a string ordered with the new ones."""
+    return f"{version:032}{LEGACY_SUFFIX}" if isinstance(version, int) else version
+
+
+def _blob_key(version: str) -> str:
+    """Version column of the blobs of `version` (integer versions were stored as str(int))."""
+    return str(int(version[:32])) if version.endswith(LEGACY_SUFFIX) else version
+
+
+def _is_prefix(prev: list, new: list) -> bool:
+    if len(prev) > len(new):
+        return False
+    return all(a is b or a == b for a, b in zip(prev, new))
+
+
+class SQLiteCheckpointer(BaseCheckpointSaver[str]):
+    """
+    Args:
+        path (str): SQLite database file, created if missing.
+        snapshot_every (int): Max number of deltas before a full snapshot is stored.
+    """
+
+    def __init__(self, path: str, *, serde=None, snapshot_every: int = SNAPSHOT_EVERY):
+        super().__init__(serde=serde)
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self._local = threading.local()     # zstd (de)compressors are not thread-safe
+        # (thread_id, ns, channel) -> (version, value copy, depth), the newest value of each list channel.
+        self._last_lists = {}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # serialization
+
+    def _codecs(self):
+        if not hasattr(self._local, "compressor"):
+            self._local.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+            self._local.decompressor = zstandard.ZstdDecompressor()
+        return self._local.compressor, self._local.decompressor
+
+    def _dump(self, obj) -> tuple:
+        type_, data = self.serde.dumps_typed(obj)
+        return type_, self._codecs()[0].compress(data)
+
+    def _load(self, type_: str, data: bytes):
+        return self.serde.loads_typed((type_, self._codecs()[1].decompress(data)))
+
+    # blobs
+
+    def _put_blob(self, thread_id, ns, channel, version, values):
+        """Writes one channel value. Returns the new _last_lists entry of a list channel (else None), for after COMMIT."""
+        key = (thread_id, ns, channel)
+        version = str(version)
+
+        entry = None
+        if channel not in values:
+            row = ("empty", None, 0, None, None)
+        else:
+            value = values[channel]
+            last = self._last_lists.get(key)
+            if (
+                isinstance(value, list)
+                and last is not None
+                and last[2] < self.snapshot_every
+                and _is_prefix(last[1], value)
+            ):
+                base_version, prev, depth = last
+                type_, data = self._dump(value[len(prev):])
+                row = ("delta", base_version, depth + 1, type_, data)
+            else:
+                type_, data = self._dump(value)
+                row = ("full", None, 0, type_, data)
+            if isinstance(value, list):
+                entry = (version, list(value), row[2])
+
+        self.conn.execute(
+            "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (thread_id, ns, channel, version, *row),
+        )
+        return entry
+
+    def _get_blob(self, thread_id, ns, channel, version):
+        """Rebuilds one channel value, following the delta chain back to the last full snapshot."""
+        version = _blob_key(str(version))
+        deltas = []
+        current = version
+        while True:
+            row = self.conn.execute(
+                "SELECT kind, base_version, depth, type, data FROM blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, ns, channel, current),
+            ).fetchone()
+            if row is None:
+                return None, False
+            kind, base_version, depth, type_, data = row
+            if kind == "empty":
+                return None, False
+            if kind == "full":
+                value = self._load(type_, data)
+                break
+            deltas.append(self._load(type_, data))
+            current = base_version
+
+        if deltas:
+            value = list(value)
+            for items in reversed(deltas):
+                value.extend(items)
+        if isinstance(value, list):
+            self._last_lists[(thread_id, ns, channel)] = (version, list(value), len(deltas))
+        return value, True
+
+    def _load_channel_values(self, thread_id, ns, versions) -> dict:
+        values = {}
+        for channel, version in versions.items():
+            value, found = self._get_blob(thread_id, ns, channel, version)
+            if found:
+                values[channel] = value
+        return values
+
+    def _tuple_from_row(self, thread_id, ns, row) -> CheckpointTuple:
+        checkpoint_id, parent_id, type_, checkpoint_b, metadata_type, metadata_b = row
+        checkpoint = self._load(type_, checkpoint_b)
+        checkpoint["channel_versions"] = {
+            channel: _upgrade_version(version) for channel, version in checkpoint["channel_versions"].items()
+        }
+        checkpoint["versions_seen"] = {
+            node: {channel: _upgrade_version(version) for channel, version in seen.items()}
+            for node, seen in checkpoint["versions_seen"].items()
+        }
+        writes = self.conn.execute(
+            "SELECT task_id, channel, type, data FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": checkpoint_id}},
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_channel_values(thread_id, ns, checkpoint["channel_versions"]),
+            },
+            metadata=self._load(metadata_type, metadata_b),
+            pending_writes=[(task_id, channel, self._load(t, d)) for task_id, channel, t, d in writes],
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": parent_id}}
+                if parent_id
+                else None
+            ),
+        )
+
+    # BaseCheckpointSaver API
+
+    def get_next_version(self, current, channel=None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    def get_tuple(self, config):
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        query = (
+            "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ?"
+        )
+        with self.lock:
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self.conn.execute(query + " AND checkpoint_id = ?", (thread_id, ns, checkpoint_id)).fetchone()
+            else:
+                row = self.conn.execute(query + " ORDER BY checkpoint_id DESC LIMIT 1", (thread_id, ns)).fetchone()
+            if row is None:
+                return None
+            return self._tuple_from_row(thread_id, ns, row)
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+            "FROM checkpoints"
+        )
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+
+        for thread_id, ns, *row in rows:
+            if limit is not None and limit <= 0:
+                break
+            if filter:
+                metadata = self._load(row[-2], row[-1])
+                if not all(metadata.get(k) == v for k, v in filter.items()):
+                    continue
+            if limit is not None:
+                limit -= 1
+            with self.lock:
+                item = self._tuple_from_row(thread_id, ns, row)
+            yield item
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        c = checkpoint.copy()
+        values = c.pop("channel_values")
+
+        with self.lock:
+            # The delta base cache only follows committed blobs: a rolled back version must never be a base.
+            entries = {}
+            self.conn.execute("BEGIN")
+            try:
+                for channel, version in new_versions.items():
+                    entries[(thread_id, ns, channel)] = self._put_blob(thread_id, ns, channel, version, values)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        thread_id,
+                        ns,
+                        checkpoint["id"],
+                        config["configurable"].get("checkpoint_id"),
+                        *self._dump(c),
+                        *self._dump(get_checkpoint_metadata(config, metadata)),
+                    ),
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                for channel in new_versions:
+                    self._last_lists.pop((thread_id, ns, channel), None)
+                raise
+            for key, entry in entries.items():
+                if entry is not None:
+                    self._last_lists[key] = entry
+
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        # Special channels (errors, interrupts...) overwrite, normal writes are kept once.
+        verb = "INSERT OR REPLACE" if all(w[0] in WRITES_IDX_MAP for w in writes) else "INSERT OR IGNORE"
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, data = self._dump(value)
+            rows.append((thread_id, ns, checkpoint_id, task_id, WRITES_IDX_MAP.get(channel, idx), channel, type_, data, task_path))
+        with self.lock:
+            self.conn.executemany(f"{verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def delete_thread(self, thread_id):
+        with self.lock:
+            for table in ("checkpoints", "blobs", "writes"):
+                self.conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            for key in [k for k in self._last_lists if k[0] == thread_id]:
+                del self._last_lists[key]
+
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        items = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in items:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id):
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
@@ -0,0 +1,51 @@
+"""
+The agent's LangGraph: an LLM node and a tool node in a loop until the model stops calling tools.
+Provides:
+- build_graph: Compiles the graph from its two nodes.
+- should_call_tools: Routing after the LLM node (tools if the last AIMessage has tool calls).
+
+The runner builds it with the real nodes (nodes/agent_nodes.py); benchmarks build the same graph
+with a scripted model and fake tools (benchmarks/bench_graph.py).
+"""
+
+from langgraph.graph import StateGraph, MessagesState, START, END
+from langchain_core.messages import AIMessage
+from core.telemetry import timed_node
+
+LLM_NODE = "llm_node"
+TOOLS_NODE = "execute_tool_calls_node"
+
+
+def should_call_tools(state: MessagesState):
+    last_message = state["messages"][-1]
+    if isinstance(last_message, AIMessage) and last_message.tool_calls:
+        return "tools"
+    else:
+        return "end"
+
+
+def build_graph(call_llm, execute_tools, checkpointer=None):
+    """
+    Args:
+        call_llm (callable): Async node answering the messages (returns the AIMessage).
+        execute_tools (callable): Async node running the tool calls of the last AIMessage.
+        checkpointer (BaseCheckpointSaver|None): Where the thread state is saved.
+
+    Returns:
+        CompiledStateGraph: The compiled app; node wall times are recorded by core/telemetry.py.
+    """
+    graph = StateGraph(MessagesState)
+    graph.add_node(LLM_NODE, timed_node(LLM_NODE, call_llm))
+    graph.add_node(TOOLS_NODE, timed_node(TOOLS_NODE, execute_tools))
+
+    graph.add_edge(START, LLM_NODE)
+    graph.add_conditional_edges(
+        LLM_NODE,
+        should_call_tools,
+        {
+            "tools": TOOLS_NODE,
+            "end": END,
+        }
+    )
+    graph.add_edge(TOOLS_NODE, LLM_NODE)
+    return graph.compile(checkpointer=checkpointer)
@@ -0,0 +1,171 @@
+"""
+Per-call routing between the Gemini tiers, with per-model latency / token statistics.
+Provides:
+- Route: Model picked for one LLM call, its tier and the reasons.
+- ModelRouter: route (messages -> Route) and record (latency, tokens of the answer).
+- complexity_score: Heuristic difficulty of a user message.
+- ModelStats: Per-model counters persisted to model_stats.json, with latency percentiles.
+
+Most calls are cheap: "set volume to 40", or the step after a tool that only reports its result.
+They go to the lite tier. A user message scores higher with length, code, several questions and
+words asking for reasoning or writing (explain, compare, debug...); the score picks the tier of
+the turn's first call. Steps that post-process tool output run one tier below the turn's tier.
+Repeated failing tool calls and long tool loops escalate the rest of the turn one tier each.
+With a fixed model (not "auto") the router always returns it and only records statistics.
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from langchain_core.messages import HumanMessage, ToolMessage
+
+# Cheapest first.
+MODEL_TIERS = ["gemini-2.5-flash-lite", "gemini-2.5-flash", "gemini-2.5-pro"]
+AUTO_MODEL = "auto (route per request)"
+
+# complexity_score -> tier of the turn's first call: score >= TIER_THRESHOLDS[i] selects tier i + 1.
+TIER_THRESHOLDS = (2, 3)
+LONG_MESSAGE_WORDS = 25
+VERY_LONG_MESSAGE_WORDS = 80
+COMPLEX_HINTS = (
+    "explain", "why", "compare", "difference", "analy", "summar", "write", "code", "script",
+    "debug", "plan", "design", "research", "step by step", "essay", "pros and cons",
+    "optimi", "refactor", "review", "translate", "calculate", "prove",
+)
+ESCALATE_AFTER_ERRORS = 2       # failed tool results in the turn before escalating one tier
+ESCALATE_AFTER_STEPS = 6        # LLM steps in the turn before escalating one tier
+TOOL_ERROR_MARKERS = ("error", "exception", "failed", "timed out", "not found", "invalid", "denied")
+
+LATENCY_SAMPLES = 200
+
+
+@dataclass
+class Route:
+    model: str
+    tier: int | None
+    reasons: list = field(default_factory=list)
+
+
+def complexity_score(text: str) -> int:
+    """0 for a short command; +1/+2 for length, +1 per reasoning/writing hint (max 2), +1 for code, +1 for several questions."""
+    lower = text.lower()
+    words = len(text.split())
+    score = 2 if words > VERY_LONG_MESSAGE_WORDS else 1 if words > LONG_MESSAGE_WORDS else 0
+    score += min(2, sum(hint in lower for hint in COMPLEX_HINTS))
+    if "```" in text or text.count("\n") >= 5:
+        score += 1
+    if text.count("?") > 1:
+        score += 1
+    return score
+
+
+def _is_tool_error(msg: ToolMessage) -> bool:
+    head = str(msg.content)[:200].lower()
+    return getattr(msg, "status", None) == "error" or any(marker in head for marker in TOOL_ERROR_MARKERS)
+
+
+class ModelStats:
+    """
+    Per-model calls, tokens, latency and routing reasons; totals are kept across runs in `path`.
+
+    Args:
+        path (str|None): JSON file of the totals (None: in memory only).
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.totals = {}        # model -> {calls, input_tokens, output_tokens, latency_s, by_reason}
+        self.latencies = {}     # model -> recent latencies of this run
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.totals = json.load(f)
+            except (OSError, ValueError):
+                self.totals = {}
+
+    def record(self, model: str, latency: float, input_tokens: int, output_tokens: int, reasons: list):
+        with self.lock:
+            entry = self.totals.setdefault(
+                model, {"calls": 0, "input_tokens": 0, "output_tokens": 0, "latency_s": 0.0, "by_reason": {}}
+            )
+            entry["calls"] += 1
+            entry["input_tokens"] += input_tokens
+            entry["output_tokens"] += output_tokens
+            entry["latency_s"] = round(entry["latency_s"] + latency, 3)
+            for reason in reasons:
+                entry["by_reason"][reason] = entry["by_reason"].get(reason, 0) + 1
+            self.latencies.setdefault(model, deque(maxlen=LATENCY_SAMPLES)).append(latency)
+            if self.path:
+                tmp = self.path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(self.totals, f, indent=1)
+                os.replace(tmp, self.path)
+
+    def summary(self) -> dict:
+        """model -> calls, mean latency, mean tokens and this run's p50 / p95 latency."""
+        with self.lock:
+            result = {}
+            for model, entry in self.totals.items():
+                calls = entry["calls"] or 1
+                row = {
+                    "calls": entry["calls"],
+                    "mean_latency_s": round(entry["latency_s"] / calls, 2),
+                    "mean_input_tokens": round(entry["input_tokens"] / calls),
+                    "mean_output_tokens": round(entry["output_tokens"] / calls),
+                }
+                recent = sorted(self.latencies.get(model, ()))
+                if recent:
+                    row["p50_s"] = round(recent[len(recent) // 2], 2)
+                    row["p95_s"] = round(recent[min(int(len(recent) * 0.95), len(recent) - 1)], 2)
+                result[model] = row
+            return result
+
+
+class ModelRouter:
+    """
+    Args:
+        fixed_model (str|None): Model to always use; None routes between `tiers`.
+        tiers (list[str]): Models from cheapest to largest.
+        stats (ModelStats|None): Where record() goes.
+    """
+
+    def __init__(self, fixed_model: str | None = None, tiers: list = MODEL_TIERS, stats: ModelStats | None = None):
+        self.fixed_model = fixed_model
+        self.tiers = list(tiers)
+        self.stats = stats or ModelStats()
+
+    def route(self, messages: list) -> Route:
+        if self.fixed_model:
+            return Route(self.fixed_model, None, ["fixed"])
+
+        start = max((i for i, msg in enumerate(messages) if isinstance(msg, HumanMessage)), default=None)
+        if start is None:
+            return Route(self.tiers[0], 0, ["no_user_message"])
+        turn = messages[start + 1:]
+
+        score = complexity_score(messages[start].text)
+        tier = sum(score >= threshold for threshold in TIER_THRESHOLDS)
+        reasons = [f"complexity_{score}"]
+        if turn and isinstance(turn[-1], ToolMessage):
+            tier = max(0, tier - 1)
+            reasons.append("tool_output")
+
+        # Both counts only grow during a turn, so an escalated turn stays escalated.
+        if sum(isinstance(msg, ToolMessage) and _is_tool_error(msg) for msg in turn) >= ESCALATE_AFTER_ERRORS:
+            tier += 1
+            reasons.append("tool_errors")
+        if sum(msg.type == "ai" for msg in turn) >= ESCALATE_AFTER_STEPS:
+            tier += 1
+            reasons.append("long_tool_loop")
+
+        tier = min(tier, len(self.tiers) - 1)
+        return Route(self.tiers[tier], tier, reasons)
+
+    def record(self, route: Route, model: str, latency: float, usage: dict | None):
+        """Adds one answered call (the model that answered may differ from route.model after a failover)."""
+        usage = usage or {}
+        reasons = route.reasons if model == route.model else route.reasons + ["failover"]
+        self.stats.record(model, latency, usage.get("input_tokens", 0), usage.get("output_tokens", 0), reasons)
@@ -0,0 +1,68 @@
+"""
+Per-tool output budgets for the ToolMessages kept in the conversation history.
+Provides:
+- OutputGovernor: govern (tool name, result -> ToolMessage content within the tool's budget).
+
+A ToolMessage stays in the history and is sent again with every later LLM call, so a full
+Tavily raw_content, a whole file or a screen of OCR text costs its tokens many times over.
+Results longer than the tool's ToolSpec.max_output_chars are stored in the artifact store
+(utils/artifact_store.py) and replaced by a preview: the head (2/3 of the budget) and the tail
+(1/3), cut at line ends, around a note giving the artifact handle and the fetch_artifact call
+reading the omitted part. The model pages further only when it needs to.
+"""
+
+from utils.artifact_store import get_store
+from utils.tool_registry import get_spec
+
+TAIL_SHARE = 1 / 3
+LINE_SNAP = 200     # characters a cut may move back / forward to land on a line end
+
+
+class OutputGovernor:
+    """
+    Args:
+        store (ArtifactStore|None): Where oversized outputs go (default: the shared store).
+        budgets (dict|None): Tool name -> max characters, overriding ToolSpec.max_output_chars.
+    """
+
+    def __init__(self, store=None, budgets: dict | None = None):
+        self._store = store
+        self.budgets = budgets or {}
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = get_store()
+        return self._store
+
+    def budget(self, tool_name: str) -> int:
+        return self.budgets.get(tool_name) or get_spec(tool_name).max_output_chars
+
+    def govern(self, tool_name: str, result) -> str:
+        text = str(result)
+        budget = self.budget(tool_name)
+        if len(text) <= budget:
+            return text
+
+        try:
+            handle = self.store.put(text)
+        except OSError:
+            # No artifact store (disk full, read-only profile): keep the head only, as before.
+            return text[:budget] + f"\n...[truncated {len(text) - budget} of {len(text)} characters]"
+
+        head_end = budget - int(budget * TAIL_SHARE)
+        cut = text.rfind("\n", head_end - LINE_SNAP, head_end)
+        if cut > 0:
+            head_end = cut
+        tail_start = len(text) - int(budget * TAIL_SHARE)
+        cut = text.find("\n", tail_start, tail_start + LINE_SNAP)
+        if cut != -1:
+            tail_start = cut + 1
+
+        omitted = tail_start - head_end
+        note = (
+            f"\n\n[... {omitted:,} of {len(text):,} characters omitted (characters {head_end:,}-{tail_start:,}). "
+            f"Full output stored as artifact {handle}; call fetch_artifact(handle=\"{handle}\", offset={head_end}) "
+            f"only if the omitted part is needed ...]\n\n"
+        )
+        return text[:head_end] + note + text[tail_start:]
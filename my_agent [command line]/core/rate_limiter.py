@@ -0,0 +1,237 @@
+"""
+Client-side rate limiting, retry and model failover for the Gemini calls.
+Provides:
+- TokenBucket: Request budget of one model that adapts to 429 responses (AIMD).
+- classify_error: "rate_limit", "quota", "transient" or None (not retryable) for an LLM exception.
+- retry_after_of: Server-suggested retry delay of a 429, if any.
+- FailoverLLM: astream / ainvoke over an ordered list of models, each behind its TokenBucket.
+- failover_order: The chosen model first, then the others of the list.
+- AllModelsRateLimited: No model can take the call within MAX_WAIT.
+
+ChatGoogleGenerativeAI runs with max_retries=0, so a 429 used to end the turn. Calls now wait for
+a token of the model's bucket before going out. A 429 halves the bucket's rate and blocks it for
+the server's retry delay (or a jittered exponential backoff), then the call is retried on the
+same model; 5xx and timeouts are retried after a jittered backoff. Successes raise the rate back
+by RATE_RECOVERY per call, up to the model's configured rate. When a model's wait would exceed
+MAX_WAIT, or its daily quota is spent, the call moves on to the next model of the list.
+Errors after the first streamed chunk are not retried: the caller already consumed part of the answer.
+"""
+
+import asyncio
+import random
+import re
+import time
+
+# Requests per minute of the free tier, used as the starting (and maximum) rate of each bucket.
+MODEL_RPM = {
+    "gemini-2.0-flash-lite": 30,
+    "gemini-2.0-flash": 15,
+    "gemini-2.5-flash-lite": 15,
+    "gemini-2.5-flash": 10,
+    "gemini-2.5-pro": 5,
+}
+DEFAULT_RPM = 10
+BURST = 4                   # calls a bucket lets through back to back
+MIN_RPM = 1.0
+RATE_DECREASE = 0.5         # rate factor after a 429
+RATE_RECOVERY = 0.5         # rpm added after each success
+RETRIES = 3                 # retries on the same model before moving on
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 20.0
+MAX_WAIT = 30.0             # longest wait (seconds) on one model before failing over
+QUOTA_BLOCK = 60 * 60       # seconds a model is skipped once its daily quota is spent
+
+
+class AllModelsRateLimited(Exception):
+    pass
+
+
+class TokenBucket:
+    """
+    Args:
+        rpm (float): Starting and maximum requests per minute.
+        burst (int): Bucket capacity.
+        clock (callable): Monotonic time source (replaceable in tests).
+    """
+
+    def __init__(self, rpm: float, burst: int = BURST, clock=time.monotonic):
+        self.max_rpm = rpm
+        self.rpm = rpm
+        self.capacity = max(1, min(burst, int(rpm)))
+        self.clock = clock
+        self.tokens = float(self.capacity)
+        self.updated = clock()
+        self.blocked_until = 0.0
+        self.rate_limited = 0
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rpm / 60)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        """Seconds until a call may go out."""
+        self._refill()
+        blocked = max(0.0, self.blocked_until - self.clock())
+        missing = max(0.0, 1 - self.tokens) * 60 / self.rpm
+        return max(blocked, missing)
+
+    def take(self):
+        self._refill()
+        self.tokens -= 1
+
+    def on_success(self):
+        self.rpm = min(self.max_rpm, self.rpm + RATE_RECOVERY)
+
+    def on_rate_limited(self, retry_after: float | None):
+        """Lowers the rate, empties the bucket and blocks it for the server's delay."""
+        self.rate_limited += 1
+        self.rpm = max(MIN_RPM, self.rpm * RATE_DECREASE)
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+        if retry_after:
+            self.block(retry_after)
+
+    def block(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, self.clock() + seconds)
+
+
+def classify_error(exc: Exception) -> str | None:
+    """How an LLM error is handled: "quota" (fail over), "rate_limit" / "transient" (retry) or None (raise)."""
+    text = str(exc)
+    code = getattr(exc, "code", None)
+    if code == 429 or re.search(r"\b429\b", text) or "RESOURCE_EXHAUSTED" in text or "quota" in text.lower():
+        return "quota" if "PerDay" in text or "per day" in text.lower() else "rate_limit"
+    if code in (500, 502, 503, 504) or re.search(r"\b50[0234]\b", text):
+        return "transient"
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError)):
+        return "transient"
+    return None
+
+
+def retry_after_of(exc: Exception) -> float | None:
+    """Retry delay suggested by the server ("Please retry in 31.2s" / retry_delay { seconds: 31 })."""
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after:
+        return float(retry_after)
+    match = re.search(r"retry in ([\d.]+)\s*s", str(exc)) or re.search(r"retry_delay\s*\{\s*seconds:\s*(\d+)", str(exc))
+    return float(match.group(1)) if match else None
+
+
+def failover_order(models: list, chosen: str) -> list:
+    """`chosen` first, then the models after it in the list, then the ones before it."""
+    if chosen not in models:
+        return [chosen] + list(models)
+    index = models.index(chosen)
+    return models[index:] + models[:index]
+
+
+class FailoverLLM:
+    """
+    Args:
+        models (list[str]): Model names, in failover order.
+        factory (callable): Model name -> chat model. Called once per model.
+        rpm (dict|None): Model name -> requests per minute (default MODEL_RPM).
+        max_wait (float): Longest wait on one model before the next one is tried.
+        retries (int): Retries on the same model.
+        clock, sleep: Time source and async sleep (replaceable in tests).
+    """
+
+    def __init__(self, models: list, factory, rpm: dict | None = None, max_wait: float = MAX_WAIT,
+                 retries: int = RETRIES, clock=time.monotonic, sleep=asyncio.sleep):
+        self.models = list(models)
+        self.factory = factory
+        self.rpm = rpm or MODEL_RPM
+        self.max_wait = max_wait
+        self.retries = retries
+        self.clock = clock
+        self.sleep = sleep
+        self.buckets = {}
+        self._instances = {}
+        self._bound = {}            # (model, ids of the tools) -> model with these tools bound
+        self.stats = {"calls": 0, "retries": 0, "failovers": 0, "rate_limited": 0, "waited": 0.0}
+
+    def bucket(self, model: str) -> TokenBucket:
+        if model not in self.buckets:
+            self.buckets[model] = TokenBucket(self.rpm.get(model, DEFAULT_RPM), clock=self.clock)
+        return self.buckets[model]
+
+    def instance(self, model: str):
+        if model not in self._instances:
+            self._instances[model] = self.factory(model)
+        return self._instances[model]
+
+    def bound(self, model: str, tools: list | None):
+        """The model with `tools` bound (cached per model and tool subset); `tools=None` binds nothing."""
+        if not tools:
+            return self.instance(model)
+        key = (model, tuple(id(t) for t in tools))
+        if key not in self._bound:
+            self._bound[key] = self.instance(model).bind_tools(tools)
+        return self._bound[key]
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+    async def astream(self, messages, model: str | None = None, tools: list | None = None, **kwargs):
+        """
+        Streams the answer of the first model that accepts the call, starting with `model`
+        (default: the first of the list), with `tools` bound. Yields (model name, chunk) pairs.
+
+        Raises the last error when every model is rate limited or out of quota.
+        """
+        order = failover_order(self.models, model) if model else self.models
+        self.stats["calls"] += 1
+        last_error = None
+
+        for index, name in enumerate(order):
+            if index:
+                self.stats["failovers"] += 1
+            bucket = self.bucket(name)
+            for attempt in range(self.retries + 1):
+                wait = bucket.wait_time()
+                if wait > self.max_wait:
+                    break
+                if wait > 0:
+                    self.stats["waited"] += wait
+                    await self.sleep(wait)
+                bucket.take()
+
+                streamed = False
+                try:
+                    async for chunk in self.bound(name, tools).astream(messages, **kwargs):
+                        streamed = True
+                        yield name, chunk
+                    bucket.on_success()
+                    return
+                except Exception as e:
+                    kind = classify_error(e)
+                    if streamed or kind is None:
+                        raise
+                    last_error = e
+
+                if kind == "quota":
+                    bucket.block(QUOTA_BLOCK)
+                    break
+                if kind == "rate_limit":
+                    # The bucket's wait covers the delay before the next attempt.
+                    self.stats["rate_limited"] += 1
+                    bucket.on_rate_limited(retry_after_of(last_error) or self._backoff(attempt))
+                    delay = 0.0
+                else:
+                    delay = self._backoff(attempt)
+                if attempt < self.retries:
+                    self.stats["retries"] += 1
+                    if delay:
+                        await self.sleep(delay)
+
+        if last_error is None:
+            raise AllModelsRateLimited(f"All models are rate limited for more than {self.max_wait:g} s: {', '.join(order)}")
+        raise last_error
+
+    async def ainvoke(self, messages, model: str | None = None, tools: list | None = None, **kwargs):
+        """Non-streaming call with the same policy. Returns (model name, message)."""
+        response, name = None, None
+        async for name, chunk in self.astream(messages, model, tools, **kwargs):
+            response = chunk if response is None else response + chunk
+        return name, response
@@ -4,21 +4,27 @@ warnings.filterwarnings(
     message="Core Pydantic V1 functionality isn't compatible with Python 3.14 or greater."
 )
 
-from langgraph.graph import StateGraph, MessagesState, START, END
 from google.api_core import exceptions
 from langchain_core.messages import HumanMessage
-from langgraph.checkpoint.memory import MemorySaver
 from prompt_toolkit import PromptSession
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.keys import Keys
 from prompt_toolkit.styles import Style as PTStyle
 from colorama import Fore, Style, init
 from rich.console import Console
+from rich.console import Group
+from rich.live import Live
 from rich.markdown import Markdown
-from rich.progress import Progress, SpinnerColumn, TextColumn
-import os, asyncio
-from nodes.agent_nodes import call_llm_node, execute_tool_calls_node, should_call_tools
-from config import ENV_PATH
+from rich.spinner import Spinner
+import os, asyncio, time
+from nodes.agent_nodes import call_llm_node, execute_tool_calls_node
+from config import ENV_PATH, cassette, config_dir, llm_pool
+from core.checkpointer import SQLiteCheckpointer
+from core.graph import build_graph
+from core.rate_limiter import AllModelsRateLimited
+from core.telemetry import configure as configure_telemetry, format_stats, telemetry
+from utils import tool_registry
+from core.tool_executor import set_approver
 
 init(autoreset=True)
 
@@ -41,24 +47,13 @@ def clear_gemini_api(env_path):
 
     print(Fore.RED + "GOOGLE_API_KEY removed from .env successfully due to invalid API KEY! Restart App to enter valid api key.")
 
-graph = StateGraph(MessagesState)
-graph.add_node("llm_node", call_llm_node)
-graph.add_node("execute_tool_calls_node", execute_tool_calls_node)
-
-graph.add_edge(START,"llm_node")
-graph.add_conditional_edges(
-    "llm_node", 
-    should_call_tools,
-    {
-        "tools": "execute_tool_calls_node",
-        "end": END,
-    }
-)
-graph.add_edge("execute_tool_calls_node", "llm_node")
-
-checkpointer = MemorySaver()
-app = graph.compile(checkpointer=checkpointer)
+checkpointer = SQLiteCheckpointer(os.path.join(config_dir, "checkpoints.sqlite"))
+app = build_graph(call_llm_node, execute_tool_calls_node, checkpointer)
 config = {"configurable": {"thread_id": "ARJ"}}
+recording = cassette is not None and cassette.recording
+if recording:
+    # A recording starts a new thread so the cassette holds the whole conversation.
+    config = {"configurable": {"thread_id": cassette.thread_id}, "callbacks": [cassette.recorder]}
 
 # RESULTS
 solution = """
@@ -90,13 +85,99 @@ default_msg = f"""
  {Fore.GREEN}• (Enter){Fore.WHITE} → New Line
  {Fore.GREEN}• (Ctrl + C){Fore.WHITE} → Exit the application
  {Fore.GREEN}• (Ctrl + D){Fore.WHITE} → Submit Query
+ {Fore.GREEN}• /stats{Fore.WHITE} → Latency, tokens, cache hits and retries of this session
 """
 
+async def stream_turn(input_data, console):
+    """
+    Runs one turn with `astream_events` and renders it live:
+    model tokens are shown as Markdown while they stream, tool runs as a spinner line.
+    """
+    finished = []   # text of model calls that already ended (e.g. text before a tool call)
+    current = ""
+    status = Spinner("arc", text="Generating response...")
+
+    def render():
+        parts = [Markdown(text, style="#2bbd65") for text in finished if text.strip()]
+        if current.strip():
+            parts.append(Markdown(current, style="#2bbd65"))
+        if status is not None:
+            parts.append(status)
+        return Group(*parts)
+
+    async def confirm(tool_name, args):
+        # Tools with ToolSpec.confirm (run_command) ask before a call that may change the system:
+        # pause the live view for the prompt.
+        action = args.get("command") if tool_name == "run_command" else f"{tool_name} {args}"
+        live.stop()
+        try:
+            answer = await PromptSession().prompt_async(
+                [('class:warning', f"\nThe agent wants to run: {action}\nAllow it? [y/N]: ")],
+                style=PTStyle.from_dict({'warning': 'ansiyellow bold'}),
+            )
+        except (KeyboardInterrupt, EOFError):
+            answer = ""
+        finally:
+            live.start()
+        return answer.strip().lower() in ("y", "yes")
+
+    set_approver(confirm)
+    try:
+        with Live(render(), console=console, refresh_per_second=15, vertical_overflow="visible") as live:
+            async for event in app.astream_events(input_data, config, version="v2"):
+                kind = event["event"]
+                node = event.get("metadata", {}).get("langgraph_node")
+                if "neura:internal" in event.get("tags", []):
+                    continue
+
+                if kind == "on_chat_model_start" and node == "llm_node":
+                    current = ""
+                    status = Spinner("arc", text="Thinking...")
+
+                elif kind == "on_chat_model_stream" and node == "llm_node":
+                    text = event["data"]["chunk"].text
+                    if text:
+                        current += text
+                        status = None
+
+                elif kind == "on_chat_model_end" and node == "llm_node":
+                    finished.append(current)
+                    current = ""
+                    status = Spinner("arc", text="Working...")
+
+                elif kind == "on_tool_start":
+                    status = Spinner("arc", text=f"Running {event['name']}...")
+
+                elif kind == "on_custom_event" and event["name"] == "tool_output":
+                    line = event["data"]["line"].strip()
+                    status = Spinner("arc", text=f"Running {event['data']['tool']}... {line[:100]}")
+
+                elif kind == "on_tool_end":
+                    status = Spinner("arc", text=f"{event['name']} finished, continuing...")
+
+                else:
+                    continue
+
+                live.update(render())
+
+            status = None
+            live.update(render())
+    finally:
+        set_approver(None)
+
+
 async def run_loop():
     os.system("cls" if os.name == "nt" else "clear")
     print("\033c", end="")
     print(default_msg)
+
+    # Import the tool modules while the user types the first prompt (NEURA_PREWARM_TOOLS=0 disables it).
+    if os.getenv("NEURA_PREWARM_TOOLS", "1") != "0":
+        tool_registry.prewarm()
     
+    configure_telemetry(os.path.join(config_dir, "telemetry.jsonl"))
+    if recording:
+        print(Fore.MAGENTA + f"Recording this session to {cassette.path}" + Style.RESET_ALL)
     console = Console()
     kb = KeyBindings()
     
@@ -126,18 +207,25 @@ async def run_loop():
 
             print()
 
-            input_data = {"messages": [HumanMessage(content=user_input)]}
+            if user_input.strip() == "/stats":
+                tables = format_stats(llm_pool.stats)
+                for table in tables:
+                    console.print(table)
+                if not tables:
+                    console.print("No statistics yet in this session.")
+                continue
 
-            with Progress(
-                SpinnerColumn("arc"),
-                TextColumn("[progress.description]{task.description}"),
-                transient=True
-            ) as progress:
-                progress.add_task("Generating response...", start=True)
-                result = await app.ainvoke(input_data, config)
+            input_data = {"messages": [HumanMessage(content=user_input)]}
 
-            markdown_text = result["messages"][-1].content
-            console.print(Markdown(markdown_text), style="#2bbd65")
+            if recording:
+                cassette.record_turn(user_input)
+            start = time.perf_counter()
+            try:
+                await stream_turn(input_data, console)
+            finally:
+                telemetry.record_turn(time.perf_counter() - start)
+                if recording:
+                    cassette.save()
 
         except KeyboardInterrupt:
             print("\nExiting.... Wait...")
@@ -154,8 +242,8 @@ async def run_loop():
         except exceptions.InternalServerError as e:
             print(Fore.RED + "Internal Server Error:", e)
         
-        except exceptions.TooManyRequests as e:
-            print(Fore.RED + "Too many Requests Change Gemini Model: ", e)
+        except (exceptions.TooManyRequests, AllModelsRateLimited) as e:
+            print(Fore.RED + "Too many Requests, every Gemini model is rate limited: ", e)
             print(Fore.MAGENTA + solution + Style.RESET_ALL)
                    
         except exceptions.BadRequest as e:
@@ -0,0 +1,219 @@
+"""
+Latency / token telemetry of the agent, written to an append-only JSONL file.
+Provides:
+- Telemetry: record (one event -> one JSON line), rotation by size, session samples and summary.
+- telemetry: The process-wide instance (memory only until configure() is called).
+- configure: Points the instance at a JSONL file (the runner does it; benchmarks don't).
+- timed_node: Wraps a LangGraph node to record its wall time.
+- format_stats: Rich tables of the session (the /stats command).
+
+Event kinds and fields:
+- node: name, seconds
+- tool: name, seconds, args_bytes, result_chars, error
+- llm: model, routed_model, seconds, input_tokens, output_tokens, tools_bound, retries, failovers,
+  rate_limit_wait (seconds waited for the rate limiter)
+- turn: seconds, caches (DiskCache hits / misses since the previous turn), http (retries / failures)
+
+Every line also has `ts` (unix time) and `session` (start time of the process), so several
+sessions can share the file. When the file passes max_bytes it is renamed to .1 (older ones
+shift to .2 ... up to `backups`) and a new file is started.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+
+MAX_BYTES = 5 * 1024 * 1024
+BACKUPS = 3
+TELEMETRY_ENABLED = os.getenv("NEURA_TELEMETRY", "1") != "0"
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class Telemetry:
+    """
+    Args:
+        path (str|None): JSONL file; None keeps the session samples in memory only.
+        max_bytes (int): Size at which the file is rotated.
+        backups (int): Rotated files kept (path.1 ... path.N).
+    """
+
+    def __init__(self, path: str | None = None, max_bytes: int = MAX_BYTES, backups: int = BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.session = round(time.time())
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)        # (kind, name) -> seconds of this session
+        self.totals = defaultdict(lambda: defaultdict(float))   # (kind, name) -> field -> sum
+        self._file = None
+        self._cache_counters = {}               # cache name -> (hits, misses) at the previous turn
+
+    def _open(self):
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        for index in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def record(self, kind: str, name: str | None = None, seconds: float | None = None, **fields):
+        """Adds one event to the session samples and appends it to the file."""
+        event = {"ts": round(time.time(), 3), "session": self.session, "kind": kind}
+        if name is not None:
+            event["name"] = name
+        if seconds is not None:
+            event["seconds"] = round(seconds, 4)
+        event.update(fields)
+
+        with self.lock:
+            key = (kind, name)
+            if seconds is not None:
+                self.samples[key].append(seconds)
+            totals = self.totals[key]
+            totals["count"] += 1
+            for field, value in fields.items():
+                if isinstance(value, (int, float)):
+                    totals[field] += value
+            if self.path is None:
+                return
+            try:
+                f = self._open()
+                f.write(json.dumps(event, default=str) + "\n")
+                f.flush()
+                if f.tell() > self.max_bytes:
+                    self._rotate()
+            except OSError:
+                # Telemetry must never break a turn (disk full, file locked by an editor...).
+                pass
+
+    def record_turn(self, seconds: float):
+        """Turn wall time plus the cache and HTTP counters that moved since the previous turn."""
+        caches = {}
+        disk_cache = sys.modules.get("utils.disk_cache")
+        for cache in (disk_cache.open_caches() if disk_cache else []):
+            name = os.path.basename(cache.path)
+            previous = self._cache_counters.get(name, (0, 0))
+            self._cache_counters[name] = (cache.hits, cache.misses)
+            hits, misses = cache.hits - previous[0], cache.misses - previous[1]
+            if hits or misses:
+                caches[name] = {"hits": hits, "misses": misses}
+        self.record("turn", seconds=seconds, caches=caches, http=http_stats())
+
+    def summary(self, kind: str) -> dict:
+        """name -> count, p50, p95 and the mean of every numeric field, for this session."""
+        with self.lock:
+            result = {}
+            for (event_kind, name), totals in self.totals.items():
+                if event_kind != kind:
+                    continue
+                count = totals["count"]
+                row = {"count": int(count)}
+                samples = self.samples.get((kind, name))
+                if samples:
+                    row["p50"] = percentile(samples, 0.50)
+                    row["p95"] = percentile(samples, 0.95)
+                for field, value in totals.items():
+                    if field != "count":
+                        row[f"mean_{field}"] = value / count
+                result[name] = row
+            return result
+
+    def close(self):
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def http_stats() -> dict:
+    """Counters of the shared HttpClients already created."""
+    http_client = sys.modules.get("utils.http_client")
+    if http_client is None:
+        return {}
+    return {name: client.stats() for name, client in list(http_client._clients.items())}
+
+
+telemetry = Telemetry()
+
+
+def configure(path: str | None):
+    """Sends the events to `path` from now on (None or NEURA_TELEMETRY=0: memory only)."""
+    telemetry.close()
+    telemetry.path = path if TELEMETRY_ENABLED else None
+
+
+def timed_node(name: str, node):
+    """Wraps an async LangGraph node so its wall time is recorded as a `node` event."""
+
+    @functools.wraps(node)
+    async def wrapper(state):
+        start = time.perf_counter()
+        try:
+            return await node(state)
+        finally:
+            telemetry.record("node", name, time.perf_counter() - start)
+
+    return wrapper
+
+
+def format_stats(llm_pool_stats: dict | None = None):
+    """Rich renderables of the session: tools, models, nodes, caches and retries."""
+    from rich.table import Table
+
+    def _table(title: str, kind: str, columns: list):
+        rows = telemetry.summary(kind)
+        table = Table(title=title, title_justify="left")
+        table.add_column("name")
+        table.add_column("count", justify="right")
+        table.add_column("p50 s", justify="right")
+        table.add_column("p95 s", justify="right")
+        for header, _, _ in columns:
+            table.add_column(header, justify="right")
+        for name, row in sorted(rows.items(), key=lambda item: -item[1]["count"]):
+            cells = [str(name), str(row["count"]), f"{row.get('p50', 0):.2f}", f"{row.get('p95', 0):.2f}"]
+            cells += [fmt.format(row.get(f"mean_{field}", 0)) for _, field, fmt in columns]
+            table.add_row(*cells)
+        return table if rows else None
+
+    renderables = [
+        _table("Tools", "tool", [("errors", "error", "{:.0%}"), ("args B", "args_bytes", "{:.0f}"),
+                                 ("result chars", "result_chars", "{:.0f}")]),
+        _table("Models", "llm", [("in tokens", "input_tokens", "{:.0f}"), ("out tokens", "output_tokens", "{:.0f}"),
+                                 ("tools bound", "tools_bound", "{:.1f}"), ("retries", "retries", "{:.2f}")]),
+        _table("Graph nodes", "node", []),
+    ]
+
+    caches = Table(title="Caches", title_justify="left")
+    for header in ("cache", "hits", "misses", "hit rate"):
+        caches.add_column(header, justify="left" if header == "cache" else "right")
+    disk_cache = sys.modules.get("utils.disk_cache")
+    for cache in (disk_cache.open_caches() if disk_cache else []):
+        stats = cache.stats()
+        caches.add_row(os.path.basename(cache.path), str(stats["hits"]), str(stats["misses"]), f"{stats['hit_rate']:.0%}")
+    renderables.append(caches if caches.row_count else None)
+
+    retries = Table(title="Retries", title_justify="left")
+    retries.add_column("source")
+    retries.add_column("counters")
+    if llm_pool_stats:
+        retries.add_row("llm", ", ".join(f"{k}={round(v, 1)}" for k, v in llm_pool_stats.items()))
+    for name, stats in http_stats().items():
+        retries.add_row(f"http:{name}", ", ".join(f"{k}={v}" for k, v in stats.items()))
+    renderables.append(retries if retries.row_count else None)
+
+    return [table for table in renderables if table is not None]
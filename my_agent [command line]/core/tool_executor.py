@@ -0,0 +1,169 @@
+"""
+Async executor for the tool calls of one AIMessage.
+Provides:
+- execute_tool_calls: Runs every tool call concurrently and returns the results in call order.
+- set_approver: Registers the coroutine asking the user to approve a call (ToolSpec.confirm).
+
+Blocking tools run on a bounded thread pool so the asyncio loop (spinner, prompt) never freezes.
+Scheduling comes from the tool's ToolSpec (utils/tool_registry.py): calls sharing a lane of a
+non parallel-safe tool run one at a time in call order, others up to `max_concurrency`,
+and every call is bounded by the tool's `timeout`. A blocking call that timed out keeps its
+lane slot until its worker thread returns. Identical calls of a `cacheable` tool in one batch run
+once. A `confirm` tool call that needs approval waits for the user in its lane, before its timeout
+starts, and is refused when no approver is registered.
+Each call is recorded as a `tool` telemetry event (duration, argument and result sizes).
+"""
+
+import asyncio
+import contextvars
+import functools
+import json
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from core.telemetry import telemetry
+from utils.tool_registry import get_spec, needs_confirmation
+
+MAX_WORKERS = 8
+
+_pool = None
+_semaphores = weakref.WeakKeyDictionary()     # event loop -> lane -> Semaphore
+_approver = None    # async (tool_name, args) -> bool, registered by the console
+
+
+def set_approver(approver):
+    """Registers `approver` (async, (tool_name, args) -> True if the user approves the call), or None to refuse them."""
+    global _approver
+    _approver = approver
+
+
+def _init_worker():
+    """COM based tools (volume, brightness) need COM initialised on every worker thread."""
+    try:
+        import pythoncom
+        pythoncom.CoInitialize()
+    except ImportError:
+        pass
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(
+            max_workers=MAX_WORKERS,
+            thread_name_prefix="neura-tool",
+            initializer=_init_worker,
+        )
+    return _pool
+
+
+def _get_semaphore(spec, tool_name: str) -> asyncio.Semaphore:
+    lane = spec.lane or tool_name
+    semaphores = _semaphores.setdefault(asyncio.get_running_loop(), {})
+    if lane not in semaphores:
+        semaphores[lane] = asyncio.Semaphore(spec.max_concurrency if spec.parallel_safe else 1)
+    return semaphores[lane]
+
+
+def start_tool(tool, args: dict) -> tuple:
+    """
+    Starts one tool without blocking the event loop.
+
+    Coroutine tools run on the loop, blocking tools are submitted to the thread pool.
+    The current context is copied so LangChain callbacks still see the parent run.
+
+    Returns:
+        (awaitable, thread_future): The result to await, and the pool future of a blocking tool (else None).
+    """
+    if getattr(tool, "coroutine", None) is not None:
+        return tool.ainvoke(args), None
+
+    ctx = contextvars.copy_context()
+    thread_future = get_pool().submit(functools.partial(ctx.run, tool.invoke, args))
+    return asyncio.wrap_future(thread_future), thread_future
+
+
+async def execute_tool_calls(tool_calls: list, tools_by_name: dict, on_start=None, on_result=None, specs=None):
+    """
+    Executes all tool calls concurrently.
+
+    Args:
+        tool_calls (list): The `tool_calls` of an AIMessage.
+        tools_by_name (dict): Tool name -> tool.
+        on_start (callable, optional): Called with (tool_name, args) right before a tool runs.
+        on_result (callable, optional): Called with (tool_name, result) when a tool succeeds.
+        specs (dict, optional): Tool name -> ToolSpec overriding the registry (fake tools in benchmarks).
+
+    Returns:
+        list: One (tool_call, result, error) tuple per call, in the same order as `tool_calls`.
+            `error` is None on success, otherwise the error text.
+    """
+
+    async def _run(tool_call):
+        tool_name = tool_call["name"]
+        args = tool_call["args"]
+
+        if tool_name not in tools_by_name:
+            return tool_call, None, f"No tool found with name '{tool_name}'"
+
+        spec = (specs or {}).get(tool_name) or get_spec(tool_name)
+
+        # asyncio.Semaphore wakes waiters in FIFO order and tasks start in call order,
+        # so single-slot lanes keep the order of the calls.
+        semaphore = _get_semaphore(spec, tool_name)
+        await semaphore.acquire()
+        thread_future = None
+        try:
+            if needs_confirmation(spec, args):
+                if _approver is None:
+                    return tool_call, f"Not run: this {tool_name} call needs the user's approval and no user is available.", None
+                if not await _approver(tool_name, args):
+                    return tool_call, f"Not run: the user declined this {tool_name} call. Ask the user what to do instead.", None
+            if on_start:
+                on_start(tool_name, args)
+            start = time.perf_counter()
+            result, error = None, None
+            try:
+                call, thread_future = start_tool(tools_by_name[tool_name], args)
+                result = await asyncio.wait_for(call, spec.timeout)
+            except asyncio.TimeoutError:
+                error = f"Error executing {tool_name}: timed out after {spec.timeout:g} s"
+            except Exception as e:
+                error = f"Error executing {tool_name}: {e}"
+        finally:
+            if thread_future is not None and not thread_future.done():
+                # A worker thread cannot be stopped: the lane stays taken until the call really returns,
+                # so the next call of a single-slot lane never runs beside it.
+                loop = asyncio.get_running_loop()
+                thread_future.add_done_callback(lambda _: loop.call_soon_threadsafe(semaphore.release))
+            else:
+                semaphore.release()
+
+        telemetry.record(
+            "tool", tool_name, time.perf_counter() - start,
+            args_bytes=len(json.dumps(args, default=str)),
+            result_chars=len(str(error or result)),
+            error=error is not None,
+        )
+        if error is not None:
+            return tool_call, None, error
+        if on_result:
+            on_result(tool_name, result)
+        return tool_call, result, None
+
+    shared = {}     # (tool name, arguments) -> task of the first identical call of a cacheable tool
+
+    async def _share(tool_call, task):
+        _, result, error = await task
+        return tool_call, result, error
+
+    def _schedule(tool_call):
+        spec = (specs or {}).get(tool_call["name"]) or get_spec(tool_call["name"])
+        if not spec.cacheable:
+            return _run(tool_call)
+        key = (tool_call["name"], json.dumps(tool_call["args"], sort_keys=True, default=str))
+        if key not in shared:
+            shared[key] = asyncio.ensure_future(_run(tool_call))
+        return _share(tool_call, shared[key])
+
+    return await asyncio.gather(*(_schedule(tool_call) for tool_call in tool_calls))
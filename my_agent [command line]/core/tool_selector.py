@@ -0,0 +1,191 @@
+"""
+Per-call selection of the tool schemas sent to the LLM.
+Provides:
+- BM25Index: Okapi BM25 over tool names and ToolSpec keywords (weighted) and docstrings.
+- compact_description: Docstring reduced to its summary and one line per argument.
+- ToolSelector: select (messages -> tools to bind for this call), full or compact schemas.
+
+Binding all tools adds ~30 000 characters of schema (~7 500 tokens) to every request, chat
+turns included. The selector scores the tools against the turn's user message (and the one
+before, for follow-ups like "do the same for the other folder") and keeps the best ones, plus
+every tool already called in the messages sent: the model keeps the tools it is using, and the
+history never refers to a tool it cannot see. fetch_artifact is added while a tool output in the
+messages was cut and stored as an artifact. CORE_TOOLS (web search) are always bound, so the model
+can look up what it does not know. When no tool scores CONFIDENT_SCORE ("hi", "turn it down a bit",
+a question about a new product) the selector cannot tell what the turn needs, and every other tool
+is bound too, with compact schemas, rather than leaving the model without the tool it needs.
+NEURA_TOOL_SELECTION=0 binds every tool again, NEURA_COMPACT_TOOLS=1 sends compact schemas.
+"""
+
+import math
+import os
+import re
+from collections import Counter
+from langchain_core.messages import HumanMessage, ToolMessage
+from utils.artifact_store import HANDLE_PATTERN
+from utils.tool_registry import get_spec
+
+MAX_TOOLS = 6
+RELATIVE_CUTOFF = 0.35      # tools scoring below this share of the best score are dropped
+MIN_SCORE = 1.0
+CONFIDENT_SCORE = 4.0       # best score below this: bind every tool (compact) as a fallback
+NAME_WEIGHT = 3             # name and keyword tokens count as this many docstring tokens
+BM25_K1 = 1.5
+BM25_B = 0.75
+PREVIOUS_MESSAGE_WEIGHT = 0.5
+ARTIFACT_TOOL = "fetch_artifact"      # bound while a tool output in the messages points to an artifact
+CORE_TOOLS = ("internet_search",)     # bound on every call
+
+SELECTION_ENABLED = os.getenv("NEURA_TOOL_SELECTION", "1") != "0"
+COMPACT_SCHEMAS = os.getenv("NEURA_COMPACT_TOOLS", "0") == "1"
+
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from get how i if in into is it its me my of on or "
+    "please set that the this to use used using was what when where which will with you your".split()
+)
+# Sections of the tool docstrings that only explain when to call the tool.
+USAGE_SECTIONS = re.compile(r"^\s*(USE THIS TOOL|DO NOT USE|WHEN|WHAT THE TOOL|IMPORTANT|NOTES?|EXAMPLES?)\b", re.I)
+
+
+def tokenize(text: str) -> list:
+    """Lowercase words without stopwords, with common endings stripped (brighter / brightness -> bright)."""
+    tokens = []
+    for word in re.findall(r"[a-z0-9]+", text.lower().replace("_", " ")):
+        if word in STOPWORDS:
+            continue
+        for suffix in ("ness", "ing", "ed", "er", "es", "s"):
+            if len(word) > len(suffix) + 3 and word.endswith(suffix):
+                word = word[: -len(suffix)]
+                break
+        tokens.append(word)
+    return tokens
+
+
+class BM25Index:
+    """
+    Args:
+        documents (dict): Key -> list of tokens.
+    """
+
+    def __init__(self, documents: dict, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.terms = {key: Counter(tokens) for key, tokens in documents.items()}
+        self.lengths = {key: len(tokens) for key, tokens in documents.items()}
+        self.average_length = sum(self.lengths.values()) / max(1, len(self.lengths))
+        document_frequency = Counter(term for counts in self.terms.values() for term in counts)
+        total = len(self.terms)
+        self.idf = {
+            term: math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+            for term, frequency in document_frequency.items()
+        }
+
+    def scores(self, query_weights: dict) -> dict:
+        """Key -> BM25 score for a {token: weight} query; keys scoring 0 are left out."""
+        result = {}
+        for key, counts in self.terms.items():
+            norm = self.k1 * (1 - self.b + self.b * self.lengths[key] / self.average_length)
+            score = 0.0
+            for term, weight in query_weights.items():
+                frequency = counts.get(term)
+                if frequency:
+                    score += weight * self.idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+            if score:
+                result[key] = score
+        return result
+
+
+def compact_description(description: str) -> str:
+    """The docstring's opening paragraph plus `name (type): first line` for each argument."""
+    lines = description.strip().splitlines()
+    summary = []
+    for line in lines:
+        if not line.strip() or USAGE_SECTIONS.match(line) or line.strip() in ("Args:", "Returns:"):
+            break
+        if not line.strip().startswith("-"):
+            summary.append(line.strip())
+
+    args, in_args, indent = [], False, None
+    for line in lines:
+        stripped = line.strip()
+        if stripped == "Args:":
+            in_args, indent = True, None
+            continue
+        if not in_args:
+            continue
+        if stripped.endswith(":") and not line.startswith(" " * ((indent or 0) + 1)) and " " not in stripped:
+            break       # next section (Returns:, Raises:...)
+        current = len(line) - len(line.lstrip())
+        if stripped and (indent is None or current <= indent) and re.match(r"^\w+\s*(\(.*?\))?\s*:", stripped):
+            indent = current
+            args.append(stripped)
+    text = " ".join(summary)
+    if args:
+        text += "\nArgs:\n" + "\n".join(f"    {arg}" for arg in args)
+    return text
+
+
+class ToolSelector:
+    """
+    Args:
+        tools (list): All lazy tool objects, in binding order.
+        max_tools (int): Most tools picked by relevance (tools already used come on top).
+        compact (bool): Bind compact schemas instead of the full docstrings.
+        enabled (bool): False binds every tool on every call.
+    """
+
+    def __init__(self, tools: list, max_tools: int = MAX_TOOLS, compact: bool = COMPACT_SCHEMAS,
+                 enabled: bool = SELECTION_ENABLED):
+        self.max_tools = max_tools
+        self.enabled = enabled
+        self.order = [t.name for t in tools]
+        self.full = {t.name: t for t in tools}
+        self.compact = compact
+        self.compact_tools = {
+            t.name: t.model_copy(update={"description": compact_description(t.description)}) for t in tools
+        }
+        self.index = BM25Index({
+            t.name: tokenize(" ".join((t.name, *get_spec(t.name).keywords))) * NAME_WEIGHT + tokenize(t.description)
+            for t in tools
+        })
+
+    def scores(self, text: str, previous: str = "") -> dict:
+        """Tool name -> BM25 score against the user message(s)."""
+        weights = Counter()
+        for token in tokenize(previous):
+            weights[token] = max(weights[token], PREVIOUS_MESSAGE_WEIGHT)
+        for token in tokenize(text):
+            weights[token] = 1.0
+        return self.index.scores(weights)
+
+    def relevant(self, text: str, previous: str = "") -> list:
+        """Tool names ranked by BM25 against the user message(s), best first."""
+        scores = self.scores(text, previous)
+        if not scores:
+            return []
+        cutoff = max(MIN_SCORE, max(scores.values()) * RELATIVE_CUTOFF)
+        ranked = sorted((name for name, score in scores.items() if score >= cutoff), key=scores.get, reverse=True)
+        return ranked[: self.max_tools]
+
+    def confident(self, text: str, previous: str = "") -> bool:
+        """False when no tool clearly matches the user message(s)."""
+        return max(self.scores(text, previous).values(), default=0.0) >= CONFIDENT_SCORE
+
+    def select(self, messages: list) -> list:
+        """Tool objects to bind for the call answering `messages`, in binding order."""
+        source = self.compact_tools if self.compact else self.full
+        if not self.enabled:
+            return [source[name] for name in self.order]
+
+        humans = [msg for msg in messages if isinstance(msg, HumanMessage)]
+        text = humans[-1].text if humans else ""
+        previous = humans[-2].text if len(humans) > 1 else ""
+        names = set(self.relevant(text, previous)) | set(CORE_TOOLS)
+        for msg in messages:
+            for tool_call in getattr(msg, "tool_calls", None) or []:
+                names.add(tool_call["name"])
+            if isinstance(msg, ToolMessage) and HANDLE_PATTERN.search(str(msg.content)):
+                names.add(ARTIFACT_TOOL)
+        if not self.confident(text, previous):
+            return [source[name] if name in names else self.compact_tools[name] for name in self.order]
+        return [source[name] for name in self.order if name in names]
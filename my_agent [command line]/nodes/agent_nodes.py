@@ -1,19 +1,15 @@
-from utils import change_user_preferences_tool as cup
-from utils import research_tools
-from utils import open_close_min_max_res_apps_tool as ocmmr
-from utils import control_brightness_volume_tool as cbv
-from utils import create_rename_delete_folder_tool as crdf
-from utils import create_rename_delete_file_tool as crdfile
-from utils import move_file_folder as mff
-from utils import create_or_extract_zip_tool as cez
-from utils import read_file_tool as rft
-from utils import open_url_query_in_browser_tool as ouqb
-from utils import read_screen_text_tool as rst
-from utils import terminal_control_tool as tst
 from langgraph.graph import MessagesState
-from langchain_core.messages import SystemMessage, ToolMessage, AIMessage
+from langchain_core.messages import SystemMessage, ToolMessage, AIMessage, message_chunk_to_message
 from colorama import Fore, Style, init
-from config import llmwithtools, name
+import os
+import time
+from config import config_dir, llm, llm_pool, name, router, tool_selector, tools_by_name
+from utils import tool_registry
+from core.telemetry import telemetry
+from core.output_governor import OutputGovernor
+from core.tool_executor import execute_tool_calls
+from nodes.compaction import MessageCompactor, make_llm_summarizer
+from utils.disk_cache import DiskCache
 
 init(autoreset=True)
 
@@ -24,28 +20,93 @@ system_msg = SystemMessage(content=
     "Whenever differentiation, comparison, or structured explanation is required, present the information in a clear, well-organized tabular format. "
     "Use the following tools when needed:\n"
     "- **internet_search**: to search the internet for recent information.\n"
+    "- **batch_internet_search**: to run several searches in one call when a question needs more than one query.\n"
     "- **web_scraper**: to extract or scrape information from any given link or URL (all types of websites are supported).\n"
     "If the user provides an invalid Windows application name, treat it as valid and proceed. "
-    "After using internet_search or web_scraper, always list final URLs under a 'Sources:' section at the end, e.g.:\n"
+    "After using internet_search, batch_internet_search or web_scraper, always list final URLs under a 'Sources:' section at the end, e.g.:\n"
     "Sources:\n"
     "1. www.example.com\n"
     "2. www.example2.com\n"
+    "When a tool output is cut and stored as an artifact, call fetch_artifact only if the omitted part is needed to answer. "
     "Always respond in Markdown. Stay accurate, logical, agentic, and follow the user's instructions without excuses. "
     f"User's name is {name}."
 )
 
-def call_llm_node(state: MessagesState):
-    
+# Rolling summaries are stored next to the checkpoints, so a resumed thread does not fold its history again.
+compactor = MessageCompactor(
+    make_llm_summarizer(llm),
+    store=DiskCache(os.path.join(config_dir, "summaries.sqlite"), max_bytes=20 * 1024 * 1024),
+)
+governor = OutputGovernor()
+
+async def call_llm_node(state: MessagesState):
+    """
+    Streams the model response so the runner can render tokens as they arrive.
+    The chunks are merged back into one AIMessage (text + tool calls) for the graph state.
+    The router picks the model of this call (fixed, or by tier with "auto") and the tool selector
+    the tool schemas bound to it; rate limits are handled by llm_pool (wait, retry, then fall over
+    to the next model). Latency, tokens and retries of the call go to telemetry.
+    """
     messages = state["messages"]
     if not any(msg.__class__.__name__ == "SystemMessage" for msg in messages):
         messages.insert(0, system_msg)
-        
-    response = llmwithtools.invoke(messages)
-    return {"messages": [response]}
 
-def execute_tool_calls_node(state: MessagesState):
+    messages = await compactor.compact(messages)
+
+    route = router.route(messages)
+    start = time.perf_counter()
+    response, model = None, route.model
+    tools = tool_selector.select(messages)
+    pool_before = dict(llm_pool.stats)
+    async for model, chunk in llm_pool.astream(messages, model=route.model, tools=tools):
+        response = chunk if response is None else response + chunk
+
+    if response is None:
+        return {"messages": [AIMessage(content="")]}
+    elapsed = time.perf_counter() - start
+    usage = response.usage_metadata or {}
+    router.record(route, model, elapsed, usage)
+    telemetry.record(
+        "llm", model, elapsed,
+        routed_model=route.model,
+        input_tokens=usage.get("input_tokens", 0),
+        output_tokens=usage.get("output_tokens", 0),
+        tools_bound=len(tools),
+        retries=llm_pool.stats["retries"] - pool_before["retries"],
+        failovers=llm_pool.stats["failovers"] - pool_before["failovers"],
+        rate_limit_wait=round(llm_pool.stats["waited"] - pool_before["waited"], 3),
+    )
+    return {"messages": [message_chunk_to_message(response)]}
+
+def _log_search(result):
+    return f"'query': '{result['query']}', 'follow_up_questions': '{result['follow_up_questions']}', 'result': 'Too long can't show.....', 'response_time': {result['response_time']}"
+
+def _log_batch_search(result):
+    return f"'queries': {result['queries']}, 'results': {len(result['results'])} unique URLs, 'errors': {result['errors']}, 'response_time': {result['response_time']}"
+
+def _log_scrape(result):
+    result_urls = [item['url'] for item in result['results'] if 'url' in item]
+    failed_urls = [item['url'] for item in result['failed_results'] if 'url' in item]
+    return f"'results_url': '{result_urls}', 'failed_urls':'{failed_urls}', 'response_time': {result['response_time']}"
+
+LOG_FORMATTERS = {
+    "search": _log_search,
+    "batch_search": _log_batch_search,
+    "scrape": _log_scrape,
+    "hidden": lambda result: "result: Too long can't show...",
+    "full": lambda result: f"{result}",
+}
+
+def print_tool_result(tool_name, result):
+    formatter = LOG_FORMATTERS[tool_registry.get_spec(tool_name).log_style]
+    print(Fore.YELLOW + f"[Tool Executed] {formatter(result)}" + Style.RESET_ALL + "\n")
+
+async def execute_tool_calls_node(state: MessagesState):
     """
-    Executes all tool calls from the last message dynamically.
+    Executes all tool calls from the last message concurrently.
+    Scheduling, timeouts, output budgets and console logging come from the tool registry metadata;
+    outputs over their budget are stored as artifacts and previewed (core/output_governor.py).
+    The ToolMessages keep the order of the calls.
 
     Args:
         state (MessagesState): The current state containing messages and tool calls.
@@ -56,72 +117,24 @@ def execute_tool_calls_node(state: MessagesState):
     last_message = state["messages"][-1]
     tool_outputs = []
 
-    tools_map = {
-        "internet_search": research_tools.internet_search,
-        "web_scraper": research_tools.web_scraper,
-        "close_app": ocmmr.close_app,
-        "minimize_app": ocmmr.minimize_app,
-        "maximize_app": ocmmr.maximize_app,
-        "restore_app": ocmmr.restore_app,
-        "open_app": ocmmr.open_app,
-        "switch_btwn_apps": ocmmr.switch_btwn_apps,
-        "set_volume": cbv.set_volume,
-        "set_brightness": cbv.set_brightness,
-        "create_folder": crdf.create_folder,
-        "rename_folder": crdf.rename_folder,
-        "delete_folder": crdf.delete_folder,
-        "create_add_content_file": crdfile.create_add_content_file,
-        "rename_file": crdfile.rename_file,
-        "delete_file": crdfile.delete_file,
-        "move_file_folder": mff.move_file_folder,
-        "create_zipfile": cez.create_zipfile,
-        "extract_zipfile": cez.extract_zipfile,
-        "read_file": rft.read_file,
-        "open_url_or_query": ouqb.open_url_or_query,
-        "read_screen_text": rst.read_screen_text,
-        "write_command_in_terminal": tst.write_command_in_terminal,
-        "change_user_preferences": cup.change_user_preferences,
-        
-    }
-
-    for tool_call in last_message.tool_calls:
-        tool_name = tool_call["name"]
-        args = tool_call["args"]
-
-        if tool_name in tools_map:
-            print(Fore.YELLOW + f"Invoking {tool_name} with args: {args}" + Style.RESET_ALL)
-            try:
-                result = tools_map[tool_name].invoke(args)
-                tool_outputs.append(ToolMessage(tool_call_id=tool_call['id'], content=str(result)))
-                if tool_name == "internet_search":
-                    print(Fore.YELLOW + f"[Tool Executed] 'query': '{result['query']}', 'follow_up_questions': '{result['follow_up_questions']}', 'result': 'Too long can't show.....', 'response_time': {result['response_time']}" + Style.RESET_ALL + "\n")
-                    
-                elif tool_name == "web_scraper":
-                    result_urls = [item['url'] for item in result['results'] if 'url' in item]
-
-                    failed_urls = [item['url'] for item in result['failed_results'] if 'url' in item]
-                    
-                    print(Fore.YELLOW + f"[Tool Executed] 'results_url': '{result_urls}', 'failed_urls':'{failed_urls}', 'response_time': {result['response_time']}" + Style.RESET_ALL + "\n")
-                    
-                elif tool_name == "read_screen_text":
-                    print(Fore.YELLOW + "[Tool Executed] result: Too long can't show..." + Style.RESET_ALL + "\n")
-                else:
-                    print(Fore.YELLOW + f"[Tool Executed] {result}" + Style.RESET_ALL + "\n")
-            except Exception as e:
-                tool_outputs.append(
-                    ToolMessage(tool_call_id=tool_call['id'], content=f"Error executing {tool_name}: {e}")
-                )
-        else:
-            print(f"No tool found with name '{tool_name}'")
-            tool_outputs.append(
-                ToolMessage(tool_call_id=tool_call['id'], content=f"No tool found with name '{tool_name}'")
-            )
+    def on_start(tool_name, args):
+        print(Fore.YELLOW + f"Invoking {tool_name} with args: {args}" + Style.RESET_ALL)
+
+    def on_result(tool_name, result):
+        try:
+            print_tool_result(tool_name, result)
+        except Exception:
+            print(Fore.YELLOW + f"[Tool Executed] {tool_name}" + Style.RESET_ALL + "\n")
+
+    results = await execute_tool_calls(last_message.tool_calls, tools_by_name, on_start=on_start, on_result=on_result)
+
+    for tool_call, result, error in results:
+        if error is None:
+            tool_outputs.append(ToolMessage(tool_call_id=tool_call['id'], name=tool_call["name"], content=governor.govern(tool_call["name"], result)))
+            continue
+        if tool_call["name"] not in tools_by_name:
+            print(error)
+        tool_outputs.append(ToolMessage(tool_call_id=tool_call['id'], name=tool_call["name"], content=error))
 
     return {"messages": tool_outputs}
 
-def should_call_tools(state: MessagesState):
-    last_message = state["messages"][-1]
-    if isinstance(last_message, AIMessage) and last_message.tool_calls:
-        return "tools"
-    else:
-        return "end"
@@ -0,0 +1,224 @@
+"""
+Token-budgeted compaction of the conversation before it is sent to the LLM.
+Provides:
+- MessageCompactor: Builds the message list for one LLM call under a token budget.
+
+The graph state keeps the full history; only the copy sent to the model is compacted, and only
+when it is over the budget:
+ 1. Turns older than the sliding window are folded into a rolling summary, SUMMARY_CHUNK_CHARS of
+    transcript per summarizer call. Summaries are cached by the id of the last message they cover,
+    in memory and in an optional store (SQLite next to the checkpoints), so a resumed thread
+    only folds the turns added since.
+ 2. If still over budget, tool outputs of finished turns drop to short stubs
+    (the assistant's answer of that turn already summarized them).
+ 3. If still over budget, the window shrinks until only the current turn is left.
+"""
+
+import json
+import os
+from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, ToolMessage
+
+TOKEN_BUDGET = int(os.getenv("NEURA_TOKEN_BUDGET", "24000"))
+KEEP_RECENT_TURNS = int(os.getenv("NEURA_KEEP_TURNS", "4"))
+STUB_MIN_TOKENS = 200           # tool outputs smaller than this are never stubbed
+SUMMARY_INPUT_CHARS = 1500      # per message, when building the transcript for the summarizer
+SUMMARY_CHUNK_CHARS = 24_000    # transcript characters folded per summarizer call
+SUMMARY_TTL = 90 * 24 * 60 * 60  # seconds a stored summary is kept
+TIKTOKEN_ENCODING = "cl100k_base"
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a conversation between a user and Neura_Command, an agent that controls their computer. "
+    "Update the previous summary with the new messages. Keep facts, decisions, file/folder names, URLs, results of tool calls "
+    "and open questions. Drop greetings and repetition. Answer with the summary only, at most 250 words."
+)
+
+
+def _message_text(msg) -> str:
+    text = msg.content if isinstance(msg.content, str) else msg.text
+    tool_calls = getattr(msg, "tool_calls", None)
+    if tool_calls:
+        text += json.dumps([{"name": tc["name"], "args": tc["args"]} for tc in tool_calls], default=str)
+    return text
+
+
+def _chunks(messages: list) -> list:
+    """Splits messages into runs whose transcript stays under SUMMARY_CHUNK_CHARS (at least one message each)."""
+    chunks, size = [], 0
+    for msg in messages:
+        chars = min(len(_message_text(msg)), SUMMARY_INPUT_CHARS) + 16
+        if not chunks or size + chars > SUMMARY_CHUNK_CHARS:
+            chunks.append([])
+            size = 0
+        chunks[-1].append(msg)
+        size += chars
+    return chunks
+
+
+def split_turns(messages: list) -> list:
+    """Splits messages into turns, each turn starting at a HumanMessage."""
+    turns = []
+    for msg in messages:
+        if isinstance(msg, HumanMessage) or not turns:
+            turns.append([msg])
+        else:
+            turns[-1].append(msg)
+    return turns
+
+
+class MessageCompactor:
+    """
+    Args:
+        summarizer (async callable): (previous_summary: str, messages: list) -> str.
+        budget (int): Max tokens of history sent per LLM call.
+        keep_turns (int): Size of the sliding window of recent turns kept verbatim.
+        store (DiskCache|None): Persistent copy of the rolling summaries (message id -> summary).
+    """
+
+    def __init__(self, summarizer, budget: int = TOKEN_BUDGET, keep_turns: int = KEEP_RECENT_TURNS, store=None):
+        self.summarizer = summarizer
+        self.budget = budget
+        self.keep_turns = max(1, keep_turns)
+        self.store = store
+        self._encoding = None
+        self._token_counts = {}     # message id -> tokens
+        self._summaries = {}        # id of the last folded message -> rolling summary
+
+    def _encode_len(self, text: str) -> int:
+        if self._encoding is None:
+            try:
+                import tiktoken
+                self._encoding = tiktoken.get_encoding(TIKTOKEN_ENCODING)
+            except Exception:
+                # No tiktoken / no cached BPE file (offline): fall back to ~4 chars per token.
+                self._encoding = False
+        if self._encoding is False:
+            return len(text) // 4 + 1
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def count_tokens(self, msg) -> int:
+        """Token count of one message, cached by message id (messages never change once added)."""
+        if msg.id is not None and msg.id in self._token_counts:
+            return self._token_counts[msg.id]
+        count = self._encode_len(_message_text(msg)) + 4
+        if msg.id is not None:
+            self._token_counts[msg.id] = count
+        return count
+
+    def _get_summary(self, msg_id):
+        if msg_id is None:
+            return None
+        summary = self._summaries.get(msg_id)
+        if summary is None and self.store is not None:
+            summary = self.store.get(msg_id)
+            if summary is not None:
+                self._summaries[msg_id] = summary
+        return summary
+
+    def _set_summary(self, msg_id, summary: str):
+        if msg_id is None:
+            return
+        self._summaries[msg_id] = summary
+        if self.store is not None:
+            self.store.set(msg_id, summary, SUMMARY_TTL)
+
+    def _turns_tokens(self, turns: list) -> int:
+        return sum(self.count_tokens(msg) for turn in turns for msg in turn)
+
+    async def _summary_for(self, folded: list) -> str:
+        """Rolling summary of the folded turns, reusing the longest cached prefix."""
+        if not folded:
+            return ""
+        flat = [msg for turn in folded for msg in turn]
+        previous, start = "", 0
+        for i in range(len(flat) - 1, -1, -1):
+            cached = self._get_summary(flat[i].id)
+            if cached is not None:
+                previous, start = cached, i + 1
+                break
+
+        summary = previous
+        for chunk in _chunks(flat[start:]):
+            summary = await self.summarizer(summary, chunk)
+            self._set_summary(chunk[-1].id, summary)
+        return summary
+
+    def _stub(self, msg: ToolMessage) -> ToolMessage:
+        stub = (
+            f"[Output of {msg.name or 'tool'} elided to save context: ~{self.count_tokens(msg)} tokens. "
+            "The assistant's reply that followed already used it. Call the tool again if details are needed.]"
+        )
+        return ToolMessage(content=stub, tool_call_id=msg.tool_call_id, name=msg.name)
+
+    async def compact(self, messages: list) -> list:
+        """
+        Returns the messages to send to the model. Leading SystemMessages are kept,
+        the summary (if any) is appended to the first one.
+        """
+        head = []
+        for msg in messages:
+            if not isinstance(msg, SystemMessage):
+                break
+            head.append(msg)
+        turns = split_turns(messages[len(head):])
+
+        head_tokens = sum(self.count_tokens(msg) for msg in head)
+        if head_tokens + self._turns_tokens(turns) <= self.budget:
+            return list(messages)
+
+        window = turns[-self.keep_turns:]
+        folded = turns[:-self.keep_turns] if len(turns) > self.keep_turns else []
+        summary_tokens = self._encode_len(self._get_summary(folded[-1][-1].id) or "") if folded else 0
+
+        def over_budget():
+            return head_tokens + summary_tokens + self._turns_tokens(window) > self.budget
+
+        # Stub tool outputs of finished turns, oldest first.
+        window = [list(turn) for turn in window]
+        for turn in window[:-1]:
+            if not over_budget():
+                break
+            for i, msg in enumerate(turn):
+                if isinstance(msg, ToolMessage) and self.count_tokens(msg) >= STUB_MIN_TOKENS:
+                    turn[i] = self._stub(msg)
+
+        # Shrink the window, the current turn always stays.
+        while len(window) > 1 and over_budget():
+            folded.append(turns[len(turns) - len(window)])
+            window.pop(0)
+
+        summary = await self._summary_for(folded)
+        if summary:
+            note = f"\n\nSummary of the earlier conversation:\n{summary}"
+            if head:
+                head = [SystemMessage(content=head[0].content + note)] + head[1:]
+            else:
+                head = [SystemMessage(content=note.strip())]
+
+        return head + [msg for turn in window for msg in turn]
+
+
+def render_transcript(messages: list) -> str:
+    lines = []
+    for msg in messages:
+        text = _message_text(msg)[:SUMMARY_INPUT_CHARS]
+        if isinstance(msg, HumanMessage):
+            lines.append(f"User: {text}")
+        elif isinstance(msg, AIMessage):
+            lines.append(f"Assistant: {text}")
+        elif isinstance(msg, ToolMessage):
+            lines.append(f"Tool {msg.name or ''}: {text}")
+    return "\n".join(lines)
+
+
+def make_llm_summarizer(llm):
+    """Summarizer backed by a chat model. Calls are tagged so the runner does not render them."""
+
+    async def summarize(previous: str, messages: list) -> str:
+        prompt = f"Previous summary:\n{previous or '(none)'}\n\nNew messages:\n{render_transcript(messages)}"
+        response = await llm.ainvoke(
+            [SystemMessage(content=SUMMARY_PROMPT), HumanMessage(content=prompt)],
+            config={"tags": ["neura:internal"]},
+        )
+        return response.text.strip()
+
+    return summarize
@@ -0,0 +1,188 @@
+"""
+Persisted index of the installed applications (Start Menu shortcuts) used by open_app.
+Provides:
+- AppIndex: Builds, persists and incrementally refreshes the index, and fuzzy-matches app names.
+- DEFAULT_APP_DIRS: The two Start Menu trees (override with NEURA_APP_DIRS, os.pathsep separated).
+
+The index stores every directory with its mtime, files and subdirectories. A refresh only lists
+directories whose mtime changed (a file added/removed/renamed changes its parent's mtime), every
+other directory costs a single stat. Normalized names are precomputed for rapidfuzz, and
+name -> path is a dict lookup.
+"""
+
+import json
+import os
+import threading
+import time
+from rapidfuzz import process, fuzz
+
+DEFAULT_APP_DIRS = [
+    'C:\\ProgramData\\Microsoft\\Windows\\Start Menu\\Programs',
+    f"{os.path.expanduser('~')}\\AppData\\Roaming\\Microsoft\\Windows\\Start Menu\\Programs",
+]
+
+REFRESH_INTERVAL = 60       # seconds between two background revalidations
+MATCH_THRESHOLD = 70
+
+
+def get_app_dirs() -> list:
+    dirs = os.getenv("NEURA_APP_DIRS")
+    return dirs.split(os.pathsep) if dirs else DEFAULT_APP_DIRS
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+class AppIndex:
+    """
+    Args:
+        roots (list[str]): Directories to index recursively.
+        index_path (str|None): JSON file the index is persisted to (None keeps it in memory only).
+    """
+
+    def __init__(self, roots: list, index_path: str | None = None):
+        self.roots = [os.path.normpath(root) for root in roots]
+        self.index_path = index_path
+        self.dirs = {}          # dir -> {"mtime": float, "files": [[stem, path], ...], "subdirs": [dir, ...]}
+        self.names = []         # normalized names, parallel to self.paths (rapidfuzz choices)
+        self.paths = []
+        self.name_to_path = {}
+        self.display_names = {}     # normalized name -> original stem
+        self.last_refresh = 0.0
+        self.lock = threading.Lock()
+        self._refreshing = False
+        self._loaded = False
+
+    # building
+
+    def _scan_dir(self, path: str, old: dict, new: dict):
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return
+
+        entry = old.get(path)
+        if entry is None or entry["mtime"] != mtime:
+            files, subdirs = [], []
+            try:
+                with os.scandir(path) as it:
+                    for item in it:
+                        if item.is_dir(follow_symlinks=False):
+                            subdirs.append(item.path)
+                        elif item.is_file():
+                            files.append([os.path.splitext(item.name)[0], item.path])
+            except OSError:
+                return
+            entry = {"mtime": mtime, "files": files, "subdirs": subdirs}
+
+        new[path] = entry
+        for subdir in entry["subdirs"]:
+            self._scan_dir(subdir, old, new)
+
+    def _rebuild_lookup(self, dirs: dict):
+        names, paths, name_to_path, display = [], [], {}, {}
+        for root in self.roots:
+            pending = [root]
+            while pending:
+                entry = dirs.get(pending.pop())
+                if entry is None:
+                    continue
+                for stem, path in entry["files"]:
+                    norm = normalize_name(stem)
+                    if norm not in name_to_path:
+                        name_to_path[norm] = path
+                        display[norm] = stem
+                        names.append(norm)
+                        paths.append(path)
+                pending.extend(reversed(entry["subdirs"]))
+        with self.lock:
+            self.dirs = dirs
+            self.names, self.paths = names, paths
+            self.name_to_path, self.display_names = name_to_path, display
+            self.last_refresh = time.time()
+
+    def refresh(self) -> bool:
+        """Revalidates the index against the directory mtimes. Returns True if anything changed."""
+        old = self.dirs
+        new = {}
+        for root in self.roots:
+            self._scan_dir(root, old, new)
+        changed = new.keys() != old.keys() or any(new[d] is not old[d] for d in new)
+        if changed or not self.names:
+            self._rebuild_lookup(new)
+            self.save()
+        else:
+            self.last_refresh = time.time()
+        return changed
+
+    def refresh_in_background(self):
+        with self.lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def _run():
+            try:
+                self.refresh()
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=_run, name="neura-app-index", daemon=True).start()
+
+    # persistence
+
+    def load(self) -> bool:
+        if not self.index_path or not os.path.exists(self.index_path):
+            return False
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("roots") != self.roots:
+            return False
+        self._rebuild_lookup(data["dirs"])
+        self.last_refresh = 0.0     # loaded from disk: revalidate on first use
+        return True
+
+    def save(self):
+        if not self.index_path:
+            return
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"roots": self.roots, "dirs": self.dirs}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def ensure_ready(self):
+        """
+        First use: loads the persisted index, or builds it synchronously if there is none.
+        Later uses: revalidates in the background once REFRESH_INTERVAL has passed.
+        """
+        if not self._loaded:
+            self._loaded = True
+            if not self.load():
+                self.refresh()
+                return
+        if time.time() - self.last_refresh > REFRESH_INTERVAL:
+            self.refresh_in_background()
+
+    # lookup
+
+    def best_match(self, query: str, threshold: int = MATCH_THRESHOLD):
+        """
+        Returns (name, path, score) of the closest application, or None below `threshold`.
+        """
+        query = normalize_name(query)
+        with self.lock:
+            names, paths, name_to_path, display = self.names, self.paths, self.name_to_path, self.display_names
+
+        if query in name_to_path:
+            return display[query], name_to_path[query], 100.0
+
+        match = process.extractOne(query, names, scorer=fuzz.partial_ratio, processor=None)
+        if match is None or match[1] < threshold:
+            return None
+        name, score, index = match
+        return display[name], paths[index], score
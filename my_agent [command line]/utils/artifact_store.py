@@ -0,0 +1,106 @@
+"""
+Content-addressed store of tool outputs too large for the conversation history.
+Provides:
+- ArtifactStore: put (text -> handle), read (handle, offset, length -> slice and total size), size-bounded.
+- get_store: The shared store (%APPDATA%/Neura Command/artifacts).
+- HANDLE_PREFIX / HANDLE_PATTERN: Shape of the handles ("art_" + 16 hex digits of the text's SHA-256).
+
+The same output stored twice gets the same handle and one file. Above max_bytes the least
+recently used artifacts are deleted; a handle from an old session may therefore be gone.
+"""
+
+import hashlib
+import os
+import re
+import threading
+
+appdata = os.getenv("APPDATA")
+ARTIFACT_DIR = os.path.join(appdata, "Neura Command", "artifacts")
+MAX_BYTES = 200 * 1024 * 1024
+
+HANDLE_PREFIX = "art_"
+HANDLE_PATTERN = re.compile(r"art_[0-9a-f]{16}")
+
+
+class ArtifactStore:
+    """
+    Args:
+        root (str): Folder of the artifact files, created if missing.
+        max_bytes (int): Total size kept; least recently used artifacts are deleted above it.
+    """
+
+    def __init__(self, root: str = ARTIFACT_DIR, max_bytes: int = MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self._total = None      # bytes on disk, computed on the first put
+
+    def _path(self, handle: str) -> str:
+        if not HANDLE_PATTERN.fullmatch(handle):
+            raise ValueError(f"Invalid artifact handle: {handle!r}")
+        return os.path.join(self.root, handle + ".txt")
+
+    def _files(self) -> list:
+        entries = [entry for entry in os.scandir(self.root) if entry.name.endswith(".txt")]
+        return [(entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in entries]
+
+    def put(self, text: str) -> str:
+        """Stores `text` (once per content) and returns its handle."""
+        handle = HANDLE_PREFIX + hashlib.sha256(text.encode("utf-8", "replace")).hexdigest()[:16]
+        path = self._path(handle)
+        with self.lock:
+            os.makedirs(self.root, exist_ok=True)
+            if self._total is None:
+                self._total = sum(size for _, size, _ in self._files())
+            if os.path.exists(path):
+                os.utime(path)      # most recently used
+                return handle
+            data = text.encode("utf-8", "replace")
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            self._total += len(data)
+            if self._total > self.max_bytes:
+                self._evict(keep=path)
+        return handle
+
+    def _evict(self, keep: str):
+        for _, size, path in sorted(self._files()):
+            if self._total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                self._total -= size
+            except OSError:
+                pass
+
+    def read(self, handle: str, offset: int = 0, length: int | None = None) -> tuple:
+        """
+        Returns:
+            (text, total): Characters [offset, offset + length) of the artifact and its total length.
+
+        Raises:
+            KeyError: Unknown handle (never stored, or evicted).
+        """
+        path = self._path(handle)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            raise KeyError(handle) from None
+        os.utime(path)
+        end = len(text) if length is None else offset + length
+        return text[offset:end], len(text)
+
+
+_store = None
+
+
+def get_store() -> ArtifactStore:
+    global _store
+    if _store is None:
+        _store = ArtifactStore()
+    return _store
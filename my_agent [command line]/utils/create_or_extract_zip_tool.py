@@ -1,14 +1,15 @@
 """
 Utility tools for working with ZIP archives.
 Provided tools:
- - extract_zipfile: Extract an existing ZIP file into a selected directory.
+ - extract_zipfile: Extract an existing ZIP file (all of it or the files matching a pattern) into a selected directory, or list its content.
  - create_zipfile: Create a ZIP archive from an existing folder or file into a selected directory.
 """
 
 import os
-import shutil
+import zipfile
 from typing import Literal
 from langchain_core.tools import tool
+from utils.parallel_zip import write_zip, list_zip, extract_zip, ZipLimitError
 
 BASE_DIRS = {
     "Desktop": "Desktop",
@@ -26,16 +27,43 @@ def resolve_base_dir(base: str) -> str:
     return os.path.join(home, sub) if sub else home
 
 
+MAX_LISTED_MEMBERS = 300
+
+def format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def format_listing(zip_path: str, listing: dict, pattern: str) -> str:
+    members = listing["members"]
+    files = [member for member in members if not member[3]]
+    lines = [
+        f"{zip_path}: {len(files)} files"
+        + (f" matching '{pattern}'" if pattern not in ("", "*") else "")
+        + f", {format_bytes(listing['total_size'])} uncompressed"
+        + f" ({format_bytes(listing['total_compressed'])} compressed)"
+    ]
+    for name, size, _, is_dir in members[:MAX_LISTED_MEMBERS]:
+        lines.append(name if is_dir else f"{name}  ({format_bytes(size)})")
+    if len(members) > MAX_LISTED_MEMBERS:
+        lines.append(f"... {len(members) - MAX_LISTED_MEMBERS} more entries (use `pattern` to narrow the list)")
+    return "\n".join(lines)
+
+
 @tool
 def extract_zipfile(
     zip_file_path: str,
-    extract_to: str,
+    extract_to: str = "",
     base_dir_of_zip: Literal["Desktop","Documents","Downloads","Pictures","Videos","Music","Home"] = "Desktop",
-    base_dir_of_extract_to: Literal["Desktop","Documents","Downloads","Pictures","Videos","Music","Home"] = "Desktop"
+    base_dir_of_extract_to: Literal["Desktop","Documents","Downloads","Pictures","Videos","Music","Home"] = "Desktop",
+    mode: Literal["extract", "list"] = "extract",
+    pattern: str = "*"
 ):
     """
-    Extract a ZIP file from a chosen base directory to another chosen base directory.
-    Supports nested folder paths.
+    Extract a ZIP file from a chosen base directory to another chosen base directory,
+    or list what is inside without extracting anything.
+    Supports nested folder paths and extracting only the files matching a pattern.
 
     Args:
         zip_file_path (str):
@@ -43,7 +71,7 @@ def extract_zipfile(
 
         extract_to (str):
             Folder or nested path where the contents will be extracted.
-            Will be created automatically if missing.
+            Will be created automatically if missing. Required in extract mode, not used in list mode.
 
         base_dir_of_zip (str):
             Base directory where zip_file_path exists.
@@ -65,8 +93,16 @@ def extract_zipfile(
                 - Music
                 - Home
 
+        mode (str):
+            - extract: Extract the files matching `pattern` (default)
+            - list: Only list the files in the archive with their sizes
+
+        pattern (str):
+            Glob matched against the paths inside the archive, e.g. "*.txt", "docs/*",
+            "report.pdf". Default "*" (everything).
+
     Returns:
-        str: Success or error message.
+        str: Success or error message (the file list in list mode).
     """
     if not zip_file_path.lower().endswith(".zip"):
         zip_file_path+= ".zip"
@@ -82,12 +118,26 @@ def extract_zipfile(
         if not os.path.exists(zip_path):
             return f"Error: ZIP file does not exist at: {zip_path}"
 
-        shutil.unpack_archive(zip_path, extract_path, 'zip')
-        return f"Extracted successfully from '{zip_path}' to '{extract_path}'"
+        if mode == "list":
+            return format_listing(zip_path, list_zip(zip_path, pattern), pattern)
 
-    except shutil.ReadError:
+        if not extract_to.strip():
+            return "Error: extract_to is required to extract: give the folder to extract into (ask the user if unsure)."
+
+        result = extract_zip(zip_path, extract_path, pattern)
+        if result["files"] == 0 and pattern not in ("", "*"):
+            return f"No files in '{zip_path}' match '{pattern}'."
+        return (
+            f"Extracted {result['files']} files ({format_bytes(result['bytes'])}) "
+            f"successfully from '{zip_path}' to '{extract_path}'"
+        )
+
+    except zipfile.BadZipFile:
         return f"Error: The file at '{zip_path}' is not a valid ZIP archive."
 
+    except ZipLimitError as e:
+        return f"Error: Refused to extract '{zip_path}': {e}"
+
     except Exception as e:
         return f"Error extracting ZIP: {e}"
 
@@ -96,7 +146,8 @@ def create_zipfile(
     folder_to_zip: str,
     zip_file_name: str,
     base_dir_of_folder: Literal["Desktop","Documents","Downloads","Pictures","Videos","Music","Home"] = "Desktop",
-    base_dir_of_zip: Literal["Desktop","Documents","Downloads","Pictures","Videos","Music","Home"] = "Desktop"
+    base_dir_of_zip: Literal["Desktop","Documents","Downloads","Pictures","Videos","Music","Home"] = "Desktop",
+    compression_level: int = 6
 ):
     """
     Create a ZIP file from a chosen base directory and save it to another chosen base directory.
@@ -130,6 +181,10 @@ def create_zipfile(
                 - Music
                 - Home
 
+        compression_level (int):
+            0 (no compression, fastest) to 9 (smallest file, slowest). Default 6.
+            Images, audio, video and archives are always stored as-is.
+
     Returns:
         str: Success or error message.
     """
@@ -150,12 +205,7 @@ def create_zipfile(
         if not os.path.exists(source_folder):
             return f"Error: The folder you want to zip does not exist: {source_folder}"
 
-        zip_base, _ = os.path.splitext(zip_path)
-
-        root_dir = os.path.dirname(source_folder)
-        base_dir = os.path.basename(source_folder)
-
-        shutil.make_archive(zip_base, 'zip', root_dir=root_dir, base_dir=base_dir)
+        write_zip(zip_path, source_folder, level=compression_level)
 
         return f"Created ZIP successfully at: {zip_path}"
 
@@ -0,0 +1,120 @@
+"""
+Small persistent key/value cache on SQLite, shared by the tools.
+Provides:
+- DiskCache: TTL per entry, size-bounded LRU eviction and hit/miss counters.
+- CACHE_DIR: Default folder of the cache files (%APPDATA%/Neura Command/cache).
+- open_caches: The DiskCache instances alive in the process (for /stats and telemetry).
+
+Values must be JSON serializable (tool results are plain dicts / lists / strings).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+
+appdata = os.getenv("APPDATA")
+CACHE_DIR = os.path.join(appdata, "Neura Command", "cache")
+
+_instances = weakref.WeakSet()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cache_last_access ON cache (last_access);
+"""
+
+
+def open_caches() -> list:
+    return sorted(_instances, key=lambda cache: cache.path)
+
+
+class DiskCache:
+    """
+    Args:
+        path (str): SQLite file, created (with its folder) if missing.
+        max_bytes (int): Total size of the stored values; least recently used entries are evicted above it.
+        max_entries (int|None): Optional cap on the number of entries.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, max_entries: int | None = None):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _instances.add(self)
+
+    def get(self, key: str):
+        """Returns the cached value, or None if missing or expired."""
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] < now:
+                if row is not None:
+                    self.conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE cache SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value, ttl: float):
+        data = json.dumps(value).encode("utf-8")
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), now + ttl, now),
+            )
+            self._evict(now)
+
+    def delete(self, key: str):
+        with self.lock:
+            self.conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def _evict(self, now: float):
+        self.conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+        total, count = self.conn.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM cache").fetchone()
+        if total <= self.max_bytes and (self.max_entries is None or count <= self.max_entries):
+            return
+
+        freed, removed, victims = 0, 0, []
+        for key, size in self.conn.execute("SELECT key, size FROM cache ORDER BY last_access"):
+            if total - freed <= self.max_bytes and (self.max_entries is None or count - removed <= self.max_entries):
+                break
+            victims.append((key,))
+            freed += size
+            removed += 1
+        self.conn.executemany("DELETE FROM cache WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def stats(self) -> dict:
+        with self.lock:
+            total, count = self.conn.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM cache").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": count,
+            "bytes": total,
+        }
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM cache")
@@ -0,0 +1,52 @@
+"""
+Tool to page through tool outputs stored as artifacts.
+
+Provided tool:
+ - fetch_artifact: Read part of a large tool output that was cut from the conversation
+
+Outputs longer than their tool's budget are stored by the output governor (core/output_governor.py)
+and only a preview stays in the conversation; this tool reads the rest, one page at a time.
+"""
+
+from langchain_core.tools import tool
+from utils.artifact_store import get_store
+
+MAX_FETCH_CHARS = 8_000
+
+
+@tool
+def fetch_artifact(handle: str, offset: int = 0, length: int = 4000):
+    """
+    Read part of a large tool output that was cut from the conversation and stored as an artifact.
+
+    USE THIS TOOL ONLY:
+        - When a tool output says characters were omitted and gives an artifact handle (art_...)
+        - And the omitted part is needed to answer (do not fetch "just in case")
+
+    Args:
+        handle (str):
+            The artifact handle from the omitted-output note, e.g. "art_3f9c0a1b2d4e5f60".
+
+        offset (int, optional):
+            First character to read (0-based). Use the offset given in the note, or the
+            "Next" offset of the previous page.
+
+        length (int, optional):
+            Number of characters to read (default 4000, max 8000).
+
+    Returns:
+        str: A header with the character range and total size (and the next offset if more remains),
+            followed by the text.
+    """
+    offset = max(0, offset)
+    length = max(1, min(length, MAX_FETCH_CHARS))
+    try:
+        text, total = get_store().read(handle, offset, length)
+    except (KeyError, ValueError):
+        return f"Unknown artifact handle {handle!r}: it may have expired. Run the original tool again."
+
+    end = offset + len(text)
+    header = f"[Artifact {handle}: characters {offset:,}-{end:,} of {total:,}."
+    if end < total:
+        header += f" Next: offset={end}"
+    return header + "]\n" + text
@@ -0,0 +1,246 @@
+"""
+Keyboard / window automation for the GUI tools, event-driven instead of fixed sleeps.
+Provides:
+- GuiBackend: Interface to the keyboard, clipboard and active window (title and id).
+- PyAutoGuiBackend: Real backend (pyautogui, pyperclip, pygetwindow), imported on first use.
+- FakeGuiBackend: Scripted in-memory desktop (windows appear after a delay) for benchmarks and tests.
+- GuiAutomation: wait_until / wait_for_window / wait_for_window_change, paste, alt_tab.
+- get_gui: Shared GuiAutomation on the real backend.
+
+The tools used to sleep a fixed time before typing (0.7 s, 2 s...) and typed commands one key
+every 100 ms. Now they poll the active window until the expected one is in front (or give up
+after a timeout instead of typing into the wrong window), and insert text with one Ctrl+V
+through the clipboard, restoring its previous content afterwards.
+"""
+
+import os
+import threading
+import time
+
+POLL_INTERVAL = 0.05
+PASTE_SETTLE = 0.15     # seconds the target gets to read the clipboard before it is restored
+
+
+class GuiBackend:
+    """Keyboard, clipboard and active window."""
+
+    def press(self, key: str):
+        raise NotImplementedError
+
+    def hotkey(self, *keys: str):
+        raise NotImplementedError
+
+    def key_down(self, key: str):
+        raise NotImplementedError
+
+    def key_up(self, key: str):
+        raise NotImplementedError
+
+    def write(self, text: str, interval: float = 0.0):
+        raise NotImplementedError
+
+    def get_clipboard(self) -> str:
+        raise NotImplementedError
+
+    def set_clipboard(self, text: str):
+        raise NotImplementedError
+
+    def active_window_title(self) -> str:
+        raise NotImplementedError
+
+    def active_window_id(self):
+        """Identifies the active window itself (two windows may share a title). Defaults to the title."""
+        return self.active_window_title()
+
+
+class PyAutoGuiBackend(GuiBackend):
+
+    def press(self, key):
+        import pyautogui
+        pyautogui.press(key)
+
+    def hotkey(self, *keys):
+        import pyautogui
+        pyautogui.hotkey(*keys)
+
+    def key_down(self, key):
+        import pyautogui
+        pyautogui.keyDown(key)
+
+    def key_up(self, key):
+        import pyautogui
+        pyautogui.keyUp(key)
+
+    def write(self, text, interval=0.0):
+        import pyautogui
+        pyautogui.write(text, interval)
+
+    def get_clipboard(self):
+        import pyperclip
+        return pyperclip.paste()
+
+    def set_clipboard(self, text):
+        import pyperclip
+        pyperclip.copy(text)
+
+    def active_window_title(self):
+        import pygetwindow as gw
+        return gw.getActiveWindowTitle() or ""
+
+    def active_window_id(self):
+        if os.name != "nt":
+            return self.active_window_title()
+        import ctypes
+        return ctypes.windll.user32.GetForegroundWindow()
+
+
+class FakeGuiBackend(GuiBackend):
+    """
+    Args:
+        title (str): Title of the window in front at the start.
+        reactions (dict): Key (or "+"-joined hotkey) -> (title, delay): pressing it brings the
+            window `title` to the front `delay` seconds later.
+        key_delay (float): Simulated cost of one key event, in seconds.
+    """
+
+    def __init__(self, title: str = "Neura Command", reactions: dict | None = None, key_delay: float = 0.0):
+        self.reactions = reactions or {}
+        self.key_delay = key_delay
+        self.clipboard = ""
+        self.events = []            # (time, event, value)
+        self.text = {}              # window title -> text typed or pasted into it
+        self._title = title
+        self._window = 0            # id of the window in front, new for every window brought up
+        self._pending = None        # (due time, title)
+        self.lock = threading.Lock()
+
+    def _event(self, event: str, value: str):
+        if self.key_delay:
+            time.sleep(self.key_delay)
+        with self.lock:
+            self.events.append((time.monotonic(), event, value))
+            reaction = self.reactions.get(value)
+            if reaction:
+                self._pending = (time.monotonic() + reaction[1], reaction[0])
+
+    def press(self, key):
+        self._event("press", key)
+
+    def hotkey(self, *keys):
+        combo = "+".join(keys)
+        self._event("hotkey", combo)
+        if combo == "ctrl+v":
+            title = self.active_window_title()
+            self.text[title] = self.text.get(title, "") + self.clipboard
+
+    def key_down(self, key):
+        self._event("key_down", key)
+
+    def key_up(self, key):
+        self._event("key_up", key)
+
+    def write(self, text, interval=0.0):
+        for char in text:
+            self._event("write", char)
+            title = self.active_window_title()
+            self.text[title] = self.text.get(title, "") + char
+            if interval:
+                time.sleep(interval)
+
+    def get_clipboard(self):
+        return self.clipboard
+
+    def set_clipboard(self, text):
+        self.clipboard = text
+
+    def active_window_title(self):
+        with self.lock:
+            if self._pending and time.monotonic() >= self._pending[0]:
+                self._title = self._pending[1]
+                self._window += 1
+                self._pending = None
+            return self._title
+
+    def active_window_id(self):
+        self.active_window_title()
+        return self._window
+
+
+class GuiAutomation:
+    """
+    Args:
+        backend (GuiBackend): Where key events and window queries go.
+        poll_interval (float): Seconds between two readiness checks.
+    """
+
+    def __init__(self, backend: GuiBackend, poll_interval: float = POLL_INTERVAL):
+        self.backend = backend
+        self.poll_interval = poll_interval
+
+    def wait_until(self, predicate, timeout: float) -> bool:
+        """Polls `predicate` until it returns a truthy value or `timeout` seconds pass."""
+        deadline = time.monotonic() + timeout
+        while True:
+            if predicate():
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+    def wait_for_window(self, keywords: list, timeout: float, exclude=None) -> str | None:
+        """
+        Waits until the active window's title contains one of `keywords` (case-insensitive). Returns the title.
+        `exclude` is a window id (backend.active_window_id) that does not count, e.g. the window active
+        before the new one was opened: the agent's own console may have a matching title.
+        """
+        keywords = [keyword.lower() for keyword in keywords]
+        found = []
+
+        def _ready():
+            title = self.backend.active_window_title()
+            if exclude is not None and self.backend.active_window_id() == exclude:
+                return False
+            if any(keyword in title.lower() for keyword in keywords):
+                found.append(title)
+                return True
+            return False
+
+        return found[0] if self.wait_until(_ready, timeout) else None
+
+    def wait_for_window_change(self, previous_title: str, timeout: float) -> bool:
+        """Waits until another window than `previous_title` is active."""
+        return self.wait_until(lambda: self.backend.active_window_title() != previous_title, timeout)
+
+    def paste(self, text: str):
+        """Inserts `text` in the active window with one Ctrl+V, then restores the clipboard."""
+        try:
+            previous = self.backend.get_clipboard()
+        except Exception:
+            previous = None
+        self.backend.set_clipboard(text)
+        self.backend.hotkey("ctrl", "v")
+        if previous is not None:
+            time.sleep(PASTE_SETTLE)
+            self.backend.set_clipboard(previous)
+
+    def alt_tab(self, times: int = 1):
+        self.backend.key_down("alt")
+        for _ in range(times):
+            self.backend.press("tab")
+        self.backend.key_up("alt")
+
+    def open_start_search(self, timeout: float = 2.0) -> bool:
+        """Presses the Windows key and waits for the Start menu to take the focus."""
+        previous = self.backend.active_window_title()
+        self.backend.press("win")
+        return self.wait_for_window_change(previous, timeout)
+
+
+_gui = None
+
+
+def get_gui() -> GuiAutomation:
+    global _gui
+    if _gui is None:
+        _gui = GuiAutomation(PyAutoGuiBackend())
+    return _gui
@@ -0,0 +1,154 @@
+"""
+Shared keep-alive HTTP client for the tools that call web APIs directly (OCR.space).
+Provides:
+- HttpClient: requests.Session with a connection pool, connect/read timeouts, jittered
+  exponential retry on 5xx / 429 / timeouts / connection errors, and latency metrics.
+- get_client: Client shared by the tools, one per name.
+
+A one-off requests.post opens a new TCP (+TLS) connection per call and, without a timeout,
+can hang the agent on a stalled server. The session keeps connections open between calls;
+every attempt is bounded by DEFAULT_TIMEOUT, and the whole call by the retry budget and,
+when given, a deadline (so a tool's own timeout is never reached while retries are still pending).
+"""
+
+import random
+import threading
+import time
+from collections import deque
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = (5, 30)                   # connect, read (seconds)
+RETRIES = 3                                 # attempts after the first one
+BACKOFF_BASE = 0.5                          # seconds, doubled at every retry
+BACKOFF_MAX = 8.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+POOL_SIZE = 8
+LATENCY_SAMPLES = 512
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class HttpClient:
+    """
+    Args:
+        timeout (tuple|float): Default (connect, read) timeout of one attempt.
+        retries (int): Retries after the first attempt.
+        deadline (float|None): Default max seconds of a whole call, attempts and delays included:
+            each attempt's timeouts are cut to the time left and no retry starts after it.
+        backoff_base (float): Upper bound of the first retry delay; doubles each retry (full jitter).
+        backoff_max (float): Cap of one retry delay.
+        pool_size (int): Connections kept open per host.
+        sleep (callable): Used between attempts (replaceable in tests).
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries: int = RETRIES, deadline: float | None = None,
+                 backoff_base: float = BACKOFF_BASE, backoff_max: float = BACKOFF_MAX, pool_size: int = POOL_SIZE,
+                 sleep=time.sleep):
+        self.timeout = timeout
+        self.retries = retries
+        self.deadline = deadline
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.sleep = sleep
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.lock = threading.Lock()
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)     # seconds per attempt
+        self.counters = {"requests": 0, "attempts": 0, "retries": 0, "failures": 0}
+
+    def _delay(self, attempt: int, response=None) -> float:
+        """Full-jitter exponential backoff; a Retry-After header (in seconds) is honoured up to backoff_max."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _count(self, key: str, latency: float | None = None):
+        with self.lock:
+            self.counters[key] += 1
+            if latency is not None:
+                self.latencies.append(latency)
+
+    @staticmethod
+    def _cap_timeout(timeout, left: float):
+        if isinstance(timeout, tuple):
+            return tuple(min(part, left) for part in timeout)
+        return min(timeout, left)
+
+    def request(self, method: str, url: str, deadline: float | None = None, **kwargs) -> requests.Response:
+        """
+        Sends a request, retrying transient failures. Accepts the keyword arguments of requests,
+        and `deadline` overriding the client's one.
+
+        Returns the response (also a 4xx, or the last 5xx once the retries or the deadline are spent).
+        Raises requests.Timeout / requests.ConnectionError when every attempt failed that way.
+        """
+        timeout = kwargs.pop("timeout", self.timeout)
+        deadline = deadline if deadline is not None else self.deadline
+        end = None if deadline is None else time.monotonic() + deadline
+        self._count("requests")
+        attempt = 0
+        while True:
+            kwargs["timeout"] = timeout if end is None else self._cap_timeout(timeout, max(end - time.monotonic(), 0.1))
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.Timeout, requests.ConnectionError):
+                self._count("attempts", time.perf_counter() - start)
+                delay = self._delay(attempt)
+                if attempt >= self.retries or (end is not None and time.monotonic() + delay >= end):
+                    self._count("failures")
+                    raise
+            else:
+                self._count("attempts", time.perf_counter() - start)
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                delay = self._delay(attempt, response)
+                if attempt >= self.retries or (end is not None and time.monotonic() + delay >= end):
+                    self._count("failures")
+                    return response
+                response.close()
+            self._count("retries")
+            attempt += 1
+            self.sleep(delay)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> dict:
+        """Counters plus p50 / p95 / max latency of the recent attempts, in milliseconds."""
+        with self.lock:
+            stats = dict(self.counters)
+            latencies = list(self.latencies)
+        if latencies:
+            stats.update(
+                p50_ms=round(_percentile(latencies, 0.50) * 1000, 1),
+                p95_ms=round(_percentile(latencies, 0.95) * 1000, 1),
+                max_ms=round(max(latencies) * 1000, 1),
+            )
+        return stats
+
+    def close(self):
+        self.session.close()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(name: str = "default", **kwargs) -> HttpClient:
+    """The shared client called `name`, created with `kwargs` on first use."""
+    with _clients_lock:
+        if name not in _clients:
+            _clients[name] = HttpClient(**kwargs)
+        return _clients[name]
@@ -10,43 +10,16 @@ Provided Tools:
 """
 
 import os
-import subprocess, time, pyautogui
-from pathlib import Path
+import subprocess
 from langchain_core.tools import tool
-import pygetwindow as gw
 # import difflib
-from rapidfuzz import process, fuzz
+from utils.app_index import AppIndex, get_app_dirs
+from utils.disk_cache import CACHE_DIR
+from utils.window_backend import PyGetWindowBackend, WindowCache
+from utils.gui_automation import get_gui
 
-def get_all_file_paths_and_names(directory_path):
-    """
-    Gets the full path and the name (without extension) of all files 
-    in the specified directory and its subdirectories using pathlib.
-
-    Returns:
-        A list of dictionaries, where each dictionary contains:
-        - 'path': The full absolute path string.
-        - 'name': The file name without the extension.
-    """
-    path = Path(directory_path)
-    file_data = []
-
-    for item in path.glob('**/*'):
-        if item.is_file():
-            # Get the full absolute path as a string
-            full_path = str(item.resolve()) 
-            
-            # Get the file name without the extension
-            name_without_ext = item.stem.lower()
-            
-            file_data.append({
-                'path': full_path,
-                'name': name_without_ext
-            })
-
-    return file_data
-
-directory = 'C:\\ProgramData\\Microsoft\\Windows\\Start Menu\\Programs'
-directory2 = f"{os.path.expanduser('~')}\\AppData\\Roaming\\Microsoft\\Windows\\Start Menu\\Programs"
+app_index = AppIndex(get_app_dirs(), os.path.join(CACHE_DIR, "app_index.json"))
+window_cache = WindowCache(PyGetWindowBackend())
 
 @tool
 def open_app(window_name: str):
@@ -59,53 +32,25 @@ def open_app(window_name: str):
     Returns:
         str: Success or error message.
     """
-    all_apps_data = get_all_file_paths_and_names(directory)
-    extra_apps = get_all_file_paths_and_names(directory2)
-    all_apps_data.extend(extra_apps)
-
-
-    appname = [app['name'] for app in all_apps_data]
-    app_paths = [app['path'] for app in all_apps_data]
-
+    app_index.ensure_ready()
+    match = app_index.best_match(window_name)
 
-    names_lower = [name.lower() for name in appname]
-
-    match = process.extractOne(
-        window_name.lower(),
-        names_lower,
-        scorer=fuzz.partial_ratio
-    )
-
-    if match is None or match[1] < 70:
-        pyautogui.press("win")
-        time.sleep(1)
-        pyautogui.write(window_name)
+    if match is None:
+        gui = get_gui()
+        gui.open_start_search()
+        gui.backend.write(window_name)
         return f"{window_name} was not an application, so it was searched in the Windows search bar."
 
-    
-    matched_name_lower = match[0]
-
-
-    index = names_lower.index(matched_name_lower)
-
-    final_path = app_paths[index]
-    original_name = appname[index]
+    original_name, final_path, _ = match
 
     try:
         subprocess.Popen(final_path, shell=True)
+        window_cache.invalidate()
         return f"'{original_name}' has been opened successfully."
     except Exception as e:
         return f"Failed to open '{original_name}': {e}"
 
 
-def find_closest_window_title(query : str):
-    """
-    From active windows applications get the most closest app name
-    """
-    titles = gw.getAllTitles()
-    result = process.extractOne(query, titles, scorer=fuzz.partial_ratio)
-    return result[0] if result else None
-
 @tool
 def close_app(window_name: str):
     """
@@ -119,11 +64,9 @@ def close_app(window_name: str):
         str: Confirmation message indicating whether the matching
         window was successfully closed or not found.
     """
-    window_to_close = find_closest_window_title(window_name)
-    if window_to_close:
-        window_handle = gw.getWindowsWithTitle(window_to_close)[0]
-        window_handle.close()
-        return f"{window_to_close} was closed "
+    match = window_cache.apply(window_name, lambda window_handle: window_handle.close(), changes_windows=True)
+    if match:
+        return f"{match[0]} was closed "
     else:
         return f"No window found with a title close to '{window_name}'"
     
@@ -140,14 +83,30 @@ def minimize_app(window_name: str):
         str: Message indicating whether the matching window was
         successfully minimized or not found.
     """
-    window_to_minimize = find_closest_window_title(window_name)
-    if window_to_minimize:
-        window_handle = gw.getWindowsWithTitle(window_to_minimize)[0]
-        window_handle.minimize()
-        return f"{window_to_minimize} was minimized "
+    match = window_cache.apply(window_name, lambda window_handle: window_handle.minimize())
+    if match:
+        return f"{match[0]} was minimized "
     else:
         return f"No window found with a title close to '{window_name}'"
 
+def _activate(window_handle):
+    # pygetwindow raises "Error code from Windows: 0 - The operation completed successfully" after a successful activate.
+    try:
+        window_handle.activate()
+    except Exception as e:
+        if "Error code from Windows: 0" not in str(e):
+            raise
+
+def _maximize(window_handle):
+    window_handle.minimize()
+    window_handle.maximize()
+    _activate(window_handle)
+
+def _restore(window_handle):
+    window_handle.minimize()
+    window_handle.restore()
+    _activate(window_handle)
+
 @tool
 def maximize_app(window_name: str):
     """
@@ -161,13 +120,9 @@ def maximize_app(window_name: str):
         str: Message indicating whether the matching window was
         successfully maximized or not found.
     """
-    window_to_maximize = find_closest_window_title(window_name)
-    if window_to_maximize:
-        window_handle = gw.getWindowsWithTitle(window_to_maximize)[0]
-        window_handle.minimize()
-        window_handle.maximize()
-        window_handle.activate()
-        return f"{window_to_maximize} was maximized "
+    match = window_cache.apply(window_name, _maximize)
+    if match:
+        return f"{match[0]} was maximized "
     else:
         return f"No window found with a title close to '{window_name}'"
 
@@ -184,13 +139,9 @@ def restore_app(window_name: str):
         str: Message indicating whether the matching window was
         successfully restored or not found.
     """
-    window_to_restore = find_closest_window_title(window_name)
-    if window_to_restore:
-        window_handle = gw.getWindowsWithTitle(window_to_restore)[0]
-        window_handle.minimize()
-        window_handle.restore()
-        window_handle.activate()
-        return f"{window_to_restore} was restored "
+    match = window_cache.apply(window_name, _restore)
+    if match:
+        return f"{match[0]} was restored "
     else:
         return f"No window found with a title close to '{window_name}'"
 
@@ -207,18 +158,14 @@ def switch_btwn_apps(window_name: str):
         str: Message indicating whether the matching window was
         successfully switched or not found.
     """
-    window_to_switch = find_closest_window_title(window_name)
-    if window_to_switch:
-        window_handle = gw.getWindowsWithTitle(window_to_switch)[0]
+    def _switch(window_handle):
         if not window_handle.isMaximized:
-            window_handle.minimize()
-            window_handle.restore()
-            window_handle.activate()
-            return f"{window_to_switch} is active now. "
+            _restore(window_handle)
         else:
-            window_handle.minimize()
-            window_handle.maximize()
-            window_handle.activate()
-            return f"{window_to_switch} is active now. "
+            _maximize(window_handle)
+
+    match = window_cache.apply(window_name, _switch)
+    if match:
+        return f"{match[0]} is active now. "
     else:
         return f"No window found with a title '{window_name}' to switch to."
@@ -0,0 +1,301 @@
+"""
+Multi-threaded ZIP writer and reader used by create_zipfile / extract_zipfile.
+Provides:
+- write_zip: Zips a folder (or a single file) with the members deflated in parallel.
+- list_zip: Lists the members of an archive (central directory only, nothing is decompressed).
+- extract_zip: Extracts the members matching a glob, in parallel, streamed in bounded chunks.
+- ZipLimitError: Raised when an archive breaks the size / ratio limits or has unsafe paths.
+- STORED_EXTENSIONS: Already-compressed types written as-is instead of deflated.
+
+zlib releases the GIL while deflating, so a thread pool uses every core. Workers read and compress
+whole members; the main thread writes them to the archive in walk order, keeping at most
+MAX_INFLIGHT_BYTES of source data in memory. Members above PARALLEL_MAX_BYTES are streamed by
+ZipFile.write on the main thread while the pool keeps compressing the next members.
+zipfile has no public way to append pre-compressed data, so write_compressed uses ZipFile
+internals; on an interpreter where they are missing every member goes through ZipFile.write.
+The archive layout is the one of shutil.make_archive (same arcnames and directory entries).
+"""
+
+import fnmatch
+import os
+import shutil
+import threading
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from utils.read_file_tool import EXCLUDED_EXTENSIONS
+
+# Media and archive types from read_file's list that don't shrink when deflated again.
+# Raw formats (.bmp, .wav, .tar, .iso, executables...) still compress well and are deflated.
+STORED_EXTENSIONS = frozenset(EXCLUDED_EXTENSIONS) - {
+    ".bmp", ".ico", ".wav", ".tar", ".exe", ".dll", ".bin", ".dat", ".iso", ".pdf",
+}
+
+DEFAULT_LEVEL = 6
+PARALLEL_MAX_BYTES = 32 * 1024 * 1024
+MAX_INFLIGHT_BYTES = 256 * 1024 * 1024
+
+# Extraction limits (zip bombs). Override the total with NEURA_ZIP_MAX_BYTES.
+MAX_EXTRACT_BYTES = int(os.getenv("NEURA_ZIP_MAX_BYTES", 8 * 1024 ** 3))
+MAX_RATIO = 250                          # uncompressed / compressed
+RATIO_MIN_BYTES = 16 * 1024 * 1024       # the ratio is only checked above this size
+EXTRACT_CHUNK = 1024 * 1024
+
+# ZipFile internals write_compressed relies on (CPython 3.8+).
+PRECOMPRESSED_ATTRS = ("_lock", "_writecheck", "_didModify", "fp", "start_dir", "filelist", "NameToInfo")
+
+
+class ZipLimitError(Exception):
+    pass
+
+
+def walk_members(source: str) -> list:
+    """Returns (path, arcname, is_dir) in make_archive order, arcnames relative to source's parent."""
+    root_dir = os.path.dirname(source)
+    if os.path.isfile(source):
+        return [(source, os.path.basename(source), False)]
+
+    members = [(source, os.path.basename(source), True)]
+    for dirpath, dirnames, filenames in os.walk(source):
+        dirnames.sort()
+        for name in dirnames:
+            path = os.path.join(dirpath, name)
+            members.append((path, os.path.relpath(path, root_dir), True))
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            if os.path.isfile(path):
+                members.append((path, os.path.relpath(path, root_dir), False))
+    return members
+
+
+def member_compress_type(path: str, level: int) -> int:
+    if level == 0 or os.path.splitext(path)[1].lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def compress_member(path: str, level: int) -> tuple:
+    """Reads and compresses one file. Returns (compress_type, CRC, file_size, data)."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    crc = zlib.crc32(raw)
+    if member_compress_type(path, level) == zipfile.ZIP_STORED:
+        return zipfile.ZIP_STORED, crc, len(raw), raw
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    data = compressor.compress(raw) + compressor.flush()
+    if len(data) >= len(raw):
+        return zipfile.ZIP_STORED, crc, len(raw), raw
+    return zipfile.ZIP_DEFLATED, crc, len(raw), data
+
+
+def can_write_precompressed(zf: zipfile.ZipFile) -> bool:
+    """True if `zf` has the internals write_compressed needs; otherwise use ZipFile.write."""
+    return all(hasattr(zf, name) for name in PRECOMPRESSED_ATTRS) and hasattr(zipfile.ZipInfo, "FileHeader")
+
+
+def write_compressed(zf: zipfile.ZipFile, path: str, arcname: str, member: tuple):
+    """
+    Appends a member compressed by compress_member.
+
+    Same steps as ZipFile.open(..., "w") + close, except the sizes and CRC are already
+    known, so the local header is written once and no data descriptor is needed.
+    Only call it when can_write_precompressed(zf) is True.
+    """
+    compress_type, crc, file_size, data = member
+    zinfo = zipfile.ZipInfo.from_file(path, arcname)
+    zinfo.compress_type = compress_type
+    zinfo.CRC = crc
+    zinfo.file_size = file_size
+    zinfo.compress_size = len(data)
+    zip64 = file_size > zipfile.ZIP64_LIMIT or len(data) > zipfile.ZIP64_LIMIT
+
+    with zf._lock:
+        zf._writecheck(zinfo)
+        zf._didModify = True
+        zinfo.header_offset = zf.fp.tell()
+        zf.fp.write(zinfo.FileHeader(zip64))
+        zf.fp.write(data)
+        zf.start_dir = zf.fp.tell()
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+
+
+def write_zip(zip_path: str, source: str, level: int = DEFAULT_LEVEL, workers: int | None = None) -> dict:
+    """
+    Zips `source` (folder or file) into `zip_path`.
+
+    The archive is written to `zip_path + ".part"` and renamed when complete,
+    so a failure never leaves a truncated zip behind.
+
+    Args:
+        zip_path (str): Archive to create (overwritten if it exists).
+        source (str): Folder or file to zip.
+        level (int): Deflate level, 0 (store everything) to 9 (smallest).
+        workers (int|None): Compression threads (default: CPU count).
+
+    Returns:
+        dict: {"files", "stored", "bytes_in", "bytes_out"}.
+    """
+    level = min(max(level, 0), 9)
+    stats = {"files": 0, "stored": 0, "bytes_in": 0, "bytes_out": 0}
+    tmp_path = zip_path + ".part"
+    os.makedirs(os.path.dirname(os.path.abspath(zip_path)), exist_ok=True)
+
+    try:
+        with zipfile.ZipFile(tmp_path, "w") as zf, \
+                ThreadPoolExecutor(max_workers=workers or os.cpu_count(), thread_name_prefix="neura-zip") as pool:
+            pending = deque()       # (path, arcname, future, size) in archive order; future None = ZipFile.write
+            inflight = 0
+            parallel = can_write_precompressed(zf)
+
+            def write_next():
+                nonlocal inflight
+                path, arcname, future, size = pending.popleft()
+                if future is None:
+                    zf.write(path, arcname, compress_type=member_compress_type(path, level), compresslevel=level)
+                    return
+                member = future.result()
+                inflight -= size
+                write_compressed(zf, path, arcname, member)
+                stats["stored"] += member[0] == zipfile.ZIP_STORED
+
+            for path, arcname, is_dir in walk_members(source):
+                if is_dir:
+                    pending.append((path, arcname, None, 0))
+                    continue
+
+                size = os.path.getsize(path)
+                stats["files"] += 1
+                stats["bytes_in"] += size
+                if size > PARALLEL_MAX_BYTES or not parallel:
+                    # Streamed by ZipFile.write when its turn comes; not held in memory.
+                    stats["stored"] += member_compress_type(path, level) == zipfile.ZIP_STORED
+                    pending.append((path, arcname, None, size))
+                    continue
+
+                while pending and inflight + size > MAX_INFLIGHT_BYTES:
+                    write_next()
+                pending.append((path, arcname, pool.submit(compress_member, path, level), size))
+                inflight += size
+
+            while pending:
+                write_next()
+
+        os.replace(tmp_path, zip_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    stats["bytes_out"] = os.path.getsize(zip_path)
+    return stats
+
+
+def select_members(zf: zipfile.ZipFile, pattern: str = "*") -> list:
+    """ZipInfo of the members whose name matches the glob `pattern` (all members for "*")."""
+    if pattern in ("", "*"):
+        return zf.infolist()
+    return [info for info in zf.infolist() if fnmatch.fnmatch(info.filename, pattern)
+            or fnmatch.fnmatch(info.filename.rstrip("/"), pattern)]
+
+
+def list_zip(zip_path: str, pattern: str = "*") -> dict:
+    """
+    Lists an archive from its central directory.
+
+    Returns:
+        dict: {"members": [(name, size, compressed_size, is_dir)], "total_size", "total_compressed"}.
+    """
+    with zipfile.ZipFile(zip_path) as zf:
+        infos = select_members(zf, pattern)
+    return {
+        "members": [(info.filename, info.file_size, info.compress_size, info.is_dir()) for info in infos],
+        "total_size": sum(info.file_size for info in infos),
+        "total_compressed": sum(info.compress_size for info in infos),
+    }
+
+
+def check_limits(infos: list, dest: str, max_bytes: int, max_ratio: float):
+    """Refuses archives that would expand beyond the limits before anything is written."""
+    total = sum(info.file_size for info in infos)
+    compressed = sum(info.compress_size for info in infos)
+    if total > max_bytes:
+        raise ZipLimitError(f"uncompressed size {total:,} bytes is over the {max_bytes:,} bytes limit")
+    if total > RATIO_MIN_BYTES and total > compressed * max_ratio:
+        raise ZipLimitError(f"compression ratio {total / max(compressed, 1):.0f}:1 is over {max_ratio:.0f}:1")
+    for info in infos:
+        if info.file_size > RATIO_MIN_BYTES and info.file_size > info.compress_size * max_ratio:
+            raise ZipLimitError(f"'{info.filename}' has a compression ratio over {max_ratio:.0f}:1")
+
+    existing = dest
+    while not os.path.exists(existing):
+        existing = os.path.dirname(existing)
+    free = shutil.disk_usage(existing).free
+    if total > free:
+        raise ZipLimitError(f"needs {total:,} bytes but only {free:,} bytes are free")
+
+
+def member_target(dest: str, name: str) -> str:
+    """Destination path of a member; refuses names escaping `dest` (zip slip)."""
+    parts = [part for part in name.replace("\\", "/").split("/") if part not in ("", ".")]
+    target = os.path.realpath(os.path.join(dest, *parts)) if parts else dest
+    if ".." in parts or os.path.isabs(name) or (target != dest and not target.startswith(dest + os.sep)):
+        raise ZipLimitError(f"unsafe member path '{name}'")
+    return target
+
+
+def extract_zip(zip_path: str, dest: str, pattern: str = "*", workers: int | None = None,
+                max_bytes: int = MAX_EXTRACT_BYTES, max_ratio: float = MAX_RATIO) -> dict:
+    """
+    Extracts the members matching `pattern` into `dest`.
+
+    Limits and member paths are checked on the central directory before anything is written.
+    Members are then extracted on a thread pool, each worker with its own ZipFile handle,
+    copying EXTRACT_CHUNK bytes at a time. ZipExtFile stops at the declared size and checks
+    the CRC, so a member lying about its size fails instead of filling the disk.
+
+    Returns:
+        dict: {"files", "bytes"} extracted.
+    """
+    dest = os.path.realpath(dest)
+    with zipfile.ZipFile(zip_path) as zf:
+        infos = select_members(zf, pattern)
+    if not infos:
+        return {"files": 0, "bytes": 0}
+    targets = [(info, member_target(dest, info.filename)) for info in infos]
+    check_limits(infos, dest, max_bytes, max_ratio)
+
+    os.makedirs(dest, exist_ok=True)
+    files = []
+    for info, target in targets:
+        if info.is_dir():
+            os.makedirs(target, exist_ok=True)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            files.append((info, target))
+
+    local = threading.local()
+    handles = []
+    handles_lock = threading.Lock()
+
+    def _extract(info, target):
+        if not hasattr(local, "zf"):
+            local.zf = zipfile.ZipFile(zip_path)
+            with handles_lock:
+                handles.append(local.zf)
+        with local.zf.open(info) as src, open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst, EXTRACT_CHUNK)
+        return info.file_size
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count(), thread_name_prefix="neura-unzip") as pool:
+            # Largest members first so they don't end up alone at the tail of the run.
+            ordered = sorted(files, key=lambda item: -item[0].file_size)
+            written = sum(pool.map(lambda item: _extract(*item), ordered))
+    finally:
+        for handle in handles:
+            handle.close()
+
+    return {"files": len(files), "bytes": written}
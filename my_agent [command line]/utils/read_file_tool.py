@@ -2,10 +2,22 @@
 Tool to read content of a file.
 
 Provided tool:
- - read_file: Read contents of a file
+ - read_file: Read contents of a file (whole, head, tail, line range or byte range)
+
+Files are memory-mapped, so reading a slice of a multi-hundred-MB log never loads the whole file.
+Line ranges use a sparse line-offset index (one offset every INDEX_STEP lines), cached per file
+and rebuilt when its mtime or size changes. Output (content and header) stays within MAX_OUTPUT_CHARS,
+the max_output_chars of read_file's ToolSpec, so the output governor never cuts it; partial results
+start with a header giving the file size and the arguments to read the next part.
 """
 
+import mmap
 import os
+import threading
+from array import array
+from collections import OrderedDict
+from itertools import accumulate, count, islice
+from operator import add
 from typing import Literal
 from langchain_core.tools import tool
 
@@ -18,6 +30,13 @@ EXCLUDED_EXTENSIONS = [
     ".docx", ".xlsx", ".pptx", ".odt", ".ods"
 ]
 
+MAX_OUTPUT_CHARS = 16_000      # = max_output_chars of read_file's ToolSpec (utils/tool_registry.py)
+MAX_OUTPUT_BYTES = MAX_OUTPUT_CHARS - 300   # room for the header of a partial result
+DEFAULT_LINES = 200
+INDEX_STEP = 1024               # lines between two offsets of the line index
+INDEX_CHUNK = 8 * 1024 * 1024   # bytes scanned at once while building the index
+MAX_CACHED_INDEXES = 8
+
 
 BASE_DIR_MAP = {
     "Desktop": os.path.join(os.path.expanduser("~"), "Desktop"),
@@ -29,8 +48,173 @@ BASE_DIR_MAP = {
     "Home": os.path.expanduser("~")
 }
 
+
+class LineIndex:
+    """
+    Sparse line-offset index of one file.
+
+    Attributes:
+        offsets (array): offsets[k] is the byte offset of line k * INDEX_STEP (0-based).
+        line_count (int): Number of lines (a last line without newline counts).
+    """
+
+    def __init__(self, mm, size: int):
+        offsets = array("Q", [0])
+        newlines = 0
+        pos = 0
+        while pos < size:
+            end = min(pos + INDEX_CHUNK, size)
+            if end < size:
+                # Extend the chunk to the end of its last line.
+                newline = mm.find(b"\n", end)
+                end = size if newline == -1 else newline + 1
+            parts = mm[pos:end].split(b"\n")[:-1]
+            # Start of the line following the j-th newline: pos + len(parts[0..j]) + j + 1.
+            starts = map(add, accumulate(map(len, parts)), count(pos + 1))
+            first = (-(newlines + 1)) % INDEX_STEP
+            offsets.extend(islice(starts, first, None, INDEX_STEP))
+            newlines += len(parts)
+            pos = end
+        self.offsets = offsets
+        self.line_count = newlines + (1 if size and mm[size - 1:size] != b"\n" else 0)
+
+    def offset_of(self, mm, line: int, size: int) -> int:
+        """Byte offset of `line` (0-based); `size` if past the end."""
+        if line >= self.line_count:
+            return size
+        pos = self.offsets[line // INDEX_STEP]
+        for _ in range(line % INDEX_STEP):
+            pos = mm.find(b"\n", pos) + 1
+        return pos
+
+
+_index_lock = threading.Lock()
+_indexes = OrderedDict()    # path -> (mtime_ns, size, LineIndex)
+
+
+def get_line_index(path: str, mm, stat) -> LineIndex:
+    """Returns the cached index of `path`, rebuilt if the file changed (mtime or size)."""
+    with _index_lock:
+        cached = _indexes.get(path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            _indexes.move_to_end(path)
+            return cached[2]
+
+    index = LineIndex(mm, stat.st_size)
+    with _index_lock:
+        _indexes[path] = (stat.st_mtime_ns, stat.st_size, index)
+        _indexes.move_to_end(path)
+        while len(_indexes) > MAX_CACHED_INDEXES:
+            _indexes.popitem(last=False)
+    return index
+
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:,} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def char_boundary(mm, pos: int, step: int = -1) -> int:
+    """Moves `pos` by `step` over UTF-8 continuation bytes, so a cut there does not split a character."""
+    for _ in range(3):
+        if not 0 < pos < len(mm) or mm[pos] & 0xC0 != 0x80:
+            break
+        pos += step
+    return pos
+
+
+def cap_to_lines(mm, start: int, end: int, max_bytes: int) -> int:
+    """Moves `end` back so the slice fits in max_bytes, cutting at a line end when possible."""
+    if end - start <= max_bytes:
+        return end
+    cut = mm.rfind(b"\n", start, start + max_bytes)
+    return cut + 1 if cut != -1 else char_boundary(mm, start + max_bytes)
+
+
+def decode(data: bytes) -> str:
+    return data.decode("utf-8").replace("\r\n", "\n")
+
+
+def read_head(mm, size: int, lines: int, max_bytes: int) -> tuple:
+    end = 0
+    for _ in range(lines):
+        newline = mm.find(b"\n", end)
+        if newline == -1:
+            end = size
+            break
+        end = newline + 1
+    return 0, cap_to_lines(mm, 0, end, max_bytes)
+
+
+def read_tail(mm, size: int, lines: int, max_bytes: int) -> tuple:
+    # A newline ending the file closes the last line, it doesn't start a new one.
+    start = size - 1 if mm[size - 1:size] == b"\n" else size
+    for _ in range(lines):
+        newline = mm.rfind(b"\n", 0, start)
+        if newline == -1:
+            start = 0
+            break
+        start = newline
+    start = start + 1 if start else 0
+    if size - start > max_bytes:
+        newline = mm.find(b"\n", size - max_bytes)
+        start = newline + 1 if newline != -1 and newline + 1 < size else char_boundary(mm, size - max_bytes, 1)
+    return start, size
+
+
+
+def read_range(full_path: str, file, mm, size: int, mode: str, start: int | None, count: int | None) -> str:
+    """Reads the part of the file asked by `mode` and prefixes a header if it isn't the whole file."""
+    lines = max(count or DEFAULT_LINES, 1)
+    total_lines = None
+
+    if mode == "auto":
+        if size <= MAX_OUTPUT_BYTES:
+            return decode(mm[:])
+        begin, end = 0, cap_to_lines(mm, 0, size, MAX_OUTPUT_BYTES)
+    elif mode == "head":
+        begin, end = read_head(mm, size, lines, MAX_OUTPUT_BYTES)
+    elif mode == "tail":
+        begin, end = read_tail(mm, size, lines, MAX_OUTPUT_BYTES)
+    elif mode == "lines":
+        index = get_line_index(full_path, mm, os.fstat(file.fileno()))
+        total_lines = index.line_count
+        first = max(start or 1, 1) - 1
+        if first >= total_lines:
+            return f"[File: {format_size(size)}, {total_lines:,} lines. Line {first + 1:,} is past the end.]"
+        begin = index.offset_of(mm, first, size)
+        end = cap_to_lines(mm, begin, index.offset_of(mm, first + lines, size), MAX_OUTPUT_BYTES)
+    else:
+        begin = min(max(start or 0, 0), size)
+        end = min(begin + min(count or MAX_OUTPUT_BYTES, MAX_OUTPUT_BYTES), size)
+        header = f"[File: {format_size(size)}. Showing bytes {begin:,}-{end:,}."
+        if end < size:
+            header += f' Next: mode="bytes", start={end}'
+        return header + "]\n" + mm[begin:end].decode("utf-8", errors="replace")
+
+    content = decode(mm[begin:end])
+    if begin == 0 and end == size:
+        return content
+
+    if mode == "tail":
+        header = f"[File: {format_size(size)}. Showing the last {size - begin:,} bytes."
+    else:
+        # Line numbers are known when the slice starts at line 1 or came from the index.
+        first_line = first + 1 if mode == "lines" else 1
+        last_line = first_line + content.count("\n") - (1 if content.endswith("\n") else 0)
+        header = f"[File: {format_size(size)}"
+        header += f", {total_lines:,} lines." if total_lines is not None else "."
+        header += f" Showing lines {first_line:,}-{last_line:,}."
+        if end < size:
+            header += f' Next: mode="lines", start={last_line + 1}'
+    return header + "]\n" + content
+
+
 @tool
-def read_file(name_of_file: str, base_dir: Literal["Desktop", "Documents", "Downloads", "Pictures","Videos", "Music", "Home"] = "Desktop"
+def read_file(name_of_file: str, base_dir: Literal["Desktop", "Documents", "Downloads", "Pictures","Videos", "Music", "Home"] = "Desktop",
+              mode: Literal["auto", "head", "tail", "lines", "bytes"] = "auto", start: int | None = None, count: int | None = None
 ):
     """
     Read the contents of a text file located inside a chosen base directory.
@@ -54,9 +238,25 @@ def read_file(name_of_file: str, base_dir: Literal["Desktop", "Documents", "Down
                 - Music
                 - Home
 
+        mode (str):
+            How much of the file to read. Large files are never returned in full.
+            Options:
+                - auto: The whole file if it is small, otherwise its beginning (default)
+                - head: The first `count` lines
+                - tail: The last `count` lines (e.g. the end of a log)
+                - lines: `count` lines starting at line `start` (1-based)
+                - bytes: `count` bytes starting at byte offset `start` (0-based)
+
+        start (int, optional):
+            First line ("lines" mode, default 1) or byte offset ("bytes" mode, default 0).
+
+        count (int, optional):
+            Number of lines (default 200) or bytes to read. The output is capped to 16,000 characters.
+
     Returns:
         str:
-            - File content (if readable)
+            - File content (if readable). Partial content starts with a [header] giving the
+              file size, the part shown and the arguments to read the next part.
             - Error message (if something goes wrong)
     """
 
@@ -74,9 +274,12 @@ def read_file(name_of_file: str, base_dir: Literal["Desktop", "Documents", "Down
         )
 
     try:
-        with open(full_path, "r", encoding="utf-8") as file:
-            content = file.read()
-        return content
+        with open(full_path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size == 0:
+                return ""
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return read_range(full_path, file, mm, size, mode, start, count)
 
     except UnicodeDecodeError:
         return "File contains binary data (not plain text). It may be corrupted or an unsupported format."
@@ -6,13 +6,11 @@ Provided tools:
 
 import os
 import time
-import uuid
-import requests
 from dotenv import load_dotenv
-from PIL import ImageGrab
-import pyautogui
 from typing import Literal
 from langchain_core.tools import tool
+from utils.screen_capture import ImageGrabSource, ScreenReader, OCRError
+from utils.gui_automation import get_gui
 
 
 appdata = os.getenv("APPDATA")
@@ -21,14 +19,15 @@ os.makedirs(config_dir, exist_ok=True)
 
 env_path = os.path.join(config_dir, ".env")
 
+# The OCR_API_KEY entry is created by config.py at startup.
 if os.path.exists(env_path):
     load_dotenv(env_path)
 ocr_apikey = os.getenv("OCR_API_KEY")
 
-if not ocr_apikey:
-    with open(env_path, 'a') as f:
-        f.write(f"OCR_API_KEY={""}\n")
-    print(f"OCR_API_KEY not found! Created .env ")
+screen_reader = ScreenReader(ImageGrabSource(), ocr_apikey)
+
+SWITCH_TIMEOUT = 1.5    # seconds to wait for Alt+Tab to bring another window in front
+RENDER_SETTLE = 0.15    # seconds for the new window to finish painting
 
 OCR_LANGUAGES = {
     "English": "eng",
@@ -68,7 +67,8 @@ SupportedLanguage = Literal[
 ]
 
 @tool
-def read_screen_text(which_screen: int, language: SupportedLanguage = "English"):
+def read_screen_text(which_screen: int, language: SupportedLanguage = "English", monitor: int | None = None,
+                     region: list[int] | None = None):
     """
     Reads text from a window on the user's computer using OCR.
 
@@ -87,8 +87,8 @@ def read_screen_text(which_screen: int, language: SupportedLanguage = "English")
 
     WHAT THE TOOL DOES:
         - Optionally switches to another window using Alt+Tab.
-        - Captures a screenshot.
-        - Extracts text from it.
+        - Captures a screenshot (whole screen, one monitor or a region).
+        - Extracts text from it (an unchanged screen is not read twice).
         - Returns the extracted text.
 
     Args:
@@ -109,6 +109,14 @@ def read_screen_text(which_screen: int, language: SupportedLanguage = "English")
                 "Ukrainian", "Vietnamese"
             ]
 
+        monitor (int, optional): Monitor to capture when the user has several.
+            - None (default): the primary screen.
+            - 0: all monitors at once.
+            - 1, 2, ...: that monitor only.
+
+        region (list[int], optional): Only capture this rectangle, as [left, top, right, bottom]
+            in screen pixels. Use it when the user points at one part of the screen.
+
     Returns:
         str: Extracted text from the screen, or an error message if OCR fails or
         an exception occurs.
@@ -119,46 +127,22 @@ def read_screen_text(which_screen: int, language: SupportedLanguage = "English")
         
         ocr_language_code = OCR_LANGUAGES[language]
         
+        gui = get_gui()
         if which_screen > 1:
-            pyautogui.keyDown('alt')
-            for _ in range(which_screen - 1):
-                pyautogui.press('tab')
-            pyautogui.keyUp('alt')
-
-
-        time.sleep(0.7)
+            previous_title = gui.backend.active_window_title()
+            gui.alt_tab(which_screen - 1)
+            gui.wait_for_window_change(previous_title, SWITCH_TIMEOUT)
+            time.sleep(RENDER_SETTLE)
         
-        appdata = os.getenv("APPDATA")
-        screenshots_dir = os.path.join(appdata, "Neura Command", "screenshots")
-        os.makedirs(screenshots_dir, exist_ok=True)
-
-        file_name = os.path.join(screenshots_dir, f"screenshot_{uuid.uuid4()}.png")
-
-        screenshot = ImageGrab.grab()
-        screenshot.save(file_name)
+        screenshot = screen_reader.capture(region=region, monitor=monitor)
         
         if not which_screen == 1:
-            pyautogui.keyDown('alt')
-            pyautogui.press('tab')
-            pyautogui.keyUp('alt')
+            gui.alt_tab()
 
-        
-        api_url = "https://api.ocr.space/parse/image"
-        with open(file_name, "rb") as f:
-            response = requests.post(
-                api_url,
-                files={"filename": f},
-                data={"apikey": ocr_apikey, "language": ocr_language_code}
-            )
-
-        os.remove(file_name)
-
-        result = response.json()
-        if result.get("IsErroredOnProcessing"):
-            return f"OCR Error: {result.get('ErrorMessage', 'Unknown error')}"
-
-        extracted_text = result["ParsedResults"][0]["ParsedText"]
-        return extracted_text.strip()
+        return screen_reader.text_of(screenshot, ocr_language_code)
+
+    except OCRError as e:
+        return f"OCR Error: {e}"
 
     except Exception as e:
         return f"Exception occurred: {str(e)}"
@@ -2,25 +2,23 @@
 Research tools using Tavily API tavily_client.extract and tavily_client.search
 Provided tools:
 - internet_search: Perform an online web search using the Tavily Search API.
+- batch_internet_search: Run several searches at once (async fan-out) and merge them into one ranked list.
 - web_scraper: Extract/Scrape detailed content directly from any specific webpages using Tavily's extractor.
 
 """
 
 from dotenv import load_dotenv
+import asyncio
+import json
 import os
+import threading
+import time
+from concurrent.futures import Future
+from urllib.parse import parse_qsl, urlencode, urlsplit
 from langchain_core.tools import tool
-from tavily import TavilyClient
+from tavily import AsyncTavilyClient, TavilyClient
 from typing import Literal
-
-welcome_msg = """\033[38;5;208m
-
-█░█░█ █▀▀ █░░ █▀▀ █▀█ █▀▄▀█ █▀▀   ▀█▀ █▀█   █▄░█ █▀▀ █░█ █▀█ ▄▀█   █▀▀ █▀█ █▀▄▀█ █▀▄▀█ ▄▀█ █▄░█ █▀▄
-▀▄▀▄▀ ██▄ █▄▄ █▄▄ █▄█ █░▀░█ ██▄   ░█░ █▄█   █░▀█ ██▄ █▄█ █▀▄ █▀█   █▄▄ █▄█ █░▀░█ █░▀░█ █▀█ █░▀█ █▄▀
-\033[0m
-"""
-os.system("cls" if os.name == "nt" else "clear")
-print("\033c", end="")
-print(welcome_msg)
+from utils.disk_cache import DiskCache, CACHE_DIR
 
 appdata = os.getenv("APPDATA")
 config_dir = os.path.join(appdata, "Neura Command")
@@ -30,45 +28,126 @@ os.makedirs(config_dir, exist_ok=True)
 ENV_PATH = os.path.join(config_dir, ".env")
 
 
+# The TAVILY_API_KEY prompt runs in config.py at startup, this module is imported on first use.
 if os.path.exists(ENV_PATH):
     load_dotenv(ENV_PATH)
 
-tavily_key = os.getenv("TAVILY_API_KEY")
-name = os.getenv("NAME")
+tavily_key = os.getenv("TAVILY_API_KEY") or "PlaceHolder"
+    
+tavily_client = TavilyClient(api_key=tavily_key)
+
+# Search results cache: news goes stale fast, general results last a day.
+SEARCH_TTLS = {
+    "news": 15 * 60,
+    "finance": 60 * 60,
+    "general": 24 * 60 * 60,
+}
+search_cache = DiskCache(os.path.join(CACHE_DIR, "search_cache.sqlite"), max_bytes=50 * 1024 * 1024)
+
+# Simultaneous Tavily searches of one batch_internet_search call.
+SEARCH_CONCURRENCY = 4
+RRF_K = 60      # reciprocal rank fusion constant: a result ranked r in a set adds 1 / (RRF_K + r)
+
+_async_client = None
 
+def get_async_client() -> AsyncTavilyClient:
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncTavilyClient(api_key=tavily_key)
+    return _async_client
 
-if not tavily_key:
-    print()
-    while True:
-        choice = input(
-            "Tavily is used for searching the web and scraping any URL.\n"
-            "Without this API key, these features will not work.\n"
-            "Do you want to provide it? (Y/N): "
-        ).strip().upper()
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
 
-        if choice in ("Y", "N"):
-            break
+def search_cache_key(query: str, topic: str, max_results: int, include_raw_content: bool) -> str:
+    return json.dumps([normalize_query(query), topic, max_results, include_raw_content])
+
+# Extracted page content per URL, bounded by size (pages can be large).
+SCRAPE_TTL = 6 * 60 * 60
+scrape_cache = DiskCache(os.path.join(CACHE_DIR, "scrape_cache.sqlite"), max_bytes=200 * 1024 * 1024)
+
+# URL -> Future of the extract call currently fetching it, so concurrent calls share one fetch.
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def _extract_batch(urls: list) -> dict:
+    """
+    One Tavily extract call for `urls`. Returns url -> (ok, item) and caches the successes.
+    Tavily may return a normalized URL (trailing slash, "www."...): items are matched on normalize_url.
+    An item matching no requested URL (a redirect to another page) is returned under its own URL
+    and not cached, since it cannot be told which request it answers.
+    """
+    response = tavily_client.extract(urls, extract_depth="advanced", format="markdown")
+    requested = {normalize_url(url): url for url in urls}
+
+    def _match(item):
+        url = item.get("url") or ""
+        return url if url in urls else requested.get(normalize_url(url))
+
+    outcomes = {}
+    leftovers = []
+    for item in response.get("results", []):
+        url = _match(item)
+        if url is None or url in outcomes:
+            leftovers.append(item)
         else:
-            print("\nPlease enter only Y or N.\n")
-
-    if choice == "Y":
-        print()
-        while True:
-            tavily_key = input("Enter your Tavily API: ").strip()
-            if tavily_key:
-                print()
-                break
-        with open(ENV_PATH, 'a') as f:
-            f.write(f"TAVILY_API_KEY={tavily_key}\n")
-        print(f"\nTAVILY_API_KEY not found! Added TAVILY_API_KEY={tavily_key}\n")
-    else:
-        tavily_key = "PlaceHolder"
-        print("\nProceeding without Tavily API key.\n")
-
-else:
-    print(f"TAVILY_API_KEY found! name = {name}, tavily_api_key = {tavily_key}\n")
-    
-tavily_client = TavilyClient(api_key=tavily_key)
+            outcomes[url] = (True, item)
+    for item in response.get("failed_results", []):
+        url = _match(item)
+        if url is not None and url not in outcomes:
+            outcomes[url] = (False, item)
+
+    for url in urls:
+        if url not in outcomes:
+            error = "No content returned"
+            if leftovers:
+                error += " under this URL (it may have redirected to one of the other results)"
+            outcomes[url] = (False, {"url": url, "error": error})
+        ok, item = outcomes[url]
+        if ok:
+            scrape_cache.set(url, item, SCRAPE_TTL)
+    for item in leftovers:
+        outcomes.setdefault(item.get("url") or f"unmatched result {len(outcomes)}", (True, item))
+    return outcomes
+
+def fetch_pages(urls: list) -> tuple:
+    """
+    Returns (outcomes, cached_urls): url -> (ok, item) for every url.
+    Only cache misses not already being fetched by another call go to Tavily, in one batch.
+    """
+    outcomes, cached_urls = {}, []
+    owned, waiting = [], {}
+
+    for url in dict.fromkeys(urls):
+        item = scrape_cache.get(url)
+        if item is not None:
+            outcomes[url] = (True, item)
+            cached_urls.append(url)
+            continue
+        with _inflight_lock:
+            if url in _inflight:
+                waiting[url] = _inflight[url]
+            else:
+                _inflight[url] = Future()
+                owned.append(url)
+
+    if owned:
+        try:
+            fetched = _extract_batch(owned)
+        except Exception as e:
+            with _inflight_lock:
+                for url in owned:
+                    _inflight.pop(url).set_exception(e)
+            raise
+        with _inflight_lock:
+            for url in owned:
+                _inflight.pop(url).set_result(fetched[url])
+        outcomes.update(fetched)
+
+    for url, future in waiting.items():
+        outcomes[url] = future.result()
+
+    return outcomes, cached_urls
 
 @tool
 def internet_search(
@@ -76,6 +155,7 @@ def internet_search(
     max_results: int = 4,
     topic: Literal["general", "news", "finance"] = "general",
     include_raw_content: bool = False,
+    bypass_cache: bool = False,
 ):
     """
     Perform an online web search using the Tavily Search API.
@@ -102,17 +182,154 @@ def internet_search(
             • "news" for recent events or breaking updates.
             • "finance" for markets, stocks, economics, or company profiles.
         include_raw_content (bool): If True, includes raw webpage text in results.
+        bypass_cache (bool): If True, skips cached results and searches again.
+            Only use when the user asks for fresh/updated results.
 
     Returns:
         - A structured list of search results with titles, URLs, summaries,
         and optionally raw text.
     """
-    return tavily_client.search(
+    max_results = max_results if max_results is not None else 4
+    key = search_cache_key(query, topic, max_results, include_raw_content)
+
+    if not bypass_cache:
+        cached = search_cache.get(key)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+    result = tavily_client.search(
         query,
-        max_results=max_results if max_results is not None else 4,
+        max_results=max_results,
         include_raw_content=include_raw_content,
         topic=topic,
     )
+    search_cache.set(key, result, SEARCH_TTLS.get(topic, SEARCH_TTLS["general"]))
+    return result
+
+def normalize_url(url: str) -> str:
+    """Key of a URL for deduplication: scheme, "www.", fragment, trailing slash and utm_* parameters ignored."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if not k.startswith("utm_")])
+    return f"{host}{parts.path.rstrip('/')}" + (f"?{query}" if query else "")
+
+def merge_results(result_sets: dict) -> list:
+    """
+    Merges the results of several searches into one list, one entry per URL.
+    Ranked by reciprocal rank fusion (URLs found by several queries come first), then by Tavily's score.
+
+    Args:
+        result_sets (dict): query -> Tavily search response.
+    """
+    merged = {}
+    for query, response in result_sets.items():
+        for rank, item in enumerate(response.get("results", []), start=1):
+            url = item.get("url")
+            if not url:
+                continue
+            entry = merged.get(normalize_url(url))
+            if entry is None:
+                entry = merged[normalize_url(url)] = {**item, "queries": [], "rank_score": 0.0}
+            elif len(item.get("content") or "") > len(entry.get("content") or ""):
+                entry.update({k: v for k, v in item.items() if k not in ("url", "score")})
+            entry["queries"].append(query)
+            entry["rank_score"] += 1 / (RRF_K + rank)
+            entry["score"] = max(entry.get("score") or 0, item.get("score") or 0)
+
+    ranked = sorted(merged.values(), key=lambda entry: (entry["rank_score"], entry["score"]), reverse=True)
+    for entry in ranked:
+        entry["rank_score"] = round(entry["rank_score"], 4)
+    return ranked
+
+async def batch_search(queries: list, max_results_per_query: int = 4, topic: str = "general",
+                       include_raw_content: bool = False, bypass_cache: bool = False,
+                       client=None, cache: DiskCache | None = None, concurrency: int = SEARCH_CONCURRENCY) -> dict:
+    """
+    Runs the searches concurrently (at most `concurrency` at a time) and merges them.
+
+    Args:
+        client: Object with an async `search(query, max_results=, include_raw_content=, topic=)`
+            (default: the shared AsyncTavilyClient).
+        cache (DiskCache|None): Search results cache (default: search_cache, shared with internet_search).
+
+    Returns:
+        dict: queries, merged results, cached_queries, errors (query -> message), response_time.
+    """
+    client = client or get_async_client()
+    cache = cache if cache is not None else search_cache
+    semaphore = asyncio.Semaphore(concurrency)
+    unique = {}
+    for query in queries:
+        if query.strip():
+            unique.setdefault(normalize_query(query), query.strip())
+    queries = list(unique.values())
+    ttl = SEARCH_TTLS.get(topic, SEARCH_TTLS["general"])
+    cached_queries = []
+
+    async def _search(query):
+        key = search_cache_key(query, topic, max_results_per_query, include_raw_content)
+        if not bypass_cache:
+            cached = cache.get(key)
+            if cached is not None:
+                cached_queries.append(query)
+                return cached
+        async with semaphore:
+            result = await client.search(query, max_results=max_results_per_query,
+                                         include_raw_content=include_raw_content, topic=topic)
+        cache.set(key, result, ttl)
+        return result
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(_search(query) for query in queries), return_exceptions=True)
+
+    result_sets, errors = {}, {}
+    for query, outcome in zip(queries, outcomes):
+        if isinstance(outcome, BaseException):
+            errors[query] = f"{type(outcome).__name__}: {outcome}"
+        else:
+            result_sets[query] = outcome
+
+    return {
+        "queries": queries,
+        "results": merge_results(result_sets),
+        "cached_queries": cached_queries,
+        "errors": errors,
+        "response_time": round(time.perf_counter() - start, 2),
+    }
+
+@tool
+async def batch_internet_search(
+    queries: list[str],
+    max_results_per_query: int = 4,
+    topic: Literal["general", "news", "finance"] = "general",
+    include_raw_content: bool = False,
+    bypass_cache: bool = False,
+):
+    """
+    Run several web searches at once with the Tavily Search API and get one merged, ranked list.
+
+    USE THIS TOOL WHEN:
+    - A question needs more than one search: several sub-questions, comparisons
+      (e.g. "X vs Y"), several entities, or different phrasings of the same question.
+    - Prefer it over calling internet_search several times in a row.
+
+    DO NOT USE THIS TOOL WHEN:
+    - One query is enough — use internet_search.
+    - You already have the URLs — use web_scraper.
+
+    Args:
+        queries (list[str]): The search queries (2 to 8 is typical). Duplicates are ignored.
+        max_results_per_query (int): Results retrieved per query (default 4).
+        topic (str): Search domain for all queries — "general", "news", or "finance".
+        include_raw_content (bool): If True, includes raw webpage text in results.
+        bypass_cache (bool): If True, skips cached results and searches again.
+            Only use when the user asks for fresh/updated results.
+
+    Returns:
+        - One list of results without duplicate URLs, best first. Each result has title, url,
+          content, score and the queries that found it. Queries that failed are listed under errors.
+    """
+    return await batch_search(queries, max_results_per_query, topic, include_raw_content, bypass_cache)
 
 @tool
 def web_scraper(urls: list[str]):
@@ -142,8 +359,16 @@ def web_scraper(urls: list[str]):
     if isinstance(urls, str):
         urls = [urls]
 
-    return tavily_client.extract(
-        urls,
-        extract_depth="advanced",
-        format="markdown"
-    )
\ No newline at end of file
+    start = time.perf_counter()
+    outcomes, cached_urls = fetch_pages([url.strip() for url in urls])
+
+    results, failed_results = [], []
+    for ok, item in outcomes.values():
+        (results if ok else failed_results).append(item)
+
+    return {
+        "results": results,
+        "failed_results": failed_results,
+        "cached_urls": cached_urls,
+        "response_time": round(time.perf_counter() - start, 2),
+    }
\ No newline at end of file
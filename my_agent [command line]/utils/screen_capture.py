@@ -0,0 +1,181 @@
+"""
+In-memory screenshot -> OCR pipeline used by read_screen_text.
+Provides:
+- CaptureSource: Interface (grab) returning a PIL image of the screen, a monitor or a region.
+- ImageGrabSource: Real source (PIL.ImageGrab, monitors from win32api), imported on first use.
+- StaticImageSource: Returns given images; for benchmarks and tests without a desktop.
+- prepare_for_ocr: Grayscale + downscale + JPEG encoding of a capture, in memory.
+- image_digest: Exact digest of a capture's pixels (the OCR cache key).
+- ScreenReader: Capture -> digest cache -> prepare -> OCR.space POST (pooled, retrying HttpClient).
+- OCRError: OCR.space reported an error.
+
+Nothing touches the disk: the capture is encoded into a BytesIO buffer and posted from there.
+Text screenshots keep their readability in grayscale JPEG at ~1920 px wide, and are several
+times smaller than the full-resolution PNG the tool used to upload. A screen whose pixels did
+not change at all since the last read (same language, within OCR_CACHE_TTL) is not sent again;
+the key is an exact digest, since a perceptual hash does not see "port 8080" become "port 9090".
+"""
+
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+import requests
+from PIL import Image
+from utils.http_client import HttpClient, get_client
+
+OCR_API_URL = os.getenv("OCR_API_URL", "https://api.ocr.space/parse/image")
+OCR_TIMEOUT = (5, 20)           # connect, read (seconds) of one attempt
+OCR_DEADLINE = 45.0             # whole OCR call with retries, under the read_screen_text timeout (60 s)
+
+MAX_WIDTH = 1920
+JPEG_QUALITY = 80
+OCR_CACHE_TTL = 120             # seconds
+OCR_CACHE_ENTRIES = 16
+
+
+class OCRError(Exception):
+    pass
+
+
+class CaptureSource:
+    """Where screenshots come from."""
+
+    def grab(self, region: tuple | None = None, monitor: int | None = None) -> Image.Image:
+        """
+        Args:
+            region (tuple|None): (left, top, right, bottom) in virtual screen coordinates.
+            monitor (int|None): None = primary screen, 0 = all monitors, n = n-th monitor (1-based).
+        """
+        raise NotImplementedError
+
+
+class ImageGrabSource(CaptureSource):
+
+    @staticmethod
+    def monitors() -> list:
+        """(left, top, right, bottom) of every monitor, in the order Windows enumerates them."""
+        import win32api
+        return [tuple(rect) for _, _, rect in win32api.EnumDisplayMonitors()]
+
+    def grab(self, region=None, monitor=None) -> Image.Image:
+        from PIL import ImageGrab
+
+        if region is None and monitor:
+            monitors = self.monitors()
+            if not 1 <= monitor <= len(monitors):
+                raise ValueError(f"monitor must be between 1 and {len(monitors)}")
+            region = monitors[monitor - 1]
+        all_screens = monitor is not None or region is not None
+        return ImageGrab.grab(bbox=tuple(region) if region else None, all_screens=all_screens)
+
+
+class StaticImageSource(CaptureSource):
+    """Returns the given images in turn (the last one forever); crops `region` like a real grab."""
+
+    def __init__(self, images: list):
+        self.images = list(images)
+        self.grabs = 0
+
+    def grab(self, region=None, monitor=None) -> Image.Image:
+        image = self.images[min(self.grabs, len(self.images) - 1)]
+        self.grabs += 1
+        return image.crop(tuple(region)) if region else image.copy()
+
+
+def prepare_for_ocr(image: Image.Image, grayscale: bool = True, max_width: int = MAX_WIDTH,
+                    quality: int = JPEG_QUALITY) -> bytes:
+    """Encodes a capture as the smallest JPEG that still OCRs well. Returns the JPEG bytes."""
+    image = image.convert("L" if grayscale else "RGB")
+    if max_width and image.width > max_width:
+        height = round(image.height * max_width / image.width)
+        image = image.resize((max_width, height), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def image_digest(image: Image.Image) -> str:
+    """BLAKE2b of the pixels, mode and size: any changed pixel gives another key."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.mode}:{image.size}".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+class ScreenReader:
+    """
+    Args:
+        source (CaptureSource): Screenshot source.
+        api_key (str|None): OCR.space key.
+        ocr_url (str): OCR endpoint (OCR_API_URL env var by default).
+        http (HttpClient|None): Client to post with (default: the shared "ocr" client).
+    """
+
+    def __init__(self, source: CaptureSource, api_key: str | None, ocr_url: str = OCR_API_URL,
+                 http: HttpClient | None = None):
+        self.source = source
+        self.api_key = api_key
+        self.ocr_url = ocr_url
+        self.http = http or get_client("ocr", timeout=OCR_TIMEOUT, deadline=OCR_DEADLINE)
+        self.lock = threading.Lock()
+        self.cache = OrderedDict()      # (digest, language, grayscale) -> (time, text)
+        self.stats = {"reads": 0, "cache_hits": 0, "uploaded_bytes": 0}
+
+    def _cached(self, key):
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is None or time.time() - entry[0] > OCR_CACHE_TTL:
+                return None
+            self.cache.move_to_end(key)
+            return entry[1]
+
+    def _store(self, key, text: str):
+        with self.lock:
+            self.cache[key] = (time.time(), text)
+            self.cache.move_to_end(key)
+            while len(self.cache) > OCR_CACHE_ENTRIES:
+                self.cache.popitem(last=False)
+
+    def ocr(self, data: bytes, language_code: str) -> str:
+        """Posts a JPEG to OCR.space and returns the parsed text."""
+        try:
+            response = self.http.post(
+                self.ocr_url,
+                files={"filename": ("screen.jpg", data, "image/jpeg")},
+                data={"apikey": self.api_key, "language": language_code, "filetype": "JPG"},
+            )
+        except requests.RequestException as e:
+            raise OCRError(f"OCR service unreachable ({type(e).__name__})") from e
+        try:
+            result = response.json()
+        except ValueError:
+            raise OCRError(f"HTTP {response.status_code}: {response.text[:200]}") from None
+        if not isinstance(result, dict):
+            raise OCRError(str(result)[:200])       # OCR.space answers some errors with a bare string
+        if result.get("IsErroredOnProcessing"):
+            raise OCRError(result.get("ErrorMessage", "Unknown error"))
+        return result["ParsedResults"][0]["ParsedText"].strip()
+
+    def capture(self, region=None, monitor=None) -> Image.Image:
+        self.stats["reads"] += 1
+        return self.source.grab(region=region, monitor=monitor)
+
+    def text_of(self, image: Image.Image, language_code: str, grayscale: bool = True) -> str:
+        """Returns the text of a capture, from the cache if the same screen was read recently."""
+        key = (image_digest(image), language_code, grayscale)
+        text = self._cached(key)
+        if text is not None:
+            self.stats["cache_hits"] += 1
+            return text
+
+        data = prepare_for_ocr(image, grayscale=grayscale)
+        self.stats["uploaded_bytes"] += len(data)
+        text = self.ocr(data, language_code)
+        self._store(key, text)
+        return text
+
+    def read(self, language_code: str, region=None, monitor=None, grayscale: bool = True) -> str:
+        return self.text_of(self.capture(region, monitor), language_code, grayscale)
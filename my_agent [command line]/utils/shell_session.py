@@ -0,0 +1,287 @@
+"""
+Persistent shell session behind the run_command tool.
+Provides:
+- ShellSession: One long-lived shell (PowerShell on Windows, bash elsewhere) driven over asyncio pipes.
+- OutputBuffer: Bounded capture of a command's output (first lines + ring buffer of the last ones).
+- CommandResult: Exit code, duration, output and timeout flag of one command.
+- get_session: The session of the running event loop.
+
+Each command is written to the shell's stdin followed by a unique end marker echoed on stdout
+(with the exit code) and on stderr, so the working directory, variables and environment carry
+over between calls. stdout/stderr are read line by line as they arrive. On timeout or
+cancellation the whole shell process tree is killed and the next command starts a new shell.
+"""
+
+import asyncio
+import atexit
+import os
+import signal
+import subprocess
+import time
+import uuid
+import weakref
+from collections import deque
+from dataclasses import dataclass
+
+HEAD_LINES = 40
+TAIL_BYTES = 64 * 1024
+SUMMARY_CHARS = 6_000
+LINE_LIMIT = 1024 * 1024        # longest line the stream reader accepts
+
+
+class OutputBuffer:
+    """Keeps the first `head_lines` lines and the last `tail_bytes` bytes of lines; counts the rest."""
+
+    def __init__(self, head_lines: int = HEAD_LINES, tail_bytes: int = TAIL_BYTES):
+        self.head_lines = head_lines
+        self.tail_bytes = tail_bytes
+        self.head = []
+        self.tail = deque()
+        self.tail_size = 0
+        self.total_lines = 0
+        self.total_bytes = 0
+
+    def add(self, line: str):
+        self.total_lines += 1
+        self.total_bytes += len(line) + 1
+        if len(self.head) < self.head_lines:
+            self.head.append(line)
+            return
+        self.tail.append(line)
+        self.tail_size += len(line) + 1
+        while self.tail_size > self.tail_bytes and len(self.tail) > 1:
+            self.tail_size -= len(self.tail.popleft()) + 1
+
+    @property
+    def omitted(self) -> int:
+        return self.total_lines - len(self.head) - len(self.tail)
+
+    def summary(self, max_chars: int = SUMMARY_CHARS) -> str:
+        """First and last lines of the output within max_chars (up to a third for the head)."""
+        head, used = [], 0
+        for line in self.head:
+            if used + len(line) + 1 > max_chars // 3:
+                break
+            head.append(line)
+            used += len(line) + 1
+        if len(head) < len(self.head) and not self.tail:
+            # Only a head: give it the whole budget.
+            for line in self.head[len(head):]:
+                if used + len(line) + 1 > max_chars:
+                    break
+                head.append(line)
+                used += len(line) + 1
+
+        tail = deque()
+        for line in reversed(self.tail):
+            if used + len(line) + 1 > max_chars:
+                break
+            tail.appendleft(line)
+            used += len(line) + 1
+
+        omitted = self.total_lines - len(head) - len(tail)
+        parts = head + ([f"... [{omitted:,} lines omitted] ..."] if omitted else []) + list(tail)
+        return "\n".join(parts)
+
+
+@dataclass
+class CommandResult:
+    command: str
+    exit_code: int | None
+    duration: float
+    output: OutputBuffer
+    timed_out: bool = False             # the command was killed with its shell
+    shell_exited: bool = False          # the command ended the shell (e.g. `exit`)
+    session_restarted: bool = False     # ran in a new shell: cwd / env state of earlier commands was lost
+
+
+def _powershell_wrap(command: str, marker: str) -> str:
+    # The blank line closes multi-line statements; $LASTEXITCODE covers native programs, $? cmdlets.
+    return (
+        "$global:LASTEXITCODE = 0\n"
+        f"{command}\n"
+        "\n"
+        "$__neura_ok = $?; $__neura_rc = if ($global:LASTEXITCODE) { $global:LASTEXITCODE } elseif ($__neura_ok) { 0 } else { 1 }\n"
+        f"[Console]::Out.WriteLine(''); [Console]::Out.WriteLine('{marker} ' + $__neura_rc); "
+        f"[Console]::Error.WriteLine(''); [Console]::Error.WriteLine('{marker}')\n"
+    )
+
+
+def _bash_wrap(command: str, marker: str) -> str:
+    # stdin of the command is /dev/null, otherwise it would read the next lines of this script.
+    return (
+        f"{{ {command}\n}} </dev/null\n"
+        "__neura_rc=$?\n"
+        f"printf '\\n%s %s\\n' '{marker}' \"$__neura_rc\"\n"
+        f"printf '\\n%s\\n' '{marker}' >&2\n"
+    )
+
+
+SHELLS = {
+    "powershell": (
+        ["powershell", "-NoLogo", "-NoProfile", "-NonInteractive", "-Command", "-"],
+        _powershell_wrap,
+        "[Console]::OutputEncoding = [Text.Encoding]::UTF8\n",
+    ),
+    "bash": (["bash", "--noprofile", "--norc"], _bash_wrap, ""),
+}
+
+DEFAULT_SHELL = "powershell" if os.name == "nt" else "bash"
+
+
+class ShellSession:
+    """
+    Args:
+        shell (str): Key of SHELLS.
+        cwd (str|None): Starting directory (default: home).
+    """
+
+    def __init__(self, shell: str = DEFAULT_SHELL, cwd: str | None = None):
+        self.shell = shell
+        self.cwd = cwd or os.path.expanduser("~")
+        self.proc = None
+        self.lock = asyncio.Lock()
+        self.restarts = 0
+        _sessions.add(self)
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.returncode is None
+
+    async def start(self):
+        argv, _, init = SHELLS[self.shell]
+        kwargs = {}
+        if os.name == "nt":
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.CREATE_NO_WINDOW
+        else:
+            kwargs["start_new_session"] = True
+        self.proc = await asyncio.create_subprocess_exec(
+            *argv,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.cwd,
+            limit=LINE_LIMIT,
+            **kwargs,
+        )
+        if init:
+            self.proc.stdin.write(init.encode())
+            await self.proc.stdin.drain()
+
+    def kill(self):
+        """Kills the shell and everything it started."""
+        proc, self.proc = self.proc, None
+        if proc is None or proc.returncode is not None:
+            return
+        try:
+            if os.name == "nt":
+                subprocess.run(["taskkill", "/T", "/F", "/PID", str(proc.pid)], capture_output=True)
+            else:
+                os.killpg(proc.pid, signal.SIGKILL)
+        except (OSError, ProcessLookupError):
+            proc.kill()
+
+    async def _read_until(self, stream, marker: str, stream_name: str, buffer: OutputBuffer, on_output):
+        """Reads lines until the marker. Returns the text after the marker on its line, or None at EOF."""
+        pending_blank = False
+        while True:
+            try:
+                raw = await stream.readline()
+            except ValueError:
+                # Line longer than LINE_LIMIT: the reader dropped it.
+                self._emit(f"[line longer than {LINE_LIMIT:,} bytes skipped]", stream_name, buffer, on_output)
+                continue
+            if not raw:
+                return None
+            line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            if line.startswith(marker):
+                return line[len(marker):].strip()
+            # The marker is preceded by a newline in case the output didn't end with one;
+            # hold back blank lines until we know they aren't that newline.
+            if pending_blank:
+                self._emit("", stream_name, buffer, on_output)
+                pending_blank = False
+            if line == "":
+                pending_blank = True
+                continue
+            self._emit(line, stream_name, buffer, on_output)
+
+    @staticmethod
+    def _emit(line: str, stream_name: str, buffer: OutputBuffer, on_output):
+        if stream_name == "stderr":
+            line = f"[stderr] {line}"
+        buffer.add(line)
+        if on_output:
+            on_output(line)
+
+    async def run(self, command: str, timeout: float, on_output=None) -> CommandResult:
+        """
+        Runs one command in the session.
+
+        Args:
+            command (str): Command line for the session's shell.
+            timeout (float): Seconds before the shell is killed.
+            on_output (callable, optional): Called with every output line as it arrives.
+        """
+        async with self.lock:
+            restarted = False
+            if not self.alive:
+                restarted = self.proc is not None or self.restarts > 0
+                await self.start()
+                self.restarts += 1
+
+            marker = f"__NEURA_DONE_{uuid.uuid4().hex}__"
+            _, wrap, _ = SHELLS[self.shell]
+            buffer = OutputBuffer()
+            start = time.perf_counter()
+            self.proc.stdin.write(wrap(command, marker).encode("utf-8"))
+            await self.proc.stdin.drain()
+
+            readers = [
+                asyncio.ensure_future(self._read_until(self.proc.stdout, marker, "stdout", buffer, on_output)),
+                asyncio.ensure_future(self._read_until(self.proc.stderr, marker, "stderr", buffer, on_output)),
+            ]
+            try:
+                done, _ = await asyncio.wait(readers, timeout=timeout)
+                if len(done) < len(readers):
+                    self.kill()
+                    return CommandResult(command, None, time.perf_counter() - start, buffer, timed_out=True)
+                exit_text = readers[0].result()
+                readers[1].result()
+            except BaseException:
+                # Cancelled (executor timeout, Ctrl+C...) or a read error:
+                # never leave a half-finished command behind.
+                self.kill()
+                raise
+            finally:
+                for reader in readers:
+                    reader.cancel()
+
+            if exit_text is None:
+                # The shell exited (e.g. `exit`): report its code, the next call starts a new one.
+                await self.proc.wait()
+                exit_code = self.proc.returncode
+                self.kill()
+                return CommandResult(command, exit_code, time.perf_counter() - start, buffer, shell_exited=True)
+
+            exit_code = int(exit_text) if exit_text.lstrip("-").isdigit() else None
+            return CommandResult(command, exit_code, time.perf_counter() - start, buffer,
+                                 session_restarted=restarted)
+
+
+_sessions = weakref.WeakSet()
+_loop_sessions = weakref.WeakKeyDictionary()     # event loop -> ShellSession
+
+
+def get_session() -> ShellSession:
+    """The shell session of the running event loop (asyncio pipes can't move between loops)."""
+    loop = asyncio.get_running_loop()
+    if loop not in _loop_sessions:
+        _loop_sessions[loop] = ShellSession()
+    return _loop_sessions[loop]
+
+
+@atexit.register
+def _kill_sessions():
+    for session in list(_sessions):
+        session.kill()
@@ -2,11 +2,92 @@
 Utility used to Execute commands in terminal.
 Provided tools:
  - write_command_in_terminal: Write the command in [Powershell or CMD or Termianl]
+ - run_command: Run a command in a hidden persistent shell and return its output
+Also provides:
+ - is_read_only_command: True if a command line only reads (allowlist below).
+ - needs_confirmation: run_command's approval rule, applied by the tool executor (ToolSpec.confirm).
+
+run_command runs a command from the allowlist of read-only commands directly. Anything else may
+change the system (and the command can come from a web page or file the model read), so the
+executor runs it only after the user approved it in the console; with no approver registered
+(benchmarks, scripts) it is refused.
 """
 
+import asyncio
+import re
+import time
 from langchain_core.tools import tool
+from langchain_core.callbacks.manager import adispatch_custom_event
 from typing import Literal
-import pyautogui, time
+from utils.gui_automation import get_gui
+from utils.shell_session import get_session
+
+# Words in the title of the window opened for each choice (Windows Terminal may host any of them).
+TERMINAL_TITLES = {
+    "Powershell": ["powershell", "terminal"],
+    "Command Prompt": ["command prompt", "cmd.exe", "terminal"],
+    "Termianl": ["terminal", "powershell", "command prompt"],
+}
+START_MENU_TIMEOUT = 2.0
+SEARCH_SETTLE = 0.2     # the search results have no readiness signal to poll
+TERMINAL_TIMEOUT = 10.0
+
+MAX_COMMAND_TIMEOUT = 600
+OUTPUT_EVENT_INTERVAL = 0.1     # seconds between two live output updates sent to the console
+
+# Commands that only read, by first word (lower case; PowerShell cmdlets, their aliases and Unix tools).
+READ_ONLY_COMMANDS = {
+    "cd", "set-location", "sl", "pushd", "popd", "pwd", "get-location", "gl",
+    "dir", "ls", "gci", "get-childitem", "tree", "where", "which", "get-command", "gcm",
+    "cat", "type", "gc", "get-content", "head", "tail", "wc", "more", "select-string", "sls", "findstr", "grep",
+    "echo", "write-output", "write-host", "get-date", "whoami", "uname", "ver",
+    "systeminfo", "get-computerinfo", "ping", "nslookup", "tasklist", "ps",
+    "get-process", "gps", "get-service", "gsv", "get-item", "gi", "get-itemproperty", "gp", "test-path",
+    "resolve-path", "get-filehash", "get-psdrive", "get-netipconfiguration", "df", "du", "free", "get-history",
+    "measure-object", "measure", "select-object", "select", "sort-object", "where-object", "?",
+    "format-table", "ft", "format-list", "fl", "out-string", "get-member", "gm",
+}
+# Programs whose listed subcommands (or flags) only read.
+READ_ONLY_SUBCOMMANDS = {
+    "git": {"status", "log", "diff", "show", "rev-parse", "describe", "blame", "ls-files", "shortlog"},
+    "pip": {"list", "show", "freeze", "--version", "-V"},
+    "python": {"--version", "-V"},
+    "py": {"--version", "-V"},
+    "node": {"--version", "-v"},
+    "npm": {"--version", "-v", "ls", "list", "view", "outdated"},
+    "conda": {"list", "info", "--version"},
+}
+# Only the first word of each segment is checked, so anything that runs a command from inside an argument is
+# refused: redirection, grouping and (array) subexpressions "( ) $( ) @( )", process substitution "<( )",
+# scriptblocks "{ }", call operators, backticks and writing cmdlets.
+UNSAFE_SYNTAX = re.compile(
+    r"[>`(){}]|(?<!&)&(?!&)|--output\b|\b(?:out-file|set-content|add-content|tee|tee-object|invoke-expression|iex)\b",
+    re.I,
+)
+SEGMENT_SPLIT = re.compile(r"&&|\|\||[|;\n]")
+
+def is_read_only_command(command: str) -> bool:
+    """True if every part of the command line is an allowlisted read-only command."""
+    if not command.strip() or UNSAFE_SYNTAX.search(command):
+        return False
+    for segment in SEGMENT_SPLIT.split(command):
+        words = segment.split()
+        if not words:
+            continue
+        name = words[0].lower()
+        if name.endswith(".exe"):
+            name = name[:-4]
+        if name in READ_ONLY_COMMANDS:
+            continue
+        if len(words) > 1 and words[1] in READ_ONLY_SUBCOMMANDS.get(name, ()):
+            continue
+        return False
+    return True
+
+
+def needs_confirmation(args: dict) -> bool:
+    """run_command calls outside the read-only allowlist need the user's approval."""
+    return not is_read_only_command(str(args.get("command", "")))
 
 @tool
 def write_command_in_terminal(where_to_write: Literal["Powershell", "Command Prompt", "Termianl"], what_to_write:str):
@@ -29,14 +110,86 @@ def write_command_in_terminal(where_to_write: Literal["Powershell", "Command Pro
         Success or Error msg.
     """
     try:
-        pyautogui.press("win")
-        time.sleep(0.7)
-        pyautogui.write(where_to_write)
-        time.sleep(0.2)
-        pyautogui.press("enter")
-        time.sleep(2)
-        pyautogui.write(what_to_write, 0.1)
+        gui = get_gui()
+        # The agent runs in a terminal too: only a window other than this one is the new terminal.
+        origin = gui.backend.active_window_id()
+        if not gui.open_start_search(START_MENU_TIMEOUT):
+            return "Error: the Start menu did not open, nothing was written."
+        gui.backend.write(where_to_write)
+        time.sleep(SEARCH_SETTLE)
+        gui.backend.press("enter")
+        if gui.wait_for_window(TERMINAL_TITLES[where_to_write], TERMINAL_TIMEOUT, exclude=origin) is None:
+            return f"Error: {where_to_write} did not open within {TERMINAL_TIMEOUT:g} s, nothing was written."
+        gui.paste(what_to_write)
         
         return f"I had opened {where_to_write} and wrote {what_to_write}. User please press enter to execute. Also tell user what this command can do."
     except Exception as e:
         return f"An error occured while writing : {e}"
+
+
+def format_result(result) -> str:
+    if result.timed_out:
+        status = f"timed out after {result.duration:.1f} s and was killed with its shell"
+    elif result.exit_code is None:
+        status = f"finished in {result.duration:.1f} s (exit code unknown)"
+    else:
+        status = f"exit code {result.exit_code} in {result.duration:.1f} s"
+    output = result.output
+    header = f"[{status}, {output.total_lines:,} lines of output]"
+    if result.session_restarted:
+        header += "\n[Ran in a new shell session: working directory and variables of earlier commands were reset]"
+    elif result.timed_out or result.shell_exited:
+        header += "\n[The shell session ended: the next command starts a new one]"
+    body = output.summary()
+    return f"{header}\n{body}" if body else header
+
+
+@tool
+async def run_command(command: str, timeout: int = 120):
+    """
+    Runs a command in a hidden shell session (PowerShell on Windows) and returns its output.
+    Use this when the result of the command is needed. The session persists between calls:
+    `cd`, variables and environment changes are kept for the next run_command.
+
+    Do not use it for interactive programs (editors, prompts waiting for input) or commands
+    that never end (servers, watchers); they are killed at the timeout.
+    Commands that only read (dir, Get-Content, git status...) run directly; any other command is
+    shown to the user, who must approve it before it runs.
+
+    Args:
+        command (str): The command line to run (PowerShell syntax on Windows).
+        timeout (int): Seconds before the command is killed (max 600). Default 120.
+
+    Returns:
+        str: Exit code, duration, line count and the output (stdout + stderr, long outputs
+        keep the first and last lines).
+    """
+    timeout = min(max(timeout, 1), MAX_COMMAND_TIMEOUT)
+    last_sent = 0.0
+    pending = []
+
+    def on_output(line):
+        pending.append(line)
+
+    async def forward():
+        # Live output for the console spinner, at most every OUTPUT_EVENT_INTERVAL.
+        nonlocal last_sent
+        if pending and time.monotonic() - last_sent >= OUTPUT_EVENT_INTERVAL:
+            line = pending[-1]
+            pending.clear()
+            last_sent = time.monotonic()
+            try:
+                await adispatch_custom_event("tool_output", {"tool": "run_command", "line": line})
+            except RuntimeError:
+                pass    # no parent run (called outside the graph)
+
+    session = get_session()
+    task = asyncio.ensure_future(session.run(command, timeout, on_output))
+    try:
+        while not task.done():
+            await asyncio.wait({task}, timeout=OUTPUT_EVENT_INTERVAL)
+            await forward()
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    return format_result(task.result())
@@ -0,0 +1,226 @@
+"""
+Lazy registry of all agent tools, built once, with execution metadata.
+Provides:
+- ToolSpec: Metadata of one tool (module, timeout, output size, parallel safety, cacheable, approval).
+- TOOL_SPECS: Tool name -> ToolSpec, in the order the tools are bound to the LLM.
+- get_tools / get_tools_by_name: Lightweight tool objects (full schema, no heavy imports).
+- get_spec: Metadata of a tool (DEFAULT_SPEC for unknown tools).
+- needs_confirmation: True if a call must be approved by the user before it runs.
+- load_tool: Imports the implementing module and returns the real tool.
+- prewarm: Imports tool modules in a background thread.
+
+Tool schemas are built from the source of the `utils/*` modules with `ast` (signature + docstring),
+so binding the tools to the LLM does not import pyautogui, PIL, pycaw, tavily, rapidfuzz...
+The implementing module is imported on the first call to one of its tools.
+"""
+
+import ast
+import importlib
+import os
+import threading
+from dataclasses import dataclass
+from typing import Literal
+from langchain_core.tools import tool
+
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """
+    Attributes:
+        module (str): Module in `utils` implementing the tool.
+        timeout (float): Seconds before the executor gives up on the call.
+        max_output_chars (int): Max characters of the result kept in the ToolMessage; longer results are
+            stored as artifacts and previewed (core/output_governor.py).
+        parallel_safe (bool): False if calls sharing `lane` must run one at a time, in call order.
+        lane (str|None): Shared resource (keyboard/mouse, filesystem...). Defaults to the tool itself.
+        max_concurrency (int): Max simultaneous calls when parallel_safe.
+        cacheable (bool): True if the same arguments give the same result for a while: identical calls of one
+            AIMessage run once and share the result.
+        log_style (str): How the console shows the result: "full", "search", "batch_search", "scrape" or "hidden".
+        keywords (tuple): Words users say for this tool that its docstring lacks (matched by the tool selector).
+        confirm (bool): True if the executor asks the user to approve a call before it runs. The tool's module
+            may define needs_confirmation(args) to exempt harmless calls (run_command: read-only command lines).
+    """
+    module: str
+    timeout: float = 60.0
+    max_output_chars: int = 8_000
+    parallel_safe: bool = True
+    lane: str | None = None
+    max_concurrency: int = 4
+    cacheable: bool = False
+    log_style: Literal["full", "search", "batch_search", "scrape", "hidden"] = "full"
+    keywords: tuple = ()
+    confirm: bool = False
+
+
+GUI = dict(parallel_safe=False, lane="gui", timeout=30.0)
+FILESYSTEM = dict(parallel_safe=False, lane="filesystem")
+SYSTEM = dict(parallel_safe=False, lane="system", timeout=15.0)
+
+APPS = "open_close_min_max_res_apps_tool"
+FOLDERS = "create_rename_delete_folder_tool"
+FILES = "create_rename_delete_file_tool"
+ZIP = "create_or_extract_zip_tool"
+
+# In the order the tools are bound to the LLM.
+TOOL_SPECS = {
+    "internet_search": ToolSpec("research_tools", timeout=45.0, max_output_chars=12_000, max_concurrency=4,
+                                cacheable=True, log_style="search",
+                                keywords=("google", "weather", "price", "latest", "news", "who", "lookup")),
+    "batch_internet_search": ToolSpec("research_tools", timeout=60.0, max_output_chars=16_000, max_concurrency=2,
+                                      cacheable=True, log_style="batch_search", keywords=("research", "compare", "google", "latest")),
+    "web_scraper": ToolSpec("research_tools", timeout=90.0, max_output_chars=16_000, max_concurrency=2,
+                            cacheable=True, log_style="scrape",
+                            keywords=("url", "link", "website", "page", "http", "https", "www", "article")),
+    "open_app": ToolSpec(APPS, keywords=("launch", "start", "run"), **GUI),
+    "close_app": ToolSpec(APPS, keywords=("quit", "exit", "kill"), **GUI),
+    "minimize_app": ToolSpec(APPS, keywords=("hide",), **GUI),
+    "maximize_app": ToolSpec(APPS, **GUI),
+    "restore_app": ToolSpec(APPS, **GUI),
+    "switch_btwn_apps": ToolSpec(APPS, keywords=("switch", "focus", "bring", "front"), **GUI),
+    "set_volume": ToolSpec("control_brightness_volume_tool", keywords=("sound", "audio", "loud", "quiet", "mute", "unmute", "speaker"),
+                           **SYSTEM),
+    "set_brightness": ToolSpec("control_brightness_volume_tool", keywords=("dim", "bright", "display", "dark"), **SYSTEM),
+    "create_folder": ToolSpec(FOLDERS, **FILESYSTEM),
+    "rename_folder": ToolSpec(FOLDERS, **FILESYSTEM),
+    "delete_folder": ToolSpec(FOLDERS, keywords=("remove", "trash", "directory"), **FILESYSTEM),
+    "create_add_content_file": ToolSpec(FILES, keywords=("write", "save", "note", "append"), **FILESYSTEM),
+    "rename_file": ToolSpec(FILES, **FILESYSTEM),
+    "delete_file": ToolSpec(FILES, keywords=("remove", "trash"), **FILESYSTEM),
+    "move_file_folder": ToolSpec("move_file_folder", **FILESYSTEM),
+    "create_zipfile": ToolSpec(ZIP, timeout=600.0, keywords=("compress", "archive"), **FILESYSTEM),
+    "extract_zipfile": ToolSpec(ZIP, timeout=600.0, keywords=("unzip", "decompress", "unpack"), **FILESYSTEM),
+    "read_file": ToolSpec("read_file_tool", max_output_chars=16_000, max_concurrency=4,   # = read_file_tool.MAX_OUTPUT_CHARS
+                          keywords=("contents", "view", "show", "log", "txt")),
+    "fetch_artifact": ToolSpec("fetch_artifact_tool", max_output_chars=10_000, log_style="hidden",
+                               keywords=("artifact", "omitted", "rest", "more", "page")),
+    "open_url_or_query": ToolSpec("open_url_query_in_browser_tool", keywords=("browser", "website", "youtube", "chrome"), **GUI),
+    "read_screen_text": ToolSpec("read_screen_text_tool", max_output_chars=8_000, parallel_safe=False, lane="gui",
+                                 log_style="hidden",
+                                 keywords=("see", "look", "visible", "showing", "display", "popup")),
+    "write_command_in_terminal": ToolSpec("terminal_control_tool", parallel_safe=False, lane="gui"),
+    "run_command": ToolSpec("terminal_control_tool", timeout=630.0, parallel_safe=False, lane="shell",
+                            confirm=True, keywords=("shell", "powershell", "bash", "cmd", "git", "pip", "python", "execute", "install")),
+    "change_user_preferences": ToolSpec("change_user_preferences_tool", keywords=("name", "key", "api", "tavily", "gemini"),
+                                        **FILESYSTEM),
+}
+
+DEFAULT_SPEC = ToolSpec(module="")
+
+_lock = threading.Lock()
+_loaded = {}        # tool name -> real tool
+_lazy_tools = None
+_lazy_tools_by_name = None
+
+
+def get_spec(tool_name: str) -> ToolSpec:
+    return TOOL_SPECS.get(tool_name, DEFAULT_SPEC)
+
+
+def needs_confirmation(spec: ToolSpec, args: dict) -> bool:
+    """True if a call with `args` must be approved by the user (spec.confirm, unless the module's needs_confirmation exempts it)."""
+    if not spec.confirm:
+        return False
+    check = getattr(importlib.import_module(f"utils.{spec.module}"), "needs_confirmation", None)
+    return True if check is None else bool(check(args))
+
+
+def load_tool(tool_name: str):
+    """Imports the module implementing `tool_name` (once) and returns the real tool."""
+    if tool_name not in _loaded:
+        with _lock:
+            if tool_name not in _loaded:
+                module = importlib.import_module(f"utils.{TOOL_SPECS[tool_name].module}")
+                _loaded[tool_name] = getattr(module, tool_name)
+    return _loaded[tool_name]
+
+
+def prewarm(tool_names=None) -> threading.Thread:
+    """Imports the given tool modules (default: all) in a daemon thread."""
+
+    def _run():
+        for name in tool_names or TOOL_SPECS:
+            try:
+                load_tool(name)
+            except Exception:
+                # A broken module must not kill the thread; the real call will report the error.
+                pass
+
+    thread = threading.Thread(target=_run, name="neura-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def _is_tool_decorator(node) -> bool:
+    return isinstance(node, ast.Name) and node.id == "tool"
+
+
+def _module_definitions(module_name: str) -> tuple:
+    """
+    Parses one module without importing it.
+
+    Returns:
+        (functions, aliases): @tool function defs by name, and module-level `X = Literal[...]` aliases.
+    """
+    with open(os.path.join(UTILS_DIR, f"{module_name}.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+
+    functions, aliases = {}, {}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and any(map(_is_tool_decorator, node.decorator_list)):
+            functions[node.name] = node
+        elif (
+            isinstance(node, ast.Assign)
+            and isinstance(node.value, ast.Subscript)
+            and isinstance(node.value.value, ast.Name)
+            and node.value.value.id == "Literal"
+        ):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    aliases[target.id] = ast.unparse(node.value)
+    return functions, aliases
+
+
+def _make_lazy_tool(tool_name: str, node, aliases: dict):
+    """Rebuilds the tool's signature and docstring; the body forwards to the real implementation."""
+    namespace = {"Literal": Literal, "_load_tool": load_tool}
+    for alias, expr in aliases.items():
+        namespace[alias] = eval(expr, namespace)
+
+    is_async = isinstance(node, ast.AsyncFunctionDef)
+    if is_async:
+        body = f"return await _load_tool({tool_name!r}).coroutine(**locals())"
+    else:
+        body = f"return _load_tool({tool_name!r}).func(**locals())"
+    source = f"{'async ' if is_async else ''}def {tool_name}({ast.unparse(node.args)}):\n    {body}\n"
+    exec(source, namespace)
+
+    func = namespace[tool_name]
+    func.__doc__ = ast.get_docstring(node, clean=False)
+    return tool(func)
+
+
+def get_tools() -> list:
+    """All tools as lazy tool objects, in binding order. Built once."""
+    global _lazy_tools
+    if _lazy_tools is None:
+        parsed = {}
+        tools = []
+        for tool_name, spec in TOOL_SPECS.items():
+            module_name = spec.module
+            if module_name not in parsed:
+                parsed[module_name] = _module_definitions(module_name)
+            functions, aliases = parsed[module_name]
+            tools.append(_make_lazy_tool(tool_name, functions[tool_name], aliases))
+        _lazy_tools = tools
+    return _lazy_tools
+
+
+def get_tools_by_name() -> dict:
+    """Tool name -> lazy tool. Built once."""
+    global _lazy_tools_by_name
+    if _lazy_tools_by_name is None:
+        _lazy_tools_by_name = {t.name: t for t in get_tools()}
+    return _lazy_tools_by_name
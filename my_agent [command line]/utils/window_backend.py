@@ -0,0 +1,171 @@
+"""
+Window enumeration behind a small backend interface, with a short-lived snapshot cache.
+Provides:
+- WindowBackend: Interface (list_windows) returning window objects with the pygetwindow API.
+- PyGetWindowBackend: Real backend (pygetwindow, imported on first use).
+- FakeWindowBackend / FakeWindow: In-memory windows for benchmarks and tests without a desktop.
+- WindowCache: Title -> window snapshot shared by the window tools, with fuzzy matching.
+
+Enumerating the windows is the expensive part of every window tool, and the old code did it twice
+per call (getAllTitles, then getWindowsWithTitle). The snapshot is reused for SNAPSHOT_TTL seconds,
+so the calls of one turn share it. Actions that change the set of windows (close, open) invalidate
+it; minimize / maximize / restore keep the same title -> handle map and don't. A handle that went
+stale in between (window closed outside the agent) is detected before acting and looked up again
+on a fresh snapshot; an action that raised is never run again, since it may already have worked.
+"""
+
+import os
+import threading
+import time
+from rapidfuzz import process, fuzz
+
+SNAPSHOT_TTL = 1.5      # seconds
+
+
+class WindowBackend:
+    """Source of the open windows. Windows expose title, isMaximized, minimize, maximize, restore, activate, close."""
+
+    def list_windows(self) -> list:
+        raise NotImplementedError
+
+    def is_valid(self, window) -> bool:
+        """False if the window no longer exists. Backends that cannot tell return True."""
+        return True
+
+
+class PyGetWindowBackend(WindowBackend):
+
+    def list_windows(self) -> list:
+        import pygetwindow as gw
+        return [window for window in gw.getAllWindows() if window.title]
+
+    def is_valid(self, window) -> bool:
+        handle = getattr(window, "_hWnd", None)
+        if os.name != "nt" or handle is None:
+            return True
+        import ctypes
+        return bool(ctypes.windll.user32.IsWindow(handle))
+
+
+class FakeWindow:
+    def __init__(self, backend, title: str):
+        self.backend = backend
+        self.title = title
+        self.isMaximized = False
+        self.isMinimized = False
+
+    def _record(self, action: str):
+        if self not in self.backend.windows:
+            raise RuntimeError(f"Invalid window handle: {self.title}")
+        self.backend.actions.append((action, self.title))
+
+    def minimize(self):
+        self._record("minimize")
+        self.isMinimized, self.isMaximized = True, False
+
+    def maximize(self):
+        self._record("maximize")
+        self.isMinimized, self.isMaximized = False, True
+
+    def restore(self):
+        self._record("restore")
+        self.isMinimized, self.isMaximized = False, False
+
+    def activate(self):
+        self._record("activate")
+
+    def close(self):
+        self._record("close")
+        self.backend.windows.remove(self)
+
+
+class FakeWindowBackend(WindowBackend):
+    """
+    Args:
+        titles (list[str]): Titles of the open windows.
+        enum_delay (float): Simulated cost of one enumeration in seconds.
+    """
+
+    def __init__(self, titles: list, enum_delay: float = 0.0):
+        self.windows = [FakeWindow(self, title) for title in titles]
+        self.enum_delay = enum_delay
+        self.enumerations = 0
+        self.actions = []       # (action, title) in call order
+
+    def open(self, title: str) -> FakeWindow:
+        window = FakeWindow(self, title)
+        self.windows.append(window)
+        return window
+
+    def list_windows(self) -> list:
+        self.enumerations += 1
+        if self.enum_delay:
+            time.sleep(self.enum_delay)
+        return list(self.windows)
+
+    def is_valid(self, window) -> bool:
+        return window in self.windows
+
+
+class WindowCache:
+    """
+    Args:
+        backend (WindowBackend): Where the windows come from.
+        ttl (float): Seconds a snapshot is reused.
+    """
+
+    def __init__(self, backend: WindowBackend, ttl: float = SNAPSHOT_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self._snapshot = None       # (taken_at, titles, title -> first window with that title)
+
+    def invalidate(self):
+        with self.lock:
+            self._snapshot = None
+
+    def snapshot(self) -> tuple:
+        """Returns (titles, title -> window), enumerating the windows only if the snapshot expired."""
+        with self.lock:
+            now = time.monotonic()
+            if self._snapshot is None or now - self._snapshot[0] > self.ttl:
+                by_title = {}
+                for window in self.backend.list_windows():
+                    by_title.setdefault(window.title, window)
+                self._snapshot = (now, list(by_title), by_title)
+            return self._snapshot[1], self._snapshot[2]
+
+    def find(self, query: str):
+        """Returns (title, window) of the window whose title is closest to `query`, or None."""
+        titles, by_title = self.snapshot()
+        result = process.extractOne(query, titles, scorer=fuzz.partial_ratio)
+        return (result[0], by_title[result[0]]) if result else None
+
+    def apply(self, query: str, action, changes_windows: bool = False):
+        """
+        Runs `action(window)` on the window closest to `query`.
+
+        Args:
+            query (str): Full or partial window title.
+            action (callable): Called with the window handle; its return value is passed back.
+            changes_windows (bool): True if the action opens or closes windows (invalidates the snapshot).
+
+        Returns:
+            (title, action result), or None if no window matches.
+        """
+        match = self.find(query)
+        if match is not None and not self.backend.is_valid(match[1]):
+            # Closed since the snapshot was taken: match again on a fresh one.
+            self.invalidate()
+            match = self.find(query)
+        if match is None:
+            return None
+        title, window = match
+        try:
+            result = action(window)
+        except Exception:
+            self.invalidate()
+            raise
+        if changes_windows:
+            self.invalidate()
+        return title, result